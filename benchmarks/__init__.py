@@ -0,0 +1,4 @@
+"""
+PathWise Benchmarks
+Timing suites for the Python hot paths, run with `python3 -m benchmarks`
+"""
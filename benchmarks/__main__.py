@@ -0,0 +1,10 @@
+"""
+Benchmark Entry Point
+Lets the suite run as `python3 -m benchmarks`
+"""
+
+import sys
+
+from benchmarks.run import main
+
+sys.exit(main())
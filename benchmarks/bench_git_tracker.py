@@ -0,0 +1,27 @@
+"""
+Commit Categorization Benchmarks
+Times both commit categorizers over a large, seeded set of commit messages
+built from the category keywords
+"""
+
+from pathlib import Path
+
+from benchmarks.runner import Result, measure
+from benchmarks.workload import commit_messages
+from python.logic.git_tracker import categorize_commit, categorize_commit_like_shell
+
+MESSAGES = 100_000
+QUICK_MESSAGES = 10_000
+
+
+def run(_scratch: Path, *, quick: bool = False) -> list[Result]:
+    """Run the commit categorization benchmarks
+
+    Returns:
+        Results named categorize.<function>
+    """
+    messages = commit_messages(QUICK_MESSAGES if quick else MESSAGES)
+    return [
+        measure("categorize.commit", categorize_commit, messages),
+        measure("categorize.commit_like_shell", categorize_commit_like_shell, messages),
+    ]
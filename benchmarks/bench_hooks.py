@@ -0,0 +1,130 @@
+"""
+Shell Hook Latency Benchmarks
+Sources the generated plugin in a scripted interactive zsh against histories
+of increasing size and times every hook and wfreq view from inside the shell
+"""
+
+import json
+import math
+import shutil
+import subprocess
+import sys
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+from benchmarks.runner import Result, summarize
+from benchmarks.workload import WorkloadConfig, config_for_sessions, generate_workload
+from build_plugin import generate_body, generate_header
+
+# Sessions in the live logs, from a fresh install to a year of heavy use
+SIZES = (10, 1_000, 100_000)
+QUICK_SIZES = (10, 1_000)
+
+ROUNDS = 20
+QUICK_ROUNDS = 3
+
+# Hooks in the order the driver times them
+HOOKS = ("chpwd", "preexec", "git_wrapper", "wfreq", "insights", "tools", "export")
+
+DRIVER = Path(__file__).with_name("hook_latency.zsh")
+
+# Keep rotation and the background listing worker out of the timings
+CONFIG = """FREQ_AUTO_RESET="false"
+FREQ_TRACK_TIME="true"
+FREQ_TRACK_GIT="true"
+FREQ_TRACK_TOOLS="true"
+FREQ_ASYNC_STARTUP="false"
+"""
+
+# A fixed weekday evening, so a size always generates the same files
+NOW = int(datetime(2026, 3, 4, 21, 0).timestamp())  # noqa: DTZ001
+
+
+def workload_config(size: int) -> WorkloadConfig:
+    """A history whose live logs hold about size sessions
+
+    As many sessions again are archived, so both the files the hooks read
+    and the history behind them grow with the size.
+    """
+    config = config_for_sessions(2 * size)
+    return config._replace(live_days=math.ceil(config.days / 2))
+
+
+def _pin_to_wall_clock(home: Path) -> None:
+    """Date what the plugin checks against the wall clock today
+
+    The history is dated NOW, but project cache entries expire and the daily
+    maintenance runs by the real clock; both are kept out of the timings.
+    """
+    cache_file = home / ".frequent_dirs.project_cache"
+    cache = json.loads(cache_file.read_text(encoding="utf-8"))
+    for entry in cache.values():
+        entry[2] = time.time()
+    cache_file.write_text(json.dumps(cache), encoding="utf-8")
+
+    today = date.today().isoformat()  # noqa: DTZ011
+    (home / ".frequent_dirs.last_maintenance").write_text(f"{today}\n", encoding="utf-8")
+
+
+def _git_project(project: Path) -> None:
+    """Create the repository the git wrapper commits into"""
+    (project / "src").mkdir(parents=True)
+    subprocess.run(["git", "init", "-q", str(project)], check=True)  # noqa: S603, S607
+
+
+def _run_driver(plugin: Path, home: Path, project: Path, rounds: int) -> dict[str, list[int]]:
+    """Run the zpty driver and collect nanosecond timings per hook"""
+    completed = subprocess.run(  # noqa: S603
+        ["zsh", str(DRIVER), str(plugin), str(home), str(project), str(rounds)],  # noqa: S607
+        capture_output=True,
+        text=True,
+        timeout=3600,
+        check=False,
+    )
+    if completed.returncode != 0:
+        msg = f"hook driver failed for {home}: {completed.stderr.strip() or 'no output'}"
+        raise RuntimeError(msg)
+
+    timings: dict[str, list[int]] = {hook: [] for hook in HOOKS}
+    for line in completed.stdout.splitlines():
+        hook, _, microseconds = line.partition(" ")
+        if hook in timings and microseconds.isdigit():
+            timings[hook].append(int(microseconds) * 1000)
+    return timings
+
+
+def run(scratch: Path, *, quick: bool = False) -> list[Result]:
+    """Run the hook latency benchmarks
+
+    Skipped, with a note on stderr, when zsh or git is not installed.
+
+    Args:
+        scratch: Empty directory for the plugin and the histories
+        quick: Smaller histories and fewer rounds, for a smoke run
+
+    Returns:
+        Results named hooks.<lines>.<hook>
+    """
+    missing = [tool for tool in ("zsh", "git") if shutil.which(tool) is None]
+    if missing:
+        print(f"⚠️  Skipping hooks: {', '.join(missing)} not installed", file=sys.stderr)
+        return []
+
+    # Build from this checkout so the Python calls point at it
+    plugin = scratch / "pathwise.plugin.zsh"
+    plugin.write_text(generate_header() + generate_body(), encoding="utf-8")
+
+    results: list[Result] = []
+    for size in QUICK_SIZES if quick else SIZES:
+        home = scratch / f"home{size}"
+        home.mkdir()
+        generate_workload(home, workload_config(size), NOW)
+        _pin_to_wall_clock(home)
+        (home / ".frequent_dirs.config").write_text(CONFIG, encoding="utf-8")
+        project = home / "project"
+        _git_project(project)
+
+        timings = _run_driver(plugin, home, project, QUICK_ROUNDS if quick else ROUNDS)
+        results.extend(summarize(f"hooks.{size}.{hook}", timings[hook]) for hook in HOOKS)
+    return results
@@ -0,0 +1,53 @@
+"""
+Project Detection Benchmarks
+Times find_project_root on synthetic trees with no cache, with the in-memory
+cache warm, and with only the disk cache to fall back on
+"""
+
+from pathlib import Path
+
+from benchmarks.fixtures import TREES
+from benchmarks.runner import Result, measure
+from python.logic import project_detector
+from python.logic.project_detector import clear_cache, find_project_root
+
+ROUNDS = 5
+QUICK_ROUNDS = 1
+
+
+def _forget_memory_cache() -> None:
+    """Drop the in-memory cache so lookups go to the disk cache"""
+    project_detector._memory_cache.clear()
+
+
+def run(scratch: Path, *, quick: bool = False) -> list[Result]:
+    """Run the project detection benchmarks
+
+    Args:
+        scratch: Empty directory for the trees and the disk cache
+        quick: Fewer rounds, for a smoke run
+
+    Returns:
+        Results named project_root.<tree>.<cold|warm|disk_cache>
+    """
+    rounds = QUICK_ROUNDS if quick else ROUNDS
+    # Keep the user's real cache out of it
+    project_detector.CACHE_FILE = str(scratch / "project_cache")
+
+    results = []
+    for tree, build in TREES.items():
+        directories = build(scratch / tree) * rounds
+        prefix = f"project_root.{tree}"
+
+        results.append(measure(f"{prefix}.cold", find_project_root, directories, clear_cache))
+
+        clear_cache()
+        for directory in directories:
+            find_project_root(directory)
+        results.append(measure(f"{prefix}.warm", find_project_root, directories))
+        results.append(
+            measure(f"{prefix}.disk_cache", find_project_root, directories, _forget_memory_cache)
+        )
+        clear_cache()
+
+    return results
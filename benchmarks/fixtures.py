@@ -0,0 +1,79 @@
+"""
+Benchmark Fixtures
+Synthetic directory trees shaped like the projects PathWise walks through:
+deep monorepos, wide trees and directories full of C sources
+"""
+
+from pathlib import Path
+
+
+def _touch(path: Path) -> None:
+    """Create an empty file and its parents"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.touch()
+
+
+def deep_monorepo(root: Path, packages: int = 20, depth: int = 8) -> list[str]:
+    """A git monorepo with packages nested depth levels below the root
+
+    Only the repository root has indicators, so detection from a leaf walks
+    all the way up.
+
+    Returns:
+        The deepest directory of every package
+    """
+    _touch(root / ".git" / "HEAD")
+    _touch(root / "package.json")
+    leaves = []
+    for package in range(packages):
+        leaf = root / "packages" / f"pkg{package}"
+        for level in range(depth):
+            leaf /= f"src{level}"
+        leaf.mkdir(parents=True, exist_ok=True)
+        _touch(leaf / "index.ts")
+        leaves.append(str(leaf))
+    return leaves
+
+
+def wide_tree(root: Path, width: int = 500, files: int = 20) -> list[str]:
+    """A Python project whose root holds many sibling directories
+
+    Returns:
+        Every sibling directory
+    """
+    _touch(root / "pyproject.toml")
+    directories = []
+    for index in range(width):
+        directory = root / f"module{index}"
+        directory.mkdir(parents=True, exist_ok=True)
+        for number in range(files):
+            (directory / f"file{number}.py").touch()
+        directories.append(str(directory))
+    return directories
+
+
+def c_sources(root: Path, directories: int = 40, files: int = 200) -> list[str]:
+    """Directories found only through the `*.c` glob indicators
+
+    Half hold C sources; the other half hold only headers, so every glob
+    indicator is tried and misses before the parent is searched.
+
+    Returns:
+        Every source and header directory
+    """
+    paths = []
+    for index in range(directories):
+        directory = root / f"lib{index}"
+        directory.mkdir(parents=True, exist_ok=True)
+        suffix = "c" if index % 2 == 0 else "h"
+        for number in range(files):
+            (directory / f"unit{number}.{suffix}").touch()
+        paths.append(str(directory))
+    return paths
+
+
+TREES = {
+    "deep_monorepo": deep_monorepo,
+    "wide_tree": wide_tree,
+    "c_sources": c_sources,
+}
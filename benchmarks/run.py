@@ -0,0 +1,97 @@
+"""
+Benchmark Suite
+Runs every benchmark suite, prints the timings, and optionally saves them
+as a baseline or fails when they regress against one
+"""
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+from typing import Protocol
+
+from benchmarks import bench_git_tracker, bench_hooks, bench_project_detector
+from benchmarks.runner import (
+    DEFAULT_TOLERANCE,
+    Result,
+    compare,
+    format_results,
+    load_baseline,
+    save_baseline,
+)
+
+
+class Suite(Protocol):
+    """Runs one benchmark suite in a scratch directory"""
+
+    def __call__(self, scratch: Path, /, *, quick: bool = False) -> list[Result]: ...
+
+
+SUITES: dict[str, Suite] = {
+    "project_root": bench_project_detector.run,
+    "categorize": bench_git_tracker.run,
+    "hooks": bench_hooks.run,
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the benchmark runner"""
+    parser = argparse.ArgumentParser(prog="python3 -m benchmarks")
+    parser.add_argument(
+        "suites", nargs="*", help=f"suites to run: {', '.join(SUITES)} (default: all)"
+    )
+    parser.add_argument("--quick", action="store_true", help="small inputs, for a smoke run")
+    parser.add_argument("--save", metavar="FILE", help="write the results as a baseline")
+    parser.add_argument("--baseline", metavar="FILE", help="fail on regressions against FILE")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help=f"allowed slowdown before failing (default: {DEFAULT_TOLERANCE:.0%})",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the suites; exit status 1 when a benchmark regressed"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.suites if name not in SUITES]
+    if unknown:
+        parser.error(f"unknown suite: {', '.join(unknown)}")
+
+    results: list[Result] = []
+    with tempfile.TemporaryDirectory(prefix="pathwise-bench-") as scratch:
+        for name in args.suites or SUITES:
+            suite_dir = Path(scratch) / name
+            suite_dir.mkdir()
+            results.extend(SUITES[name](suite_dir, quick=args.quick))
+
+    print(format_results(results))
+
+    if args.save:
+        save_baseline(args.save, results)
+        print(f"\nSaved baseline to {args.save}")
+
+    if args.baseline:
+        try:
+            baseline = load_baseline(args.baseline)
+        except (OSError, ValueError) as e:
+            print(f"\n❌ Could not read baseline: {e}", file=sys.stderr)
+            return 2
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} benchmarks regressed:")
+            for regression in regressions:
+                print(
+                    f"   {regression.name}: {regression.ops_per_sec:,.0f} ops/sec, "
+                    f"{regression.slowdown:.0%} slower than {regression.baseline_ops_per_sec:,.0f}"
+                )
+            return 1
+        print(f"\n✅ No regressions against {args.baseline}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""
+Benchmark Runner
+Times one operation per input, reports throughput and latency percentiles,
+and compares a run against a saved baseline
+"""
+
+import json
+import platform
+import time
+from collections.abc import Callable, Iterable, Sequence
+from pathlib import Path
+from typing import NamedTuple, TypeVar
+
+from python.logic.session_store import percentile_rank
+
+BASELINE_VERSION = 1
+
+# A benchmark this much slower than its baseline counts as a regression
+DEFAULT_TOLERANCE = 0.25
+
+Item = TypeVar("Item")
+
+
+class Result(NamedTuple):
+    """Timings of one benchmark
+
+    Attributes:
+        name: Dotted benchmark name
+        ops: Operations timed
+        ops_per_sec: Throughput over the timed operations only
+        p50_us: Median latency in microseconds
+        p95_us: 95th percentile latency in microseconds
+        p99_us: 99th percentile latency in microseconds
+    """
+
+    name: str
+    ops: int
+    ops_per_sec: float
+    p50_us: float
+    p95_us: float
+    p99_us: float
+
+
+class Regression(NamedTuple):
+    """A benchmark that got slower than its baseline"""
+
+    name: str
+    baseline_ops_per_sec: float
+    ops_per_sec: float
+
+    @property
+    def slowdown(self) -> float:
+        """How much slower, as a fraction of the baseline time"""
+        return self.baseline_ops_per_sec / self.ops_per_sec - 1
+
+
+def measure(
+    name: str,
+    operation: Callable[[Item], object],
+    inputs: Sequence[Item],
+    setup: Callable[[], object] | None = None,
+) -> Result:
+    """Time operation once per input
+
+    Args:
+        name: Dotted benchmark name
+        operation: Function under test, called with each input
+        inputs: One input per timed call
+        setup: Called before every operation, outside the timed region
+
+    Returns:
+        Result with throughput and latency percentiles
+    """
+    timings: list[int] = []
+    clock = time.perf_counter_ns
+    for item in inputs:
+        if setup is not None:
+            setup()
+        started = clock()
+        operation(item)
+        timings.append(clock() - started)
+    return summarize(name, timings)
+
+
+def summarize(name: str, timings: list[int]) -> Result:
+    """Build a Result from per-operation nanosecond timings"""
+    if not timings:
+        return Result(name, 0, 0.0, 0.0, 0.0, 0.0)
+    ordered = sorted(timings)
+    total = sum(ordered)
+
+    def percentile(percent: int) -> float:
+        return ordered[percentile_rank(len(ordered), percent)] / 1000
+
+    ops_per_sec = len(ordered) / (total / 1e9) if total else float("inf")
+    return Result(name, len(ordered), ops_per_sec, percentile(50), percentile(95), percentile(99))
+
+
+def format_results(results: Iterable[Result]) -> str:
+    """Render results as an aligned table"""
+    rows = list(results)
+    width = max((len(result.name) for result in rows), default=9)
+    header = ("ops", "ops/sec", "p50", "p95", "p99")
+    lines = ["  ".join([f"{'benchmark':<{width}}", *(f"{title:>9}" for title in header)])]
+    for result in rows:
+        lines.append(
+            f"{result.name:<{width}}  {result.ops:>9}  {result.ops_per_sec:>9,.0f}  "
+            f"{_format_us(result.p50_us):>9}  {_format_us(result.p95_us):>9}  "
+            f"{_format_us(result.p99_us):>9}"
+        )
+    return "\n".join(lines)
+
+
+def _format_us(microseconds: float) -> str:
+    """Format a latency with a readable unit"""
+    if microseconds >= 1000:
+        return f"{microseconds / 1000:.2f}ms"
+    return f"{microseconds:.1f}µs"
+
+
+def save_baseline(path: str, results: Iterable[Result]) -> None:
+    """Write results as a baseline JSON file"""
+    data = {
+        "version": BASELINE_VERSION,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": {result.name: result._asdict() for result in results},
+    }
+    Path(path).write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+
+
+def load_baseline(path: str) -> dict[str, Result]:
+    """Read a baseline JSON file
+
+    Raises:
+        ValueError: If the file is not a baseline this runner wrote
+    """
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if not isinstance(data, dict) or data.get("version") != BASELINE_VERSION:
+        msg = f"{path} is not a version {BASELINE_VERSION} benchmark baseline"
+        raise ValueError(msg)
+    return {name: Result(**fields) for name, fields in data["results"].items()}
+
+
+def compare(
+    results: Iterable[Result],
+    baseline: dict[str, Result],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> list[Regression]:
+    """Benchmarks whose throughput fell more than tolerance below the baseline
+
+    Benchmarks missing from the baseline are not compared.
+    """
+    regressions = []
+    for result in results:
+        before = baseline.get(result.name)
+        if before is None or before.ops_per_sec <= 0 or result.ops_per_sec <= 0:
+            continue
+        if result.ops_per_sec < before.ops_per_sec / (1 + tolerance):
+            regressions.append(Regression(result.name, before.ops_per_sec, result.ops_per_sec))
+    return regressions
@@ -0,0 +1,455 @@
+"""
+Synthetic Workload
+Writes a consistent set of ~/.frequent_dirs.* files covering months of
+seeded, realistic navigation, tool use and commits
+"""
+
+import argparse
+import gzip
+import json
+import math
+import random
+import sys
+import tempfile
+import time
+from bisect import bisect_right
+from collections import Counter
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from pathlib import Path
+from typing import NamedTuple
+
+from python.constants.git_tracker import COMMIT_CATEGORIES
+from python.constants.tools import TRACKED_TOOLS
+from python.logic.session_archive import month_of, partition_path
+from python.logic.tool_counters import ToolUsage, fold_usage, write_counters
+
+# Sessions shorter than the plugin's default FREQ_MIN_TIME are never logged
+MIN_SESSION = 5
+
+FILLER = (
+    "parser", "config", "loader", "cache", "module", "output", "path", "api",
+    "error", "user", "session", "handler", "index", "export", "shell", "plugin",
+)  # fmt: skip
+
+PROJECT_TYPES = ("python", "nodejs", "rust", "go", "c", "typescript", "ruby", "generic")
+
+SUBDIRECTORIES = ("src", "tests", "docs", "scripts", "src/core", "src/utils", "build", "config")
+
+# Directories outside any project that everyone visits now and then
+LOOSE_DIRECTORIES = ("~/Downloads", "~/Documents", "~/.config", tempfile.gettempdir(), "/etc")
+
+
+class WorkloadConfig(NamedTuple):
+    """Shape of a generated history
+
+    Attributes:
+        projects: Projects under ~/projects, each one a git repository
+        directories_per_project: Directories visited in each project, root included
+        days: Days of history, today included
+        zipf_exponent: Skew of directory and tool popularity (0 is uniform)
+        visits_per_hour: Directory changes per active hour on a weekday
+        commands_per_hour: Commands run per hour spent in a directory
+        commits_per_day: Commits on an active weekday
+        start_hour: Local hour the working day starts
+        end_hour: Local hour the working day ends
+        weekend_activity: Weekend activity as a fraction of a weekday's
+        use_dictionary: Write directory IDs in the logs, as the plugin does
+        live_days: Newest days still in the live logs and today's totals, as
+            when the data has not been rotated or compacted since
+        seed: Random seed; the same seed and reference time give the same files
+    """
+
+    projects: int = 12
+    directories_per_project: int = 6
+    days: int = 90
+    zipf_exponent: float = 1.1
+    visits_per_hour: float = 8.0
+    commands_per_hour: float = 40.0
+    commits_per_day: float = 6.0
+    start_hour: int = 9
+    end_hour: int = 19
+    weekend_activity: float = 0.3
+    use_dictionary: bool = True
+    live_days: int = 1
+    seed: int = 42
+
+
+class WorkloadStats(NamedTuple):
+    """What a generated history holds"""
+
+    directories: int
+    sessions: int
+    archived_months: int
+    commands: int
+    commits: int
+
+
+def config_for_sessions(sessions: int, seed: int = 42) -> WorkloadConfig:
+    """A config whose history holds about the given number of sessions
+
+    Up to a year of history; past that, days get busier rather than longer.
+    """
+    defaults = WorkloadConfig()
+    hours = defaults.end_hour - defaults.start_hour
+    week_factor = (5 + 2 * defaults.weekend_activity) / 7
+    per_day = defaults.visits_per_hour * hours * week_factor
+    days = max(1, min(365, math.ceil(sessions / per_day)))
+    return defaults._replace(
+        projects=max(1, min(200, sessions // 500)),
+        days=days,
+        visits_per_hour=max(sessions / (days * hours * week_factor), 0.1),
+        seed=seed,
+    )
+
+
+def zipf_cum_weights(count: int, exponent: float) -> list[float]:
+    """Cumulative Zipf weights for ranks 1..count, for random.choices"""
+    return list(accumulate(1 / rank**exponent for rank in range(1, count + 1)))
+
+
+def commit_message(rng: random.Random, keywords: list[str]) -> str:
+    """One commit message, most with one or two category keywords"""
+    words = rng.sample(FILLER, rng.randint(2, 6))
+    for _keyword in range(rng.choice((0, 1, 1, 1, 2))):
+        words.insert(rng.randrange(len(words) + 1), rng.choice(keywords))
+    return " ".join(words).capitalize()
+
+
+def commit_keywords() -> list[str]:
+    """Every keyword of every commit category"""
+    return [keyword for info in COMMIT_CATEGORIES.values() for keyword in info["keywords"]]
+
+
+def commit_messages(count: int, seed: int = 42) -> list[str]:
+    """A seeded corpus of commit messages built from the category keywords"""
+    rng = random.Random(seed)  # noqa: S311
+    keywords = commit_keywords()
+    return [commit_message(rng, keywords) for _ in range(count)]
+
+
+class _Directory(NamedTuple):
+    """A generated directory and the project it belongs to"""
+
+    path: str
+    project: str
+    project_type: str
+
+
+def _directories(config: WorkloadConfig, rng: random.Random) -> list[_Directory]:
+    """Every directory in the history, most popular first"""
+    directories = []
+    for number in range(config.projects):
+        root = f"~/projects/{rng.choice(FILLER)}-{number}"
+        project_type = rng.choice(PROJECT_TYPES)
+        directories.append(_Directory(root, root, project_type))
+        for subdirectory in SUBDIRECTORIES[: max(config.directories_per_project - 1, 0)]:
+            path = f"{root}/{subdirectory}"
+            directories.append(_Directory(path, root, project_type))
+    directories.extend(_Directory(path, path, "standalone") for path in LOOSE_DIRECTORIES)
+    rng.shuffle(directories)
+    return directories
+
+
+def _tools(rng: random.Random) -> list[tuple[str, str]]:
+    """Tracked (tool, category) pairs, most popular first"""
+    tools = [(tool, category) for category, info in TRACKED_TOOLS.items() for tool in info["tools"]]
+    rng.shuffle(tools)
+    return tools
+
+
+def _active_window(config: WorkloadConfig, day: date, now: int, today: date) -> tuple[int, int]:
+    """Start and end of a day's activity
+
+    Today's activity stops now, and covers at least the last hour.
+    """
+    morning = datetime(day.year, day.month, day.day, config.start_hour)  # noqa: DTZ001
+    start = int(morning.timestamp())
+    end = start + (config.end_hour - config.start_hour) * 3600
+    if day == today:
+        return min(start, now - 3600), min(end, now)
+    return start, end
+
+
+def _write_lines(path: Path, lines: list[str]) -> None:
+    """Replace a file with lines"""
+    path.write_text("".join(f"{line}\n" for line in lines), encoding="utf-8")
+
+
+class _History:
+    """A history being generated, day by day, and the files it is written to"""
+
+    __slots__ = (
+        "archive",
+        "commits",
+        "commits_today",
+        "config",
+        "daily_totals",
+        "daily_visits",
+        "directories",
+        "directory_weights",
+        "ids",
+        "keywords",
+        "live_sessions",
+        "now",
+        "raw_tools",
+        "repositories",
+        "rng",
+        "stats",
+        "today",
+        "tool_days",
+        "tool_weights",
+        "tools",
+    )
+
+    def __init__(self, config: WorkloadConfig, now: int) -> None:
+        self.config = config
+        self.now = now
+        self.today = datetime.fromtimestamp(now).date()  # noqa: DTZ006
+        self.rng = random.Random(config.seed)  # noqa: S311
+
+        self.directories = _directories(config, self.rng)
+        self.directory_weights = zipf_cum_weights(len(self.directories), config.zipf_exponent)
+        self.ids = {
+            directory.path: str(number) for number, directory in enumerate(self.directories, 1)
+        }
+        self.tools = _tools(self.rng)
+        self.tool_weights = zipf_cum_weights(len(self.tools), config.zipf_exponent)
+        self.keywords = commit_keywords()
+        self.repositories = {directory.project for directory in self.directories} - set(
+            LOOSE_DIRECTORIES
+        )
+
+        self.live_sessions: list[str] = []
+        self.archive: dict[str, list[str]] = {}
+        self.daily_totals: dict[date, Counter[str]] = {}
+        self.daily_visits: dict[date, Counter[str]] = {}
+        self.raw_tools: list[str] = []
+        self.tool_days: Counter[tuple[str, str, str, str]] = Counter()
+        self.commits: list[str] = []
+        self.commits_today: Counter[str] = Counter()
+        self.stats = Counter[str]()
+
+    def field(self, path: str) -> str:
+        """A directory as the logs store it"""
+        return self.ids[path] if self.config.use_dictionary else path
+
+    def add_day(self, offset: int) -> None:
+        """Generate the sessions, commands and commits of offset days ago"""
+        config, rng = self.config, self.rng
+        day = self.today - timedelta(days=offset)
+        activity = config.weekend_activity if day.weekday() >= 5 else 1.0
+        window_start, window_end = _active_window(config, day, self.now, self.today)
+        live = offset < config.live_days
+        hours = (window_end - window_start) / 3600
+
+        # Visits: chained sessions, each lasting until the next directory change
+        visits = int(config.visits_per_hour * hours * activity + rng.random())
+        starts = sorted(rng.randrange(window_start, window_end) for _ in range(visits))
+        chosen = rng.choices(self.directories, cum_weights=self.directory_weights, k=visits)
+        ends = [*starts[1:], window_end]
+        seconds: Counter[str] = Counter()
+        visited: Counter[str] = Counter()
+
+        for directory, start, end in zip(chosen, starts, ends, strict=True):
+            duration = end - start
+            visited[directory.path] += 1
+            if duration < MIN_SESSION:
+                continue
+            seconds[directory.path] += duration
+            line = f"{self.field(directory.path)}|{start}|{end}|{duration}"
+            if live:
+                self.live_sessions.append(line)
+            else:
+                self.archive.setdefault(month_of(start), []).append(line)
+            self.stats["sessions"] += 1
+            self.add_commands(directory.path, start, end, day, live=live)
+
+        if offset <= config.live_days:
+            self.daily_totals[day], self.daily_visits[day] = seconds, visited
+
+        # Commits land in whichever repository directory was open at the time
+        commit_count = int(config.commits_per_day * activity + rng.random()) if starts else 0
+        for moment in sorted(rng.randrange(window_start, window_end) for _ in range(commit_count)):
+            directory = chosen[max(bisect_right(starts, moment) - 1, 0)]
+            if directory.project not in self.repositories:
+                continue
+            message = commit_message(rng, self.keywords)
+            self.commits.append(
+                f"{self.field(directory.path)}|{rng.getrandbits(160):040x}|{moment}|{message}"
+            )
+            if live:
+                self.commits_today[directory.path] += 1
+            self.stats["commits"] += 1
+
+    def add_commands(self, path: str, start: int, end: int, day: date, *, live: bool) -> None:
+        """Generate the commands run during one session"""
+        rng = self.rng
+        count = int(self.config.commands_per_hour * (end - start) / 3600 + rng.random())
+        picked = rng.choices(self.tools, cum_weights=self.tool_weights, k=count)
+        moments = sorted(rng.randrange(start, end) for _ in range(count))
+        for (tool, category), moment in zip(picked, moments, strict=True):
+            if live:
+                self.raw_tools.append(f"{self.field(path)}|{tool}|{category}|{moment}")
+            else:
+                self.tool_days[(self.field(path), tool, category, day.isoformat())] += 1
+        self.stats["commands"] += count
+
+    def write_totals(self, home: Path) -> None:
+        """Write today's and yesterday's totals
+
+        Today's totals cover every live day; yesterday is the day before them.
+        """
+        live_days = [self.today - timedelta(days=offset) for offset in range(self.config.live_days)]
+        yesterday = self.today - timedelta(days=self.config.live_days)
+        for name, days in (("today", live_days), ("yesterday", [yesterday])):
+            visited, seconds = Counter[str](), Counter[str]()
+            for day in days:
+                visited.update(self.daily_visits.get(day, Counter()))
+                seconds.update(self.daily_totals.get(day, Counter()))
+            lines = [f"{path}|{count}|{seconds[path]}" for path, count in visited.items()]
+            _write_lines(home / f".frequent_dirs.{name}", lines)
+
+    def write_sessions(self, home: Path) -> None:
+        """Write the live session log and the monthly archive partitions"""
+        sessions_file = str(home / ".frequent_dirs.sessions")
+        _write_lines(Path(sessions_file), self.live_sessions)
+        current_month = month_of(self.now)
+        for month, lines in self.archive.items():
+            if month >= current_month:
+                _write_lines(Path(partition_path(sessions_file, month)), lines)
+                continue
+            # No name or mtime in the gzip header, so a seed always gives the same bytes
+            with (
+                Path(partition_path(sessions_file, month, compressed=True)).open("wb") as raw,
+                gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0) as f,
+            ):
+                f.write("".join(f"{line}\n" for line in lines).encode())
+
+    def write_tools(self, home: Path) -> None:
+        """Write the raw tool log and the counters compacted from older days"""
+        _write_lines(home / ".frequent_dirs.tools", self.raw_tools)
+        usage = (
+            ToolUsage(directory, tool, category, "", day, uses)
+            for (directory, tool, category, day), uses in self.tool_days.items()
+        )
+        write_counters(str(home / ".frequent_dirs.tools.counts"), fold_usage(usage, self.today))
+
+    def write_commits(self, home: Path) -> None:
+        """Write the commit log and today's commit counts"""
+        _write_lines(home / ".frequent_dirs.git", self.commits)
+        today = [f"{path}|{count}" for path, count in self.commits_today.items()]
+        _write_lines(home / ".frequent_dirs.git.today", today)
+
+    def write_state(self, home: Path) -> None:
+        """Write the dictionary, a fresh project cache and the rotation markers"""
+        dictionary = (
+            [f"{self.ids[d.path]}|{d.path}" for d in self.directories]
+            if self.config.use_dictionary
+            else []
+        )
+        _write_lines(home / ".frequent_dirs.dirs", dictionary)
+
+        # Keyed by absolute path like project_detector's
+        cache = {}
+        for directory in self.directories:
+            absolute = directory.path.replace("~", str(home), 1)
+            root = directory.project.replace("~", str(home), 1)
+            cache[absolute] = [root, directory.project_type, float(self.now)]
+        (home / ".frequent_dirs.project_cache").write_text(json.dumps(cache), encoding="utf-8")
+
+        for name in ("last_reset", "last_maintenance"):
+            _write_lines(home / f".frequent_dirs.{name}", [self.today.isoformat()])
+        _write_lines(home / ".frequent_dirs.generation", ["0"])
+
+
+def generate_workload(
+    home: Path, config: WorkloadConfig | None = None, now: int | None = None
+) -> WorkloadStats:
+    """Write a full PathWise history into home
+
+    The newest config.live_days days of sessions and tool uses stay in the
+    live logs and today's totals; earlier days are filed the way daily
+    maintenance leaves them: sessions in monthly archive partitions (closed
+    months gzipped) and tool uses in the counters file.
+
+    Args:
+        home: Directory standing in for $HOME, created if missing
+        config: Shape of the history (defaults to WorkloadConfig())
+        now: Reference unix time (defaults to now)
+
+    Returns:
+        WorkloadStats describing what was written
+    """
+    config = config or WorkloadConfig()
+    history = _History(config, int(time.time()) if now is None else now)
+    home.mkdir(parents=True, exist_ok=True)
+
+    for offset in range(config.days - 1, -1, -1):
+        history.add_day(offset)
+
+    history.write_totals(home)
+    history.write_sessions(home)
+    history.write_tools(home)
+    history.write_commits(home)
+    history.write_state(home)
+
+    stats = history.stats
+    return WorkloadStats(
+        len(history.directories),
+        stats["sessions"],
+        len(history.archive),
+        stats["commands"],
+        stats["commits"],
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the generator"""
+    defaults = WorkloadConfig()
+    parser = argparse.ArgumentParser(
+        prog="python3 -m benchmarks.workload",
+        description="Write a synthetic PathWise history into a directory used as $HOME",
+    )
+    parser.add_argument("home", type=Path, help="directory to write the data files into")
+    parser.add_argument(
+        "--sessions", type=int, metavar="N", help="size the history to about N sessions"
+    )
+    for name in WorkloadConfig._fields:
+        default = getattr(defaults, name)
+        if isinstance(default, bool):
+            continue
+        option = "--" + name.replace("_", "-")
+        parser.add_argument(
+            option, type=type(default), default=default, metavar="N", help=f"default: {default}"
+        )
+    parser.add_argument(
+        "--paths", action="store_true", help="write paths instead of dictionary IDs"
+    )
+    parser.add_argument("--now", type=int, help="reference unix time (default: now)")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Generate a workload from the command line"""
+    args = build_parser().parse_args(argv)
+    if args.sessions:
+        config = config_for_sessions(args.sessions, args.seed)
+    else:
+        config = WorkloadConfig(
+            **{name: getattr(args, name) for name in WorkloadConfig._fields if hasattr(args, name)}
+        )
+    config = config._replace(use_dictionary=not args.paths)
+
+    started = time.perf_counter()
+    stats = generate_workload(args.home, config, args.now)
+    print(
+        f"✅ Wrote {stats.sessions:,} sessions ({stats.archived_months} archived months), "
+        f"{stats.commands:,} commands and {stats.commits:,} commits across "
+        f"{stats.directories} directories to {args.home} in {time.perf_counter() - started:.1f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,10 @@ PathWise Plugin Builder
 Generates the pathwise.plugin.zsh file from modular components with custom colors
 """
 
+import argparse
+import re
+import shutil
+import subprocess
 import sys
 from pathlib import Path
 
@@ -34,17 +38,36 @@ def generate_header() -> str:
 def generate_data_files() -> str:
     """Generate data file path definitions"""
     return """
+# @feature profile
+# Time PathWise's start-up phases when pathwise-startup.zsh is loaded
+(( ${+_PATHWISE_STARTUP} )) && _pathwise_startup_phase
+# @end feature
+
 # Data files
 FREQ_DIRS_TODAY="${HOME}/.frequent_dirs.today"
 FREQ_DIRS_YESTERDAY="${HOME}/.frequent_dirs.yesterday"
 FREQ_DIRS_CONFIG="${HOME}/.frequent_dirs.config"
 FREQ_DIRS_LAST_RESET="${HOME}/.frequent_dirs.last_reset"
+FREQ_DIRS_LAST_MAINTENANCE="${HOME}/.frequent_dirs.last_maintenance"
 FREQ_DIRS_SESSIONS="${HOME}/.frequent_dirs.sessions"
 FREQ_DIRS_INSIGHTS="${HOME}/.frequent_dirs.insights"
 FREQ_DIRS_PATTERNS="${HOME}/.frequent_dirs.patterns"
 FREQ_DIRS_GIT="${HOME}/.frequent_dirs.git"
 FREQ_DIRS_GIT_TODAY="${HOME}/.frequent_dirs.git.today"
+FREQ_DIRS_GIT_PERF="${HOME}/.frequent_dirs.git.perf"
+FREQ_DIRS_GIT_PERF_HIST="${HOME}/.frequent_dirs.git.perf.hist"
 FREQ_DIRS_TOOLS="${HOME}/.frequent_dirs.tools"
+FREQ_DIRS_TOOL_COUNTS="${HOME}/.frequent_dirs.tools.counts"
+FREQ_DIRS_RUNTIMES="${HOME}/.frequent_dirs.runtimes"
+FREQ_DIRS_RUNTIME_HIST="${HOME}/.frequent_dirs.runtimes.hist"
+FREQ_DIRS_EXPORT_CURSOR="${HOME}/.frequent_dirs.export_cursor"
+FREQ_DIRS_DIRS="${HOME}/.frequent_dirs.dirs"
+FREQ_DIRS_GENERATION="${HOME}/.frequent_dirs.generation"
+FREQ_DIRS_SNAPSHOT="${HOME}/.frequent_dirs.snapshot"
+FREQ_DIRS_SNAPSHOT_LISTING="${HOME}/.frequent_dirs.snapshot.listing"
+FREQ_DIRS_PROFILE="${HOME}/.frequent_dirs.profile"
+FREQ_DIRS_HOOK_PROFILE="${HOME}/.frequent_dirs.hook_profile"
+FREQ_DIRS_STARTUP="${HOME}/.frequent_dirs.startup"
 """
 
 
@@ -57,6 +80,23 @@ typeset -g FREQ_ENTER_TIME=""
 typeset -g FREQ_SESSION_START=""
 typeset -g FREQ_IDLE_THRESHOLD=1800  # 30 minutes in seconds
 
+# Generation of the ranked snapshot currently loaded in this shell
+typeset -g _FREQ_DIRS_SNAPSHOT_GEN=""
+
+# Background snapshot rebuild started at shell startup
+typeset -g _FREQ_DIRS_ASYNC_FD=""
+typeset -g _FREQ_DIRS_PENDING_GEN=""
+
+# Directory dictionary (path -> ID), loaded on first use
+typeset -gA _FREQ_DIR_IDS
+typeset -g _FREQ_DIR_IDS_NEXT=1
+typeset -g _FREQ_DIR_IDS_LOADED=""
+
+# @feature profile
+# Profiled hooks currently running (FREQ_PROFILE=1); step marks are skipped at 0
+typeset -gi _FREQ_PROF_DEPTH=0
+# @end feature
+
 # Default configuration
 DEFAULT_AUTO_RESET="true"
 DEFAULT_RESET_HOUR="0"
@@ -69,6 +109,9 @@ DEFAULT_SORT_BY="time"  # Options: visits, time, commits
 DEFAULT_CONSOLIDATE="true"  # Enable project consolidation
 DEFAULT_CONSOLIDATE_DEPTH="10"  # Max depth to search for project root
 DEFAULT_SHOW_SUBDIR_COUNT="true"  # Show subdirectory count in display
+DEFAULT_ASYNC_STARTUP="true"  # Render the startup listing in the background
+DEFAULT_ARCHIVE_MONTHS="24"  # Months of session history to keep (0 keeps all)
+DEFAULT_ARCHIVE_MAX_MB="50"  # Disk budget for the session archive (0 for none)
 """
 
 
@@ -85,6 +128,9 @@ def generate_file_init() -> str:
 [[ ! -f "$FREQ_DIRS_GIT" ]] && touch "$FREQ_DIRS_GIT"
 [[ ! -f "$FREQ_DIRS_GIT_TODAY" ]] && touch "$FREQ_DIRS_GIT_TODAY"
 [[ ! -f "$FREQ_DIRS_TOOLS" ]] && touch "$FREQ_DIRS_TOOLS"
+[[ ! -f "$FREQ_DIRS_DIRS" ]] && touch "$FREQ_DIRS_DIRS"
+[[ ! -f "$FREQ_DIRS_GENERATION" ]] && echo "0" > "$FREQ_DIRS_GENERATION"
+(( ${+_PATHWISE_STARTUP} )) && _pathwise_startup_phase file_init
 """
 
 
@@ -110,6 +156,9 @@ _freq_dirs_load_config() {
     [[ -z "$FREQ_CONSOLIDATE" ]] && FREQ_CONSOLIDATE="${DEFAULT_CONSOLIDATE}"
     [[ -z "$FREQ_CONSOLIDATE_DEPTH" ]] && FREQ_CONSOLIDATE_DEPTH="${DEFAULT_CONSOLIDATE_DEPTH}"
     [[ -z "$FREQ_SHOW_SUBDIR_COUNT" ]] && FREQ_SHOW_SUBDIR_COUNT="${DEFAULT_SHOW_SUBDIR_COUNT}"
+    [[ -z "$FREQ_ASYNC_STARTUP" ]] && FREQ_ASYNC_STARTUP="${DEFAULT_ASYNC_STARTUP}"
+    [[ -z "$FREQ_ARCHIVE_MONTHS" ]] && FREQ_ARCHIVE_MONTHS="${DEFAULT_ARCHIVE_MONTHS}"
+    [[ -z "$FREQ_ARCHIVE_MAX_MB" ]] && FREQ_ARCHIVE_MAX_MB="${DEFAULT_ARCHIVE_MAX_MB}"
 }
 
 # Save configuration
@@ -126,7 +175,13 @@ FREQ_SORT_BY="${FREQ_SORT_BY}"
 FREQ_CONSOLIDATE="${FREQ_CONSOLIDATE}"
 FREQ_CONSOLIDATE_DEPTH="${FREQ_CONSOLIDATE_DEPTH}"
 FREQ_SHOW_SUBDIR_COUNT="${FREQ_SHOW_SUBDIR_COUNT}"
+FREQ_ASYNC_STARTUP="${FREQ_ASYNC_STARTUP}"
+FREQ_ARCHIVE_MONTHS="${FREQ_ARCHIVE_MONTHS}"
+FREQ_ARCHIVE_MAX_MB="${FREQ_ARCHIVE_MAX_MB}"
 EOF
+
+    # Ranking depends on these settings, so the snapshot is now stale
+    _freq_dirs_bump_generation
 }
 """
 
@@ -149,6 +204,393 @@ _freq_dirs_format_time() {
         echo "${secs}s"
     fi
 }
+
+# Mark tracked data as changed so the ranked snapshot gets rebuilt
+_freq_dirs_bump_generation() {
+    local gen=0
+    # $(<file) is read by zsh itself, no subprocess needed
+    [[ -s "$FREQ_DIRS_GENERATION" ]] && gen=$(<"$FREQ_DIRS_GENERATION")
+    echo $((gen + 1)) > "$FREQ_DIRS_GENERATION"
+}
+
+# Load the directory dictionary (id|path lines) into this shell
+_freq_dirs_load_dir_ids() {
+    local id dir
+    _FREQ_DIR_IDS=()
+    _FREQ_DIR_IDS_NEXT=1
+    if [[ -f "$FREQ_DIRS_DIRS" ]]; then
+        while IFS='|' read -r id dir; do
+            [[ -n "$dir" ]] || continue
+            _FREQ_DIR_IDS[$dir]=$id
+            (( id >= _FREQ_DIR_IDS_NEXT )) && _FREQ_DIR_IDS_NEXT=$((id + 1))
+        done < "$FREQ_DIRS_DIRS"
+    fi
+    _FREQ_DIR_IDS_LOADED=true
+}
+
+# Set REPLY to a directory's dictionary ID, assigning one the first time
+# Logs store this ID instead of the path, see `pathwise rename`
+_freq_dirs_dir_id() {
+    local dir="$1"
+    [[ -n "$_FREQ_DIR_IDS_LOADED" ]] || _freq_dirs_load_dir_ids
+    REPLY="${_FREQ_DIR_IDS[$dir]}"
+    [[ -n "$REPLY" ]] && return 0
+
+    # Other shells assign IDs too, so reload and append under a lock
+    local lock_fd
+    if zmodload -F zsh/system b:zsystem 2>/dev/null && \\
+        zsystem flock -t 2 -f lock_fd "${FREQ_DIRS_DIRS}.lock" 2>/dev/null; then
+        _freq_dirs_load_dir_ids
+        REPLY="${_FREQ_DIR_IDS[$dir]}"
+        if [[ -z "$REPLY" ]]; then
+            REPLY=$_FREQ_DIR_IDS_NEXT
+            print -r -- "${REPLY}|${dir}" >> "$FREQ_DIRS_DIRS"
+            _FREQ_DIR_IDS[$dir]=$REPLY
+            _FREQ_DIR_IDS_NEXT=$((REPLY + 1))
+        fi
+        zsystem flock -u $lock_fd
+    else
+        # Readers accept plain paths too, so log the path itself
+        REPLY="$dir"
+    fi
+}
+"""
+
+
+def generate_profiler() -> str:
+    """Generate the FREQ_PROFILE=1 hook profiler and `wfreq --profile`"""
+    return f"""
+# Hook profiler: with FREQ_PROFILE=1 the hooks and wfreq record how long each
+# step took and how many processes it started, see `wfreq --profile`
+typeset -g _FREQ_PROF_HOOK="" _FREQ_PROF_START="" _FREQ_PROF_START_PID=""
+typeset -g _FREQ_PROF_MARK="" _FREQ_PROF_MARK_PID=""
+typeset -ga _FREQ_PROF_RECORDS
+typeset -gi _FREQ_PROF_LINES=0
+
+# Hook functions wrapped by `wfreq --hook-profile on` and their queued timings
+typeset -ga _FREQ_HOOK_PROF_WRAPPED _FREQ_HOOK_PROF_RECORDS
+typeset -gA _FREQ_HOOK_PROF_SEEN
+typeset -g _FREQ_HOOK_PROF_EVENT=""
+typeset -gi _FREQ_HOOK_PROF_FIRING=0 _FREQ_HOOK_PROF_LINES=0
+
+# Set REPLY to the last process ID handed out on this machine (Linux only)
+# The read builtin starts no process, so it does not count itself
+_freq_dirs_prof_pid() {{
+    REPLY=""
+    [[ -r /proc/sys/kernel/ns_last_pid ]] && read -r REPLY < /proc/sys/kernel/ns_last_pid
+}}
+
+# Queue one record: step, start time, start PID, end time, end PID
+_freq_dirs_prof_record() {{
+    local step="$1" micros processes=""
+    printf -v micros '%.0f' $(( ($4 - $2) * 1e6 ))
+    [[ -n "$3" && -n "$5" ]] && (( $5 >= $3 )) && processes=$(( $5 - $3 ))
+    _FREQ_PROF_RECORDS+=("${{EPOCHSECONDS}}|${{_FREQ_PROF_HOOK}}|${{step}}|${{micros}}|${{processes}}")
+}}
+
+# Start timing a hook; a hook called from a profiled hook counts as part of it
+_freq_dirs_prof_begin() {{
+    (( _FREQ_PROF_DEPTH++ )) && return 0
+    _FREQ_PROF_HOOK="$1"
+    # wfreq is profiled per subcommand, e.g. "wfreq --insights"
+    [[ "$1" == "wfreq" && -n "$2" ]] && _FREQ_PROF_HOOK="wfreq ${{2%%=*}}"
+    _FREQ_PROF_RECORDS=()
+    _freq_dirs_prof_pid
+    _FREQ_PROF_START=$EPOCHREALTIME _FREQ_PROF_START_PID=$REPLY
+    _FREQ_PROF_MARK=$_FREQ_PROF_START _FREQ_PROF_MARK_PID=$REPLY
+}}
+
+# Time everything since the previous mark as one step of the running hook
+_freq_dirs_prof_step() {{
+    local now=$EPOCHREALTIME
+    _freq_dirs_prof_pid
+    _freq_dirs_prof_record "$1" "$_FREQ_PROF_MARK" "$_FREQ_PROF_MARK_PID" "$now" "$REPLY"
+    _FREQ_PROF_MARK=$now _FREQ_PROF_MARK_PID=$REPLY
+}}
+
+# Finish timing a hook and append its records to the profile ring buffer
+_freq_dirs_prof_end() {{
+    (( --_FREQ_PROF_DEPTH > 0 )) && return 0
+    local now=$EPOCHREALTIME
+    _freq_dirs_prof_pid
+    # Whatever ran after the last mark, so the steps add up to the total
+    (( ${{#_FREQ_PROF_RECORDS}} )) && \\
+        _freq_dirs_prof_record rest "$_FREQ_PROF_MARK" "$_FREQ_PROF_MARK_PID" "$now" "$REPLY"
+    _freq_dirs_prof_record total "$_FREQ_PROF_START" "$_FREQ_PROF_START_PID" "$now" "$REPLY"
+    _freq_dirs_prof_append "$FREQ_DIRS_PROFILE" _FREQ_PROF_LINES "${{_FREQ_PROF_RECORDS[@]}}"
+    _FREQ_PROF_RECORDS=()
+}}
+
+# Append records to a profile file, keeping its newest FREQ_PROFILE_SIZE lines
+# once it holds twice that; the second argument names this shell's line count
+_freq_dirs_prof_append() {{
+    local file="$1" counter="$2"
+    shift 2
+    print -rl -- "$@" >> "$file"
+
+    local size=${{FREQ_PROFILE_SIZE:-5000}}
+    (( $counter += $# ))
+    if (( $counter > 2 * size )); then
+        local -a records=("${{(@f)$(<"$file")}}")
+        print -rl -- "${{(@)records[-size,-1]}}" > "${{file}}.tmp.$$" && \\
+            mv "${{file}}.tmp.$$" "$file"
+        (( $counter = size ))
+    fi
+}}
+
+# Run a function as a profiled hook
+_freq_dirs_profiled() {{
+    local _freq_hook="$1" _freq_target="$2" _freq_status
+    shift 2
+    _freq_dirs_prof_begin "$_freq_hook" "$@"
+    {{
+        "$_freq_target" "$@"
+        _freq_status=$?
+    }} always {{
+        # Also runs on Ctrl-C, so the depth never stays raised
+        _freq_dirs_prof_end
+    }}
+    return $_freq_status
+}}
+
+# Route every call of a function through the profiler
+_freq_dirs_profile_wrap() {{
+    local name="$1" hook="$2"
+    (( ${{+functions[$name]}} )) || return 0
+    (( ${{+functions[_freq_dirs_unprofiled_$name]}} )) && return 0
+    # Autoload mode: load the real body before copying it
+    [[ "${{functions[$name]}}" == *"builtin autoload -X"* ]] && autoload +X "$name"
+    functions[_freq_dirs_unprofiled_$name]="${{functions[$name]}}"
+    functions[$name]="_freq_dirs_profiled $hook _freq_dirs_unprofiled_$name "'"$@"'
+}}
+
+# Start profiling this shell's hooks and wfreq
+_freq_dirs_profile_enable() {{
+    zmodload zsh/datetime 2>/dev/null || return 1
+    [[ -f "$FREQ_DIRS_PROFILE" ]] || : >> "$FREQ_DIRS_PROFILE"
+    _FREQ_PROF_LINES=${{#${{(f)"$(<"$FREQ_DIRS_PROFILE")"}}}}
+    _freq_dirs_profile_wrap _freq_dirs_update chpwd
+    _freq_dirs_profile_wrap _freq_dirs_track_tool preexec
+    _freq_dirs_profile_wrap _freq_dirs_git_wrapper git
+    _freq_dirs_profile_wrap wfreq wfreq
+}}
+
+# Time one call of a function from the hook arrays
+_freq_dirs_hook_probe() {{
+    local _freq_event="$1" _freq_name="$2" _freq_start _freq_status _freq_micros
+    shift 2
+    # A hook run starts when the event changes or a function comes round again
+    if [[ "$_freq_event" != "$_FREQ_HOOK_PROF_EVENT" || \\
+        -n "${{_FREQ_HOOK_PROF_SEEN[$_freq_name]}}" ]]; then
+        (( _FREQ_HOOK_PROF_FIRING++ ))
+        _FREQ_HOOK_PROF_EVENT=$_freq_event
+        _FREQ_HOOK_PROF_SEEN=()
+    fi
+    _FREQ_HOOK_PROF_SEEN[$_freq_name]=1
+
+    _freq_start=$EPOCHREALTIME
+    {{
+        "_freq_dirs_unprobed_$_freq_name" "$@"
+        _freq_status=$?
+    }} always {{
+        printf -v _freq_micros '%.0f' $(( (EPOCHREALTIME - _freq_start) * 1e6 ))
+        _freq_dirs_dir_id "${{PWD/#$HOME/~}}"
+        _FREQ_HOOK_PROF_RECORDS+=("${{EPOCHSECONDS}}|${{_freq_event}}|${{_freq_name}}|${{REPLY}}|${{_freq_micros}}|$$.${{_FREQ_HOOK_PROF_FIRING}}")
+        (( ${{#_FREQ_HOOK_PROF_RECORDS}} >= 100 )) && _freq_dirs_hook_profile_flush
+    }}
+    return $_freq_status
+}}
+
+# Write queued hook timings to the hook profile
+_freq_dirs_hook_profile_flush() {{
+    (( ${{#_FREQ_HOOK_PROF_RECORDS}} )) || return 0
+    _freq_dirs_prof_append "$FREQ_DIRS_HOOK_PROFILE" _FREQ_HOOK_PROF_LINES \\
+        "${{_FREQ_HOOK_PROF_RECORDS[@]}}"
+    _FREQ_HOOK_PROF_RECORDS=()
+}}
+
+# Wrap every function in the chpwd, precmd and preexec hooks, other
+# plugins' included, with a timing probe; sets REPLY to the number wrapped
+_freq_dirs_hook_profile_on() {{
+    zmodload zsh/datetime 2>/dev/null || return 1
+    local event name array
+    REPLY=0
+    for event in chpwd precmd preexec; do
+        array="${{event}}_functions"
+        # The plain precmd, preexec and chpwd functions run as hooks too
+        for name in $event "${{(@P)array}}"; do
+            (( ${{+functions[$name]}} )) || continue
+            (( ${{+functions[_freq_dirs_unprobed_$name]}} )) && continue
+            [[ "$name" == _freq_dirs_hook_* ]] && continue
+            [[ "${{functions[$name]}}" == *"builtin autoload -X"* ]] && autoload +X "$name"
+            functions[_freq_dirs_unprobed_$name]="${{functions[$name]}}"
+            functions[$name]="_freq_dirs_hook_probe $event $name "'"$@"'
+            _FREQ_HOOK_PROF_WRAPPED+=("$name")
+            (( REPLY++ ))
+        done
+    done
+
+    if (( ${{#_FREQ_HOOK_PROF_WRAPPED}} )); then
+        [[ -f "$FREQ_DIRS_HOOK_PROFILE" ]] || : >> "$FREQ_DIRS_HOOK_PROFILE"
+        _FREQ_HOOK_PROF_LINES=${{#${{(f)"$(<"$FREQ_DIRS_HOOK_PROFILE")"}}}}
+        add-zsh-hook zshexit _freq_dirs_hook_profile_flush
+    fi
+}}
+
+# Put the original hook functions back
+_freq_dirs_hook_profile_off() {{
+    local name
+    for name in $_FREQ_HOOK_PROF_WRAPPED; do
+        (( ${{+functions[_freq_dirs_unprobed_$name]}} )) || continue
+        # Leave functions alone that their plugin has redefined since
+        [[ "${{functions[$name]}}" == *"_freq_dirs_hook_probe "* ]] && \\
+            functions[$name]="${{functions[_freq_dirs_unprobed_$name]}}"
+        unfunction "_freq_dirs_unprobed_$name"
+    done
+    _FREQ_HOOK_PROF_WRAPPED=()
+    _freq_dirs_hook_profile_flush
+    add-zsh-hook -d zshexit _freq_dirs_hook_profile_flush
+}}
+
+# FREQ_HOOK_PROFILE=1: wrap the hooks at the first prompt, once every
+# plugin has registered its own
+_freq_dirs_hook_profile_start() {{
+    precmd_functions=(${{precmd_functions[@]/_freq_dirs_hook_profile_start}})
+    _freq_dirs_hook_profile_on
+}}
+
+# wfreq --hook-profile [on|off|--reset]: time every shell hook function
+_freq_dirs_show_hook_profile() {{
+    case "$1" in
+        on)
+            _freq_dirs_hook_profile_on || return 1
+            echo "Timing ${{#_FREQ_HOOK_PROF_WRAPPED}} hook functions in this shell:"
+            echo "  ${{(j:, :)_FREQ_HOOK_PROF_WRAPPED}}"
+            echo "Use the shell as usual, then run: wfreq --hook-profile"
+            return
+            ;;
+        off)
+            _freq_dirs_hook_profile_off
+            echo "Hook timing is off in this shell."
+            return
+            ;;
+        --reset)
+            _FREQ_HOOK_PROF_RECORDS=()
+            : > "$FREQ_DIRS_HOOK_PROFILE"
+            _FREQ_HOOK_PROF_LINES=0
+            echo "Hook profile cleared."
+            return
+            ;;
+    esac
+
+    _freq_dirs_hook_profile_flush
+    if [[ ! -s "$FREQ_DIRS_HOOK_PROFILE" ]]; then
+        echo "No hook timings recorded yet. Turn them on in this shell and use it for a while:"
+        echo "  wfreq --hook-profile on"
+        echo "Or time every new shell with: export FREQ_HOOK_PROFILE=1"
+        return
+    fi
+
+    python3 -c "
+import sys
+sys.path.insert(0, '{Path(__file__).resolve().parent}')
+from python.logic.shell_hooks import hook_profile_report_for_shell
+report = hook_profile_report_for_shell(sys.argv[1], sys.argv[2])
+if report:
+    print(report)
+" "$FREQ_DIRS_HOOK_PROFILE" "$FREQ_DIRS_DIRS"
+}}
+
+# Append one span to the `wfreq --trace` span file:
+# category, name, start ($EPOCHREALTIME) and an optional detail
+_freq_dirs_trace_span() {{
+    local start_us duration_us
+    printf -v start_us '%.0f' $(( $3 * 1e6 ))
+    printf -v duration_us '%.0f' $(( (EPOCHREALTIME - $3) * 1e6 ))
+    print -r -- "${{start_us}}|${{duration_us}}|zsh|$1|$2|$4" >> "$_FREQ_TRACE"
+}}
+
+# wfreq --trace[=FILE] [option]: run wfreq once with every step timed and
+# write the spans as a Chrome trace for chrome://tracing or Perfetto
+_freq_dirs_trace() {{
+    local output="./pathwise_trace.json"
+    [[ "$1" == --trace=* ]] && output="${{1#--trace=}}"
+    shift
+    if [[ -z "$output" ]] || (( ${{+_FREQ_TRACE}} )); then
+        echo "Usage: wfreq --trace[=FILE] [option], e.g. wfreq --trace=wfreq.json --insights"
+        return 1
+    fi
+    zmodload zsh/datetime 2>/dev/null || return 1
+
+    # Python helpers started while tracing append their own spans to the same file
+    local -x _FREQ_TRACE=$(mktemp)
+    local trace_start=$EPOCHREALTIME
+
+    # Drop the cached listing so the trace shows a full rebuild, not the snapshot
+    (( $# )) || rm -f "$FREQ_DIRS_SNAPSHOT_LISTING"
+    wfreq "$@"
+    _freq_dirs_trace_span wfreq "wfreq${{1:+ $1}}" $trace_start
+
+    echo ""
+    python3 -c "
+import sys
+sys.path.insert(0, '{Path(__file__).resolve().parent}')
+from python.logic.trace_events import write_trace_for_shell
+print(write_trace_for_shell(sys.argv[1], sys.argv[2]))
+" "$_FREQ_TRACE" "$output"
+    rm -f "$_FREQ_TRACE"
+}}
+
+# wfreq --startup: new-shell latency trend and the slowest start-up parts
+_freq_dirs_show_startup() {{
+    local history="${{PATHWISE_STARTUP_FILE:-$FREQ_DIRS_STARTUP}}"
+    if [[ "$1" == "--reset" ]]; then
+        : > "$history"
+        echo "Startup history cleared."
+        return
+    fi
+
+    if [[ ! -s "$history" ]]; then
+        echo "No shell start-ups recorded yet. Add this as the first line of ~/.zshrc:"
+        echo "  source {Path(__file__).resolve().parent}/pathwise-startup.zsh"
+        echo "Then open a few new terminals."
+        return
+    fi
+
+    python3 -c "
+import sys
+sys.path.insert(0, '{Path(__file__).resolve().parent}')
+from python.logic.startup_profile import startup_report_for_shell
+report = startup_report_for_shell(sys.argv[1])
+if report:
+    print(report)
+" "$history"
+}}
+
+# wfreq --profile: latency histograms and step breakdowns per hook
+_freq_dirs_show_profile() {{
+    if [[ "$1" == "--reset" ]]; then
+        : > "$FREQ_DIRS_PROFILE"
+        _FREQ_PROF_LINES=0
+        echo "Profile cleared."
+        return
+    fi
+
+    if [[ ! -s "$FREQ_DIRS_PROFILE" ]]; then
+        echo "No profile recorded yet. Start a shell with profiling on, then use it for a while:"
+        echo "  FREQ_PROFILE=1 zsh"
+        return
+    fi
+
+    python3 -c "
+import sys
+sys.path.insert(0, '{Path(__file__).resolve().parent}')
+from python.logic.hook_profile import profile_report_for_shell
+report = profile_report_for_shell(sys.argv[1])
+if report:
+    print(report)
+" "$FREQ_DIRS_PROFILE"
+}}
 """
 
 
@@ -201,8 +643,9 @@ _freq_dirs_track_git_commit() {{
     local commit_msg=$(git log -1 --pretty=%s 2>/dev/null)
     local timestamp=$(date +%s)
 
-    # Record commit
-    echo "${{current_dir}}|${{commit_hash}}|${{timestamp}}|${{commit_msg}}" >> "$FREQ_DIRS_GIT"
+    # Record commit, keyed by the directory's dictionary ID
+    _freq_dirs_dir_id "$current_dir"
+    echo "${{REPLY}}|${{commit_hash}}|${{timestamp}}|${{commit_msg}}" >> "$FREQ_DIRS_GIT"
 
     # Update today's git count
     if grep -q "^${{current_dir}}|" "$FREQ_DIRS_GIT_TODAY" 2>/dev/null; then
@@ -215,6 +658,8 @@ _freq_dirs_track_git_commit() {{
     else
         echo "${{current_dir}}|1" >> "$FREQ_DIRS_GIT_TODAY"
     fi
+
+    _freq_dirs_bump_generation
 }}
 
 # Get git commit count for a directory
@@ -347,10 +792,12 @@ _freq_dirs_analyze_commits() {{
             [[ -z "$timestamp" ]] && continue
             [[ $timestamp -lt $today_timestamp ]] && continue
 
+            (( ${{+_FREQ_TRACE}} )) && local trace_start=$EPOCHREALTIME
             local msg_lower=$(echo "$msg" | tr '[:upper:]' '[:lower:]')
             local result=$(_freq_dirs_categorize_with_keyword "$msg_lower")
             local category=$(echo "$result" | cut -d'|' -f1)
             local keyword=$(echo "$result" | cut -d'|' -f2)
+            (( ${{+_FREQ_TRACE}} )) && _freq_dirs_trace_span categorize "categorize commit" $trace_start "$msg"
 
             case "$category" in
                 revert)
@@ -492,17 +939,50 @@ _freq_dirs_analyze_commits() {{
 """
 
 
+def generate_git_perf() -> str:
+    """Generate the functions that fold and report the git wrapper's timings"""
+    return f"""
+# Fold the git wrapper's timings into per-day histograms and truncate the log
+_freq_dirs_compact_git_perf() {{
+    [[ -s "$FREQ_DIRS_GIT_PERF" ]] || [[ -f "${{FREQ_DIRS_GIT_PERF}}.compacting" ]] || return 0
+    python3 -c "
+import sys
+sys.path.insert(0, '{Path(__file__).resolve().parent}')
+from python.logic.command_runtimes import compact_runtime_log
+compact_runtime_log(sys.argv[1], sys.argv[2])
+" "$FREQ_DIRS_GIT_PERF" "$FREQ_DIRS_GIT_PERF_HIST" 2>/dev/null
+}}
+
+# wfreq --git-perf: git subcommand latency per repository, slow status first
+_freq_dirs_show_git_perf() {{
+    if [[ ! -s "$FREQ_DIRS_GIT_PERF" && ! -s "$FREQ_DIRS_GIT_PERF_HIST" ]]; then
+        echo "No git timings yet. They are recorded each time you run git in a repository."
+        return
+    fi
+
+    python3 -c "
+import sys
+sys.path.insert(0, '{Path(__file__).resolve().parent}')
+from python.logic.command_runtimes import MIN_RUNS
+from python.logic.git_perf import git_perf_report_for_shell
+report = git_perf_report_for_shell(sys.argv[1], sys.argv[2], sys.argv[3])
+print(report or f'No git command has run {{MIN_RUNS}} times in one repository yet.')
+" "$FREQ_DIRS_GIT_PERF" "$FREQ_DIRS_GIT_PERF_HIST" "$FREQ_DIRS_DIRS" 2>/dev/null
+}}
+"""
+
+
 def generate_tools_analysis_multi() -> str:
     """Generate function to analyze tools across multiple directories"""
-    return """
+    return f"""
 # Analyze tool usage across top directories
-_freq_dirs_analyze_tools_multi() {
+_freq_dirs_analyze_tools_multi() {{
     if [[ "$FREQ_TRACK_TOOLS" != "true" ]]; then
         echo "Tool tracking is disabled. Enable it with: wfreq --config"
         return
     fi
 
-    if [[ ! -s "$FREQ_DIRS_TOOLS" ]]; then
+    if ! _freq_dirs_has_tool_data; then
         echo "No tool usage data yet. Start using tools to see analytics!"
         return
     fi
@@ -519,78 +999,20 @@ _freq_dirs_analyze_tools_multi() {
         return
     fi
 
-    # Process each top directory
-    while IFS='|' read -r dir count time git_count period; do
-        local temp_file=$(mktemp)
-
-        # Get tools used in this directory
-        grep "^${dir}|" "$FREQ_DIRS_TOOLS" 2>/dev/null > "$temp_file" || true
-
-        if [[ -s "$temp_file" ]]; then
-            local total_uses=$(wc -l < "$temp_file")
-
-            printf "\\033[96m📁 %s\\033[0m \\033[90m(%d tool invocations)\\033[0m\\n" "$dir" "$total_uses"
-
-            # Top 5 tools for this directory
-            awk -F'|' '{print $2}' "$temp_file" | sort | uniq -c | sort -rn | head -5 | while read count tool; do
-                local percent=$((count * 100 / total_uses))
-                local tool_info=$(grep "|${tool}|" "$temp_file" | head -1 | awk -F'|' '{print $3}')
-
-                # Determine category label
-                local category_label=""
-                if [[ "$tool_info" == "custom" ]]; then
-                    # Check if it's a script with ./ prefix
-                    if [[ "$tool" == ./* ]] || [[ "$tool" == ../* ]]; then
-                        category_label="custom script"
-                    else
-                        category_label="user tool"
-                    fi
-                elif [[ "$tool_info" == "known" ]]; then
-                    # Map known tools to categories
-                    case "$tool" in
-                        claude|gemini|opencode|chatgpt|copilot|codeium|aider|cursor|cody|tabnine|gpt|ollama|sgpt|llm)
-                            category_label="AI assistant" ;;
-                        nano|vim|vi|nvim|neovim|emacs|code|subl)
-                            category_label="editor" ;;
-                        git|svn|hg)
-                            category_label="version control" ;;
-                        npm|yarn|pnpm|pip|cargo|go|gem)
-                            category_label="package manager" ;;
-                        make|cmake|ninja|gradle|maven)
-                            category_label="build tool" ;;
-                        python|python3|node|ruby|java)
-                            category_label="runner" ;;
-                        cat|less|grep|find|ls|tree)
-                            category_label="file tool" ;;
-                        *)
-                            category_label="tool" ;;
-                    esac
-                else
-                    category_label="tool"
-                fi
-
-                # Color based on percentage
-                local color="\\033[37m"  # Default white
-                if [[ $percent -gt 40 ]]; then
-                    color="\\033[91m"  # Bright red for dominant
-                elif [[ $percent -gt 25 ]]; then
-                    color="\\033[93m"  # Yellow for frequent
-                elif [[ $percent -gt 15 ]]; then
-                    color="\\033[92m"  # Green for moderate
-                fi
-
-                printf "   ${color}%-12s %3d uses (%2d%%)\\033[0m  \\033[90m← %s\\033[0m\\n" "${tool}:" "$count" "$percent" "$category_label"
-            done
-            echo ""
-        fi
-
-        rm -f "$temp_file"
-    done <<< "$merged_data"
+    # Group the whole tool log by directory in a single pass
+    print -r -- "$merged_data" | python3 -c "
+import sys
+sys.path.insert(0, '{Path(__file__).resolve().parent}')
+from python.logic.tool_analytics import tools_report_for_shell
+report = tools_report_for_shell(sys.argv[1], sys.argv[2], sys.stdin, sys.argv[3])
+if report:
+    print(report)
+" "$FREQ_DIRS_TOOLS" "$FREQ_DIRS_TOOL_COUNTS" "$FREQ_DIRS_DIRS"
 
     echo ""
     printf "  \\033[90mShowing top 5 tools per directory\\033[0m\\n"
     printf "  \\033[90m💡 Use 'wfreq --config' to change number of directories shown\\033[0m\\n"
-}
+}}
 """
 
 
@@ -615,6 +1037,7 @@ _freq_dirs_track_tool() {{
     local full_cmd="$1"
     # Extract just the tool name (first word)
     local tool=$(echo "$full_cmd" | awk '{{print $1}}')
+    (( _FREQ_PROF_DEPTH )) && _freq_dirs_prof_step parse
 
     # Skip if empty
     [[ -z "$tool" ]] && return
@@ -628,7 +1051,7 @@ _freq_dirs_track_tool() {{
 
     # Skip PathWise's own commands to avoid noise in tool tracking
     case "$tool" in
-        wfreq|wj1|wj2|wj3|wj4|wj5|wj6|wj7|wj8|wj9|wj10|_freq_dirs_git_wrapper)
+        wfreq|pathwise|wj1|wj2|wj3|wj4|wj5|wj6|wj7|wj8|wj9|wj10|_freq_dirs_git_wrapper)
             return
             ;;
     esac
@@ -675,6 +1098,7 @@ _freq_dirs_track_tool() {{
             fi
         fi
     fi
+    (( _FREQ_PROF_DEPTH )) && _freq_dirs_prof_step resolve
 
     # Check if it's an actual executable command or custom script
     if [[ "$is_custom_script" == "true" ]] || command -v "$tool_to_track" >/dev/null 2>&1; then
@@ -694,124 +1118,134 @@ _freq_dirs_track_tool() {{
                     ;;
             esac
         fi
+        (( _FREQ_PROF_DEPTH )) && _freq_dirs_prof_step categorize
 
         # Record tool usage with optional alias info
-        echo "${{current_dir}}|${{tool_to_track}}|${{tool_type}}${{alias_info}}|$(date +%s)" >> "$FREQ_DIRS_TOOLS"
-    fi
-}}
-
-# Analyze tool usage for a directory
-_freq_dirs_analyze_tools() {{
-    local target_dir="${{1:-${{PWD/#$HOME/~}}}}"
-    local temp_file=$(mktemp)
+        _freq_dirs_dir_id "$current_dir"
+        local dir_id=$REPLY  # The profiler's steps overwrite REPLY
+        echo "${{dir_id}}|${{tool_to_track}}|${{tool_type}}${{alias_info}}|$(date +%s)" >> "$FREQ_DIRS_TOOLS"
+        (( _FREQ_PROF_DEPTH )) && _freq_dirs_prof_step write
 
-    if [[ ! -s "$FREQ_DIRS_TOOLS" ]]; then
-        return
+        # Time the command until the next prompt, see `wfreq --slow`
+        _FREQ_RUN_DIR=$dir_id _FREQ_RUN_TOOL=$tool_to_track _FREQ_RUN_START=$EPOCHREALTIME
     fi
+}}
 
-    # Get tools used in this directory
-    grep "^${{target_dir}}|" "$FREQ_DIRS_TOOLS" 2>/dev/null > "$temp_file" || true
+# Command being timed between preexec and the next prompt
+typeset -g _FREQ_RUN_DIR="" _FREQ_RUN_TOOL="" _FREQ_RUN_START=""
+
+# Log how long the command _freq_dirs_track_tool started ran
+_freq_dirs_track_runtime() {{
+    [[ -n "$_FREQ_RUN_START" ]] || return 0
+    local milliseconds
+    printf -v milliseconds '%.0f' $(( (EPOCHREALTIME - _FREQ_RUN_START) * 1000 ))
+    print -r -- "${{_FREQ_RUN_DIR}}|${{_FREQ_RUN_TOOL}}|${{EPOCHSECONDS}}|${{milliseconds}}" \\
+        >> "$FREQ_DIRS_RUNTIMES"
+    _FREQ_RUN_START=""
+}}
 
-    if [[ ! -s "$temp_file" ]]; then
-        rm -f "$temp_file"
+# wfreq --slow: runtime percentiles per project and today's slowdowns
+_freq_dirs_show_slow() {{
+    if [[ ! -s "$FREQ_DIRS_RUNTIMES" && ! -s "$FREQ_DIRS_RUNTIME_HIST" ]]; then
+        echo "No command runtimes yet. They are recorded while tool tracking is on."
         return
     fi
 
-    # Count tool usage
-    local total_uses=$(wc -l < "$temp_file")
-
-    printf "\\033[94m🛠️  Tool Usage in ${{target_dir}}:\\033[0m\\n"
-    printf "  \\033[93mTotal tool invocations: ${{total_uses}}\\033[0m\\n"
-    echo ""
-
-    # Top 10 tools (group git and its aliases together)
-    printf "  \\033[36mTop 10 Tools:\\033[0m\\n"
-
-    # Extract and count tools, merging git aliases
-    local tool_counts=$(mktemp)
-    while IFS='|' read -r dir tool info timestamp; do
-        # Check if this is a git alias
-        if [[ "$info" == *"|alias:"* ]]; then
-            # It's an alias, check if it's a git alias
-            local alias_part=$(echo "$info" | sed 's/.*|alias://')
-            if [[ "$tool" == "git" ]]; then
-                # Count as git with alias info
-                echo "git" >> "$tool_counts"
-            else
-                echo "$tool" >> "$tool_counts"
-            fi
-        else
-            echo "$tool" >> "$tool_counts"
-        fi
-    done < "$temp_file"
-
-    sort "$tool_counts" | uniq -c | sort -rn | head -10 | while read count tool; do
-        local percent=$((count * 100 / total_uses))
-        local tool_info=$(grep "|${{tool}}|" "$temp_file" | head -1 | awk -F'|' '{{print $3}}' | cut -d'|' -f1)
-
-        # Check for git aliases used with this tool
-        local git_aliases=""
-        if [[ "$tool" == "git" ]]; then
-            git_aliases=$(grep "|git|" "$temp_file" | grep "|alias:" | sed 's/.*|alias://' | cut -d'=' -f1 | sort -u | tr '\\n' ',' | sed 's/,$//' | sed 's/,/, /g')
-            if [[ -n "$git_aliases" ]]; then
-                git_aliases=" (via $git_aliases)"
-            fi
-        fi
-
-        # Color based on type
-        local color="\\033[37m"  # Default white
-        if [[ "$tool_info" == "custom" ]]; then
-            color="\\033[95m"  # Magenta for custom
-        elif [[ "$tool_info" == "known" ]] || [[ "$tool_info" == "version_control" ]]; then
-            color="\\033[96m"  # Cyan for known
-        fi
-
-        printf "    ${{color}}%-15s\\033[0m %3d uses \\033[90m(%d%%)${{git_aliases}}\\033[0m\\n" "${{tool}}:" "$count" "$percent"
-    done
-
-    rm -f "$tool_counts"
+    python3 -c "
+import sys
+sys.path.insert(0, '{Path(__file__).resolve().parent}')
+from python.logic.command_runtimes import MIN_RUNS, slow_report_for_shell
+report = slow_report_for_shell(sys.argv[1], sys.argv[2], sys.argv[3])
+print(report or f'No command has run {{MIN_RUNS}} times yet. Check back later.')
+" "$FREQ_DIRS_RUNTIMES" "$FREQ_DIRS_RUNTIME_HIST" "$FREQ_DIRS_DIRS" 2>/dev/null
+}}
 
-    # Add hint about --tools flag
-    echo ""
-    printf "  \\033[90m💡 Use 'wfreq --tools' to see tool usage across top directories\\033[0m\\n"
+# Check whether any tool usage has been recorded, raw or compacted
+_freq_dirs_has_tool_data() {{
+    [[ -s "$FREQ_DIRS_TOOLS" ]] || [[ -s "$FREQ_DIRS_TOOL_COUNTS" ]]
+}}
 
-    # Show custom scripts and AI tools if any
-    echo ""
-    local custom_scripts=$(awk -F'|' '$3=="custom" {{print $2}}' "$temp_file" | grep '^\\.\\/' | sort -u)
-    local ai_tools=$(grep -E "\\|(claude|gemini|opencode|chatgpt|copilot|codeium|aider|cursor|cody|tabnine|gpt|ollama|sgpt|llm)\\|" "$temp_file" | awk -F'|' '{{print $2}}' | sort -u)
+# Fold the raw tool and runtime logs into per-day counters and histograms
+_freq_dirs_compact_tools() {{
+    [[ -s "$FREQ_DIRS_TOOLS" ]] || [[ -f "${{FREQ_DIRS_TOOLS}}.compacting" ]] || \\
+        [[ -s "$FREQ_DIRS_RUNTIMES" ]] || [[ -f "${{FREQ_DIRS_RUNTIMES}}.compacting" ]] || return 0
+    python3 -c "
+import sys
+sys.path.insert(0, '{Path(__file__).resolve().parent}')
+from python.logic.command_runtimes import compact_runtime_log
+from python.logic.tool_counters import compact_tool_log
+compact_tool_log(sys.argv[1], sys.argv[2])
+compact_runtime_log(sys.argv[3], sys.argv[4])
+" "$FREQ_DIRS_TOOLS" "$FREQ_DIRS_TOOL_COUNTS" "$FREQ_DIRS_RUNTIMES" "$FREQ_DIRS_RUNTIME_HIST" 2>/dev/null
+}}
 
-    if [[ -n "$custom_scripts" ]]; then
-        printf "  \\033[35mCustom Scripts Used Here:\\033[0m\\n"
-        echo "$custom_scripts" | head -5 | while read tool; do
-            [[ -n "$tool" ]] && printf "    📜 %s\\n" "$tool"
-        done
-        echo ""
-    fi
+# Analyze tool usage for a directory
+_freq_dirs_analyze_tools() {{
+    local target_dir="${{1:-${{PWD/#$HOME/~}}}}"
 
-    if [[ -n "$ai_tools" ]]; then
-        printf "  \\033[94mAI Assistants Used Here:\\033[0m\\n"
-        echo "$ai_tools" | head -5 | while read tool; do
-            [[ -n "$tool" ]] && printf "    🤖 %s\\n" "$tool"
-        done
-    fi
+    _freq_dirs_has_tool_data || return
 
-    rm -f "$temp_file"
+    python3 -c "
+import sys
+sys.path.insert(0, '{Path(__file__).resolve().parent}')
+from python.logic.tool_analytics import directory_report_for_shell
+report = directory_report_for_shell(sys.argv[1], sys.argv[2], sys.argv[3], sys.argv[4])
+if report:
+    print(report)
+" "$FREQ_DIRS_TOOLS" "$FREQ_DIRS_TOOL_COUNTS" "$target_dir" "$FREQ_DIRS_DIRS" 2>/dev/null
 }}
 """
 
 
 def generate_rotation_functions() -> str:
     """Generate daily data rotation functions"""
-    return """
+    return f"""
+# @feature time
+# File finished sessions into monthly archives, compress old months and trim
+_freq_dirs_archive_sessions() {{
+    python3 -c "
+import sys
+sys.path.insert(0, '{Path(__file__).resolve().parent}')
+from python.logic.session_archive import rotate_archive
+rotate_archive(sys.argv[1], int(sys.argv[2]), int(sys.argv[3]))
+" "$FREQ_DIRS_SESSIONS" "$FREQ_ARCHIVE_MONTHS" "$FREQ_ARCHIVE_MAX_MB" 2>/dev/null
+}}
+# @end feature
+
+# Fold and archive the append-only logs once a day, whether or not the
+# daily reset is on, so they stay bounded either way
+_freq_dirs_daily_maintenance() {{
+    local today="$1"
+    [[ -s "$FREQ_DIRS_LAST_MAINTENANCE" ]] && [[ "$(<"$FREQ_DIRS_LAST_MAINTENANCE")" == "$today" ]] && return
+    echo "$today" > "$FREQ_DIRS_LAST_MAINTENANCE"
+
+    # @feature time
+    # Move finished sessions into the monthly archive
+    _freq_dirs_archive_sessions &!
+    # @end feature
+
+    # @feature git
+    # Fold the git timings into the histograms
+    _freq_dirs_compact_git_perf &!
+    # @end feature
+
+    # @feature tools
+    # Fold the tool log and command runtimes into the compacted counters
+    _freq_dirs_compact_tools &!
+    # @end feature
+}}
+
 # Check if we need to rotate data (daily reset)
-_freq_dirs_check_rotation() {
+_freq_dirs_check_rotation() {{
     _freq_dirs_load_config
 
+    local today=$(date +%Y-%m-%d)
+    _freq_dirs_daily_maintenance "$today"
+
     if [[ "$FREQ_AUTO_RESET" != "true" ]]; then
         return
     fi
 
-    local today=$(date +%Y-%m-%d)
     local last_reset=$(cat "$FREQ_DIRS_LAST_RESET" 2>/dev/null || echo "1970-01-01")
 
     if [[ "$today" != "$last_reset" ]]; then
@@ -822,16 +1256,12 @@ _freq_dirs_check_rotation() {
         touch "$FREQ_DIRS_TODAY"
         echo "$today" > "$FREQ_DIRS_LAST_RESET"
 
-        # Archive session data with date
-        if [[ -s "$FREQ_DIRS_SESSIONS" ]]; then
-            cat "$FREQ_DIRS_SESSIONS" >> "${FREQ_DIRS_SESSIONS}.archive"
-            > "$FREQ_DIRS_SESSIONS"
-        fi
-
         # Reset git counts for today
         > "$FREQ_DIRS_GIT_TODAY"
+
+        _freq_dirs_bump_generation
     fi
-}
+}}
 """
 
 
@@ -846,8 +1276,9 @@ _freq_dirs_record_time() {
 
         # Only record if spent minimum time
         if [[ $duration -ge $FREQ_MIN_TIME ]]; then
-            # Record session
-            echo "${FREQ_CURRENT_DIR}|${FREQ_ENTER_TIME}|${exit_time}|${duration}" >> "$FREQ_DIRS_SESSIONS"
+            # Record session, keyed by the directory's dictionary ID
+            _freq_dirs_dir_id "$FREQ_CURRENT_DIR"
+            echo "${REPLY}|${FREQ_ENTER_TIME}|${exit_time}|${duration}" >> "$FREQ_DIRS_SESSIONS"
 
             # Update today's time tracking
             if grep -q "^${FREQ_CURRENT_DIR}|" "$FREQ_DIRS_TODAY" 2>/dev/null; then
@@ -860,6 +1291,7 @@ _freq_dirs_record_time() {
                 grep -v "^${FREQ_CURRENT_DIR}|" "$FREQ_DIRS_TODAY" > "${FREQ_DIRS_TODAY}.tmp" 2>/dev/null
                 echo "${FREQ_CURRENT_DIR}|${count}|${new_time}" >> "${FREQ_DIRS_TODAY}.tmp"
                 mv "${FREQ_DIRS_TODAY}.tmp" "$FREQ_DIRS_TODAY"
+                _freq_dirs_bump_generation
             fi
         fi
     fi
@@ -876,11 +1308,15 @@ _freq_dirs_update() {
 
     # Check for rotation first
     _freq_dirs_check_rotation
+    (( _FREQ_PROF_DEPTH )) && _freq_dirs_prof_step rotation
 
+    # @feature time
     # Record time in previous directory
     if [[ "$FREQ_TRACK_TIME" == "true" ]]; then
         _freq_dirs_record_time
+        (( _FREQ_PROF_DEPTH )) && _freq_dirs_prof_step record_time
     fi
+    # @end feature
 
     # Don't track home directory itself or root
     if [[ "$current_dir" == "~" ]] || [[ "$current_dir" == "/" ]]; then
@@ -914,88 +1350,18 @@ _freq_dirs_update() {
         # New directory, add with count 1 and time 0
         echo "${current_dir}|1|0" >> "$FREQ_DIRS_TODAY"
     fi
+    (( _FREQ_PROF_DEPTH )) && _freq_dirs_prof_step today
+
+    _freq_dirs_bump_generation
 }
 """
 
 
 def generate_insights() -> str:
     """Generate insights generation function with colorization"""
-    return """
-# Shared git commit analysis function
-_freq_dirs_analyze_git_commits() {
-    local target_dir="$1"
-    local format="${2:-toml}"  # "display" or "toml"
-
-    if [[ "$FREQ_TRACK_GIT" != "true" ]]; then
-        return
-    fi
-
-    # Get git commits for target directory (or all if not specified)
-    local git_data=""
-    if [[ -n "$target_dir" ]]; then
-        git_data=$(grep "^${target_dir}|" "$FREQ_DIRS_GIT" 2>/dev/null)
-    else
-        git_data=$(cat "$FREQ_DIRS_GIT" 2>/dev/null)
-    fi
-
-    [[ -z "$git_data" ]] && return
-
-    # Count commits by category using priority-based categorization
-    local revert_count=0 fix_count=0 feat_count=0 perf_count=0 refactor_count=0
-    local test_count=0 build_count=0 ci_count=0 docs_count=0 style_count=0 chore_count=0 other_count=0
-
-    while IFS='|' read -r dir hash timestamp message; do
-        [[ -z "$message" ]] && continue
-        local msg_lower=$(echo "$message" | tr '[:upper:]' '[:lower:]')
-
-        # Use the same categorization function as the main insights
-        local category=$(_freq_dirs_categorize_commit "$msg_lower")
-
-        case "$category" in
-            revert) ((revert_count++)) ;;
-            fix) ((fix_count++)) ;;
-            feat) ((feat_count++)) ;;
-            perf) ((perf_count++)) ;;
-            refactor) ((refactor_count++)) ;;
-            test) ((test_count++)) ;;
-            build) ((build_count++)) ;;
-            ci) ((ci_count++)) ;;
-            docs) ((docs_count++)) ;;
-            style) ((style_count++)) ;;
-            chore) ((chore_count++)) ;;
-            *) ((other_count++)) ;;
-        esac
-    done <<< "$git_data"
-
-    local total_commits=$((revert_count + fix_count + feat_count + perf_count + refactor_count + test_count + build_count + ci_count + docs_count + style_count + chore_count + other_count))
-
-    if [[ $total_commits -eq 0 ]]; then
-        return
-    fi
-
-    # Output in requested format
-    if [[ "$format" == "toml" ]]; then
-        # TOML key=value format for export
-        [[ $revert_count -gt 0 ]] && echo "reverts = $revert_count"
-        [[ $fix_count -gt 0 ]] && echo "fixes = $fix_count"
-        [[ $feat_count -gt 0 ]] && echo "features = $feat_count"
-        [[ $perf_count -gt 0 ]] && echo "performance = $perf_count"
-        [[ $refactor_count -gt 0 ]] && echo "refactoring = $refactor_count"
-        [[ $test_count -gt 0 ]] && echo "tests = $test_count"
-        [[ $build_count -gt 0 ]] && echo "build = $build_count"
-        [[ $ci_count -gt 0 ]] && echo "ci_cd = $ci_count"
-        [[ $docs_count -gt 0 ]] && echo "documentation = $docs_count"
-        [[ $style_count -gt 0 ]] && echo "style = $style_count"
-        [[ $chore_count -gt 0 ]] && echo "chore = $chore_count"
-        [[ $other_count -gt 0 ]] && echo "other = $other_count"
-    fi
-
-    # Return total count for reference
-    return $total_commits
-}
-
+    return f"""
 # Generate insights from collected data
-_freq_dirs_generate_insights() {
+_freq_dirs_generate_insights() {{
     local temp_file=$(mktemp)
 
     # Analyze today's data
@@ -1032,81 +1398,48 @@ _freq_dirs_generate_insights() {
                     elif [[ $percent -gt 10 ]]; then
                         color="92"  # Bright green for > 10%
                     fi
-                    printf "  %-40s \\033[${color}m%s (%d%%)\\033[0m\\n" "$dir" "$(_freq_dirs_format_time $time)" "$percent" >> "$temp_file"
-                fi
-            done
-            echo "" >> "$temp_file"
-        fi
-
-        # Session analysis
-        if [[ -s "$FREQ_DIRS_SESSIONS" ]]; then
-            printf "\\033[35m📈 Session Patterns:\\033[0m\\n" >> "$temp_file"
-
-            # Find peak hours
-            local hour_counts=$(mktemp)
-            cat "$FREQ_DIRS_SESSIONS" | while IFS='|' read -r dir start_time end_time duration; do
-                date -d "@$start_time" +%H >> "$hour_counts"
-            done
-
-            if [[ -s "$hour_counts" ]]; then
-                local peak_hour=$(sort "$hour_counts" | uniq -c | sort -rn | head -1 | awk '{print $2}')
-                [[ -n "$peak_hour" ]] && printf "  Peak activity hour: \\033[93m${peak_hour}:00\\033[0m\\n" >> "$temp_file"
-            fi
-            rm -f "$hour_counts"
-
-            # Average session duration
-            local session_count=$(wc -l < "$FREQ_DIRS_SESSIONS")
-            if [[ $session_count -gt 0 ]]; then
-                local total_session_time=$(awk -F'|' '{sum+=$4} END {print sum}' "$FREQ_DIRS_SESSIONS")
-                local avg_time=$((total_session_time / session_count))
-                printf "  Average time per directory: \\033[92m$(_freq_dirs_format_time $avg_time)\\033[0m\\n" >> "$temp_file"
-            fi
-
-            # Directory sequences (patterns)
-            echo "" >> "$temp_file"
-            printf "\\033[96m🔄 Common Navigation Patterns:\\033[0m\\n" >> "$temp_file"
-            local prev_dir=""
-            local patterns=$(mktemp)
-            cat "$FREQ_DIRS_SESSIONS" | sort -t'|' -k2 -n | while IFS='|' read -r dir start_time end_time duration; do
-                if [[ -n "$prev_dir" ]] && [[ "$prev_dir" != "$dir" ]]; then
-                    # Only record if actually changed directories (skip self-navigation from editors)
-                    echo "${prev_dir} → ${dir}" >> "$patterns"
+                    printf "  %-40s \\033[${{color}}m%s (%d%%)\\033[0m\\n" "$dir" "$(_freq_dirs_format_time $time)" "$percent" >> "$temp_file"
                 fi
-                prev_dir="$dir"
             done
-
-            if [[ -s "$patterns" ]]; then
-                sort "$patterns" | uniq -c | sort -rn | head -3 | while read count pattern; do
-                    # Split pattern into parts and colorize arrow (using awk for multi-byte delimiter)
-                    local from_dir=$(echo "$pattern" | awk -F' → ' '{print $1}')
-                    local to_dir=$(echo "$pattern" | awk -F' → ' '{print $2}')
-                    printf "  %s \\033[93m→\\033[0m %s \\033[90m(%sx)\\033[0m\\n" "$from_dir" "$to_dir" "$count" >> "$temp_file"
-                done
-            fi
-            rm -f "$patterns"
             echo "" >> "$temp_file"
         fi
 
+        # Session analysis: peak times, session lengths and common moves in
+        # one pass over the live and archived sessions
+        python3 -c "
+import sys
+sys.path.insert(0, '{Path(__file__).resolve().parent}')
+from python.logic.session_insights import session_patterns_for_shell
+report = session_patterns_for_shell(sys.argv[1], sys.argv[2])
+if report:
+    print(report)
+    print()
+" "$FREQ_DIRS_SESSIONS" "$FREQ_DIRS_DIRS" >> "$temp_file" 2>/dev/null
+
+        # @feature git
         # Add git analytics
         local git_analysis=$(_freq_dirs_analyze_commits)
         if [[ -n "$git_analysis" ]]; then
             echo "$git_analysis" >> "$temp_file"
         fi
+        # @end feature
 
+        # @feature tools
         # Add tool usage analytics
         if [[ "$FREQ_TRACK_TOOLS" == "true" ]]; then
             echo "" >> "$temp_file"
-            local current_dir="${PWD/#$HOME/~}"
+            local current_dir="${{PWD/#$HOME/~}}"
             local tool_analysis=$(_freq_dirs_analyze_tools "$current_dir")
             if [[ -n "$tool_analysis" ]]; then
                 echo "$tool_analysis" >> "$temp_file"
             fi
         fi
+        # @end feature
     fi
 
     cat "$temp_file"
     rm -f "$temp_file"
-}
+}}
 """
 
 
@@ -1179,12 +1512,18 @@ _freq_dirs_get_merged_data() {
     typeset -A dir_time
     typeset -A dir_commits
     typeset -A dir_periods
+    (( ${+_FREQ_TRACE} )) && local trace_start=$EPOCHREALTIME
 
     # Process today's data
     if [[ -s "$FREQ_DIRS_TODAY" ]]; then
         while IFS='|' read -r dir count time; do
             [[ -z "$time" ]] && time=0
+            # @feature git
             local git_count=$(_freq_dirs_get_git_count "$dir")
+            # @end feature
+            # @feature !git
+            local git_count=0
+            # @end feature
 
             # Accumulate values
             dir_visits[$dir]=$((${dir_visits[$dir]:-0} + count))
@@ -1218,9 +1557,11 @@ _freq_dirs_get_merged_data() {
             fi
         done < "$FREQ_DIRS_YESTERDAY"
     fi
+    (( ${+_FREQ_TRACE} )) && _freq_dirs_trace_span merge "merge today & yesterday" $trace_start
 
     # Apply project consolidation if enabled
     if [[ "$consolidate" == "true" ]]; then
+        (( ${+_FREQ_TRACE} )) && trace_start=$EPOCHREALTIME
         # New associative arrays for consolidated data
         typeset -A project_visits
         typeset -A project_time
@@ -1231,6 +1572,7 @@ _freq_dirs_get_merged_data() {
 
         # Consolidate directories to project roots
         for dir in ${(k)dir_visits}; do
+            (( ${+_FREQ_TRACE} )) && local dir_start=$EPOCHREALTIME
             # Find project root for this directory
             local project_info=$(_freq_dirs_find_project_root "$dir")
             local project_root=$(echo "$project_info" | cut -d'|' -f1)
@@ -1257,7 +1599,9 @@ _freq_dirs_get_merged_data() {
             elif [[ "${project_periods[$project_root]}" != "${dir_periods[$dir]}" ]]; then
                 project_periods[$project_root]="combined"
             fi
+            (( ${+_FREQ_TRACE} )) && _freq_dirs_trace_span consolidate "consolidate" $dir_start "$dir"
         done
+        (( ${+_FREQ_TRACE} )) && _freq_dirs_trace_span merge "consolidate all" $trace_start
 
         # Output consolidated project data
         for project in ${(k)project_visits}; do
@@ -1273,6 +1617,7 @@ _freq_dirs_get_merged_data() {
     fi
 
     # Sort based on configuration using cumulative totals
+    (( ${+_FREQ_TRACE} )) && trace_start=$EPOCHREALTIME
     case "$FREQ_SORT_BY" in
         visits)
             # Sort by cumulative visit count
@@ -1287,6 +1632,7 @@ _freq_dirs_get_merged_data() {
             sort -t'|' -k3,3rn "$temp_file" > "$sorted_file"
             ;;
     esac
+    (( ${+_FREQ_TRACE} )) && _freq_dirs_trace_span sort "sort by ${FREQ_SORT_BY}" $trace_start
 
     # Output sorted data
     cat "$sorted_file"
@@ -1302,285 +1648,17 @@ def generate_freq_command() -> str:
 
     return f"""
 
-# Main wfreq function with argument parsing
-wfreq() {{
-    _freq_dirs_load_config
-
-    # Parse arguments
-    case "$1" in
-        --reset|-r)
-            # Check if stdin is available (terminal is interactive)
-            if [[ ! -t 0 ]]; then
-                echo "❌ Reset requires interactive terminal. Run 'wfreq --reset' manually."
-                return 1
-            fi
-
-            echo -n "Reset all frequency data? (y/N): "
-            read -t 10 response || response="n"
-            if [[ "$response" == "y" ]] || [[ "$response" == "Y" ]]; then
-                # Always clear basic navigation data
-                > "$FREQ_DIRS_TODAY"
-                > "$FREQ_DIRS_YESTERDAY"
-                > "$FREQ_DIRS_SESSIONS"
-                date +%Y-%m-%d > "$FREQ_DIRS_LAST_RESET"
-                FREQ_CURRENT_DIR=""
-                FREQ_ENTER_TIME=""
-                FREQ_SESSION_START=""
-
-                # Ask about insights and tracking data
-                echo -n "Also clear insights and tool tracking? (y/N): "
-                read -t 10 insights_response || insights_response="n"
-                if [[ "$insights_response" == "y" ]] || [[ "$insights_response" == "Y" ]]; then
-                    > "$FREQ_DIRS_INSIGHTS"
-                    > "$FREQ_DIRS_PATTERNS"
-                    > "$FREQ_DIRS_GIT"
-                    > "$FREQ_DIRS_GIT_TODAY"
-                    > "$FREQ_DIRS_TOOLS"
-                    echo "✅ All frequency and insights data reset."
-                else
-                    echo "✅ Frequency data reset (insights preserved)."
-                fi
-            else
-                echo "Cancelled."
-            fi
-            return
-            ;;
-        --insights|-i)
-            echo ""
-            _freq_dirs_generate_insights
-            echo ""
-            return
-            ;;
-        --tools|-t)
-            echo ""
-            _freq_dirs_analyze_tools_multi
-            echo ""
-            return
-            ;;
-        --export|-e)
-            shift  # Move past --export
-            _freq_dirs_export_toml "$@"
-            return
-            ;;
-        --config|-c)
-            # Check if stdin is available (terminal is interactive)
-            if [[ ! -t 0 ]]; then
-                echo "❌ Configuration requires interactive terminal. Run 'wfreq --config' manually."
-                return 1
-            fi
-
-            echo ""
-            printf "\\033[36m⚙️  PathWise Configuration\\033[0m\\n"
-            printf "\\033[90m────────────────────────────────────\\033[0m\\n"
-            echo ""
-            printf "\\033[93mCurrent settings:\\033[0m\\n"
-
-            # Color code the values based on their state
-            if [[ "${{FREQ_AUTO_RESET}}" == "true" ]]; then
-                printf "  Auto-reset: \\033[92menabled\\033[0m\\n"
-            else
-                printf "  Auto-reset: \\033[91mdisabled\\033[0m\\n"
-            fi
-
-            printf "  Reset hour: \\033[93m${{FREQ_RESET_HOUR}}:00\\033[0m\\n"
-            printf "  Show count: \\033[94m${{FREQ_SHOW_COUNT}}\\033[0m directories\\n"
-
-            if [[ "${{FREQ_TRACK_TIME}}" == "true" ]]; then
-                printf "  Track time: \\033[92menabled\\033[0m\\n"
-            else
-                printf "  Track time: \\033[91mdisabled\\033[0m\\n"
-            fi
-
-            printf "  Min time: \\033[94m${{FREQ_MIN_TIME}}\\033[0m seconds\\n"
-
-            if [[ "${{FREQ_TRACK_GIT}}" == "true" ]]; then
-                printf "  Track git: \\033[92menabled\\033[0m\\n"
-            else
-                printf "  Track git: \\033[91mdisabled\\033[0m\\n"
-            fi
-
-            if [[ "${{FREQ_TRACK_TOOLS}}" == "true" ]]; then
-                printf "  Track tools: \\033[92menabled\\033[0m\\n"
-            else
-                printf "  Track tools: \\033[91mdisabled\\033[0m\\n"
-            fi
-
-            printf "  Sort by: \\033[95m${{FREQ_SORT_BY}}\\033[0m\\n"
-            echo ""
-            printf "\\033[36mConfigure:\\033[0m\\n"
-
-            # Auto-reset configuration
-            printf "\\033[96m  Enable auto-reset?\\033[0m (y/n) \\033[90m[${{FREQ_AUTO_RESET}}]\\033[0m\\n"
-            printf "  \\033[90m→ Options: y=enable daily reset, n=keep data forever, Enter=no change\\033[0m\\n"
-            printf "  \\033[96m>\\033[0m "
-            read -t 10 response || response=""
-            if [[ -n "$response" ]]; then
-                if [[ "$response" == "y" ]] || [[ "$response" == "Y" ]]; then
-                    FREQ_AUTO_RESET="true"
-                else
-                    FREQ_AUTO_RESET="false"
-                fi
-            fi
-            echo ""
-
-            if [[ "$FREQ_AUTO_RESET" == "true" ]]; then
-                printf "\\033[96m  Reset hour\\033[0m (0-23) \\033[90m[${{FREQ_RESET_HOUR}}]\\033[0m\\n"
-                printf "  \\033[90m→ Options: 0=midnight, 12=noon, 23=11pm, Enter=no change\\033[0m\\n"
-                printf "  \\033[96m>\\033[0m "
-                read -t 10 response || response=""
-                if [[ -n "$response" ]] && [[ "$response" =~ ^[0-9]+$ ]] && [[ "$response" -ge 0 ]] && [[ "$response" -le 23 ]]; then
-                    FREQ_RESET_HOUR="$response"
-                fi
-                echo ""
-            fi
-
-            printf "\\033[96m  Number of directories to show\\033[0m (1-10) \\033[90m[${{FREQ_SHOW_COUNT}}]\\033[0m\\n"
-            printf "  \\033[90m→ Options: 1-10 directories, Enter=no change\\033[0m\\n"
-            printf "  \\033[96m>\\033[0m "
-            read response
-            if [[ -n "$response" ]] && [[ "$response" =~ ^[0-9]+$ ]] && [[ "$response" -ge 1 ]] && [[ "$response" -le 10 ]]; then
-                FREQ_SHOW_COUNT="$response"
-            fi
-            echo ""
-
-            printf "\\033[96m  Enable time tracking?\\033[0m (y/n) \\033[90m[${{FREQ_TRACK_TIME}}]\\033[0m\\n"
-            printf "  \\033[90m→ Options: y=track time spent, n=only track visits, Enter=no change\\033[0m\\n"
-            printf "  \\033[96m>\\033[0m "
-            read -t 10 response || response=""
-            if [[ -n "$response" ]]; then
-                if [[ "$response" == "y" ]] || [[ "$response" == "Y" ]]; then
-                    FREQ_TRACK_TIME="true"
-                else
-                    FREQ_TRACK_TIME="false"
-                fi
-            fi
-            echo ""
-
-            if [[ "$FREQ_TRACK_TIME" == "true" ]]; then
-                printf "\\033[96m  Minimum time to track\\033[0m (seconds) \\033[90m[${{FREQ_MIN_TIME}}]\\033[0m\\n"
-                printf "  \\033[90m→ Options: 0=track all, 5=default, 60=only 1min+, Enter=no change\\033[0m\\n"
-                printf "  \\033[96m>\\033[0m "
-                read -t 10 response || response=""
-                if [[ -n "$response" ]] && [[ "$response" =~ ^[0-9]+$ ]]; then
-                    FREQ_MIN_TIME="$response"
-                fi
-                echo ""
-            fi
-
-            printf "\\033[96m  Enable git tracking?\\033[0m (y/n) \\033[90m[${{FREQ_TRACK_GIT}}]\\033[0m\\n"
-            printf "  \\033[90m→ Options: y=track git commits, n=disable git features, Enter=no change\\033[0m\\n"
-            printf "  \\033[96m>\\033[0m "
-            read -t 10 response || response=""
-            if [[ -n "$response" ]]; then
-                if [[ "$response" == "y" ]] || [[ "$response" == "Y" ]]; then
-                    FREQ_TRACK_GIT="true"
-                else
-                    FREQ_TRACK_GIT="false"
-                fi
-            fi
-            echo ""
-
-            printf "\\033[96m  Enable tool tracking?\\033[0m (y/n) \\033[90m[${{FREQ_TRACK_TOOLS}}]\\033[0m\\n"
-            printf "  \\033[90m→ Options: y=track tool usage, n=disable tool tracking, Enter=no change\\033[0m\\n"
-            printf "  \\033[96m>\\033[0m "
-            read -t 10 response || response=""
-            if [[ -n "$response" ]]; then
-                if [[ "$response" == "y" ]] || [[ "$response" == "Y" ]]; then
-                    FREQ_TRACK_TOOLS="true"
-                else
-                    FREQ_TRACK_TOOLS="false"
-                fi
-            fi
-            echo ""
-
-            printf "\\033[96m  Sort by\\033[0m (visits/time/commits) \\033[90m[${{FREQ_SORT_BY}}]\\033[0m\\n"
-            printf "  \\033[90m→ Options: visits=most visited, time=longest time, commits=most commits, Enter=no change\\033[0m\\n"
-            printf "  \\033[96m>\\033[0m "
-            read response
-            if [[ -n "$response" ]] && [[ "$response" == "visits" || "$response" == "time" || "$response" == "commits" ]]; then
-                FREQ_SORT_BY="$response"
-            fi
-            echo ""
-
-            printf "\\033[96m  Enable project consolidation?\\033[0m (y/n) \\033[90m[${{FREQ_CONSOLIDATE}}]\\033[0m\\n"
-            printf "  \\033[90m→ Options: y=consolidate subdirs to projects, n=show all dirs, Enter=no change\\033[0m\\n"
-            printf "  \\033[96m>\\033[0m "
-            read -t 10 response || response=""
-            if [[ -n "$response" ]]; then
-                if [[ "$response" == "y" ]] || [[ "$response" == "Y" ]]; then
-                    FREQ_CONSOLIDATE="true"
-                else
-                    FREQ_CONSOLIDATE="false"
-                fi
-            fi
-            echo ""
-
-            if [[ "$FREQ_CONSOLIDATE" == "true" ]]; then
-                printf "\\033[96m  Max depth for project detection\\033[0m (1-10) \\033[90m[${{FREQ_CONSOLIDATE_DEPTH}}]\\033[0m\\n"
-                printf "  \\033[90m→ Options: 1-10 levels up to find project root, Enter=no change\\033[0m\\n"
-                printf "  \\033[96m>\\033[0m "
-                read -t 10 response || response=""
-                if [[ -n "$response" ]] && [[ "$response" =~ ^[0-9]+$ ]] && [[ "$response" -ge 1 ]] && [[ "$response" -le 10 ]]; then
-                    FREQ_CONSOLIDATE_DEPTH="$response"
-                fi
-                echo ""
-
-                printf "\\033[96m  Show subdirectory count?\\033[0m (y/n) \\033[90m[${{FREQ_SHOW_SUBDIR_COUNT}}]\\033[0m\\n"
-                printf "  \\033[90m→ Options: y=show 'includes X subdirs', n=hide count, Enter=no change\\033[0m\\n"
-                printf "  \\033[96m>\\033[0m "
-                read -t 10 response || response=""
-                if [[ -n "$response" ]]; then
-                    if [[ "$response" == "y" ]] || [[ "$response" == "Y" ]]; then
-                        FREQ_SHOW_SUBDIR_COUNT="true"
-                    else
-                        FREQ_SHOW_SUBDIR_COUNT="false"
-                    fi
-                fi
-                echo ""
-            fi
-
-            _freq_dirs_save_config
-            echo ""
-            printf "\\033[92m✅ Configuration saved!\\033[0m\\n"
-            return
-            ;;
-        --help|-h)
-            echo "PathWise - Be Wise About Your Paths 🗺️"
-            echo ""
-            echo "Usage:"
-            echo "  wfreq                              Show top directories"
-            echo "  wfreq --insights                   Show productivity insights"
-            echo "  wfreq --tools                      Show tool usage per directory"
-            echo "  wfreq --export [path] [-filter=x]  Export data to TOML"
-            echo "  wfreq --reset                      Reset all frequency data"
-            echo "  wfreq --config                     Configure settings"
-            echo "  wfreq --help                       Show this help"
-            echo ""
-            echo "Export examples:"
-            echo "  wfreq --export                     Export all to ./pathwise_export.toml"
-            echo "  wfreq --export ~/team/             Export to ~/team/ directory"
-            echo "  wfreq --export -filter=.           Export only current directory"
-            echo "  wfreq --export -filter=python      Export dirs containing 'python'"
-            echo ""
-            echo "Jump shortcuts:"
-            echo "  wj1-wj${{FREQ_SHOW_COUNT}}                         Jump to your top directories"
-            echo ""
-            echo "Philosophy:"
-            echo "  80% automation, 20% human wisdom, 100% growth 🚀"
-            return
-            ;;
-    esac
-
-    # Check for rotation
-    _freq_dirs_check_rotation
+# Render the directory listing to stdout and write jump aliases to a file
+_freq_dirs_render_listing() {{
+    local alias_file="$1"
 
     # Get merged data
     local merged_data=$(_freq_dirs_get_merged_data)
 
     if [[ -z "$merged_data" ]]; then
-        echo "No frequently visited directories yet. Start navigating!"
         return
     fi
+    (( ${{+_FREQ_TRACE}} )) && local trace_start=$EPOCHREALTIME
 
     echo ""
     echo "PathWise Directory Frequency:"
@@ -1589,12 +1667,6 @@ wfreq() {{
     # Display and create aliases - properly group dual entries
     local i=1
     local dir_count=0  # Track number of unique directories shown
-
-    # Load config to get show_count
-    _freq_dirs_load_config
-
-    # Pre-process: Group all entries by directory
-    local grouped_data=$(mktemp)
     local processed_dirs=""
 
     # Process each unique directory in order
@@ -1605,9 +1677,13 @@ wfreq() {{
             continue
         fi
 
-        # Check if we've reached the display limit
+        # Past the display limit, keep writing jump aliases up to wj10
         if [[ $dir_count -ge $FREQ_SHOW_COUNT ]]; then
-            break  # Stop processing after showing configured number of directories
+            [[ $i -gt 10 ]] && break  # Safety limit
+            processed_dirs="${{processed_dirs}}|${{dir}}|"
+            _freq_dirs_write_jump_alias "$alias_file" "$i" "$dir"
+            i=$((i + 1))
+            continue
         fi
 
         # Mark as processed
@@ -1633,8 +1709,8 @@ wfreq() {{
         
         printf "  \033[36m[wj%d]\033[0m %s%s\n" "$i" "$dir" "$project_badge"
 
-        # Create the jump alias
-        eval "alias wj${{i}}='cd \\"${{dir/#\\~/$HOME}}\\"'"
+        # Record the jump alias
+        _freq_dirs_write_jump_alias "$alias_file" "$i" "$dir"
         i=$((i + 1))
 
         # Display the metrics - these are already available from the merged data
@@ -1700,11 +1776,419 @@ wfreq() {{
             printf "      └─ \033[90mincludes %d subdirectories\033[0m\n" "$subdir_count"
         fi
     done <<< "$merged_data"
-
-    rm -f "$grouped_data"
+    (( ${{+_FREQ_TRACE}} )) && _freq_dirs_trace_span render "render listing" $trace_start
 
     echo ""
+    # @feature insights
     echo "💡 Commands: wfreq | wfreq --insights | wfreq --config"
+    # @end feature
+    # @feature !insights
+    echo "💡 Commands: wfreq | wfreq --config"
+    # @end feature
+}}
+
+# Interactively reset tracked data
+_freq_dirs_reset() {{
+    # Check if stdin is available (terminal is interactive)
+    if [[ ! -t 0 ]]; then
+        echo "❌ Reset requires interactive terminal. Run 'wfreq --reset' manually."
+        return 1
+    fi
+
+    echo -n "Reset all frequency data? (y/N): "
+    read -t 10 response || response="n"
+    if [[ "$response" == "y" ]] || [[ "$response" == "Y" ]]; then
+        # Always clear basic navigation data
+        > "$FREQ_DIRS_TODAY"
+        > "$FREQ_DIRS_YESTERDAY"
+        > "$FREQ_DIRS_SESSIONS"
+        date +%Y-%m-%d > "$FREQ_DIRS_LAST_RESET"
+        FREQ_CURRENT_DIR=""
+        FREQ_ENTER_TIME=""
+        FREQ_SESSION_START=""
+        _freq_dirs_bump_generation
+
+        # Ask about insights and tracking data
+        echo -n "Also clear insights and tool tracking? (y/N): "
+        read -t 10 insights_response || insights_response="n"
+        if [[ "$insights_response" == "y" ]] || [[ "$insights_response" == "Y" ]]; then
+            > "$FREQ_DIRS_INSIGHTS"
+            > "$FREQ_DIRS_PATTERNS"
+            > "$FREQ_DIRS_GIT"
+            > "$FREQ_DIRS_GIT_TODAY"
+            > "$FREQ_DIRS_TOOLS"
+            rm -f "$FREQ_DIRS_TOOL_COUNTS" "${{FREQ_DIRS_TOOLS}}.compacting"
+            rm -f "$FREQ_DIRS_RUNTIMES" "$FREQ_DIRS_RUNTIME_HIST" "${{FREQ_DIRS_RUNTIMES}}.compacting"
+            rm -f "${{FREQ_DIRS_GIT}}.idx" "${{FREQ_DIRS_TOOLS}}.idx"
+            rm -f "$FREQ_DIRS_GIT_PERF" "$FREQ_DIRS_GIT_PERF_HIST" "${{FREQ_DIRS_GIT_PERF}}.compacting"
+            echo "✅ All frequency and insights data reset."
+        else
+            echo "✅ Frequency data reset (insights preserved)."
+        fi
+    else
+        echo "Cancelled."
+    fi
+}}
+
+# Interactive configuration menu
+_freq_dirs_configure() {{
+    # Check if stdin is available (terminal is interactive)
+    if [[ ! -t 0 ]]; then
+        echo "❌ Configuration requires interactive terminal. Run 'wfreq --config' manually."
+        return 1
+    fi
+
+    echo ""
+    printf "\\033[36m⚙️  PathWise Configuration\\033[0m\\n"
+    printf "\\033[90m────────────────────────────────────\\033[0m\\n"
+    echo ""
+    printf "\\033[93mCurrent settings:\\033[0m\\n"
+
+    # Color code the values based on their state
+    if [[ "${{FREQ_AUTO_RESET}}" == "true" ]]; then
+        printf "  Auto-reset: \\033[92menabled\\033[0m\\n"
+    else
+        printf "  Auto-reset: \\033[91mdisabled\\033[0m\\n"
+    fi
+
+    printf "  Reset hour: \\033[93m${{FREQ_RESET_HOUR}}:00\\033[0m\\n"
+    printf "  Show count: \\033[94m${{FREQ_SHOW_COUNT}}\\033[0m directories\\n"
+
+    # @feature time
+    if [[ "${{FREQ_TRACK_TIME}}" == "true" ]]; then
+        printf "  Track time: \\033[92menabled\\033[0m\\n"
+    else
+        printf "  Track time: \\033[91mdisabled\\033[0m\\n"
+    fi
+
+    printf "  Min time: \\033[94m${{FREQ_MIN_TIME}}\\033[0m seconds\\n"
+
+    # @end feature
+    # @feature git
+    if [[ "${{FREQ_TRACK_GIT}}" == "true" ]]; then
+        printf "  Track git: \\033[92menabled\\033[0m\\n"
+    else
+        printf "  Track git: \\033[91mdisabled\\033[0m\\n"
+    fi
+
+    # @end feature
+    # @feature tools
+    if [[ "${{FREQ_TRACK_TOOLS}}" == "true" ]]; then
+        printf "  Track tools: \\033[92menabled\\033[0m\\n"
+    else
+        printf "  Track tools: \\033[91mdisabled\\033[0m\\n"
+    fi
+
+    # @end feature
+    printf "  Sort by: \\033[95m${{FREQ_SORT_BY}}\\033[0m\\n"
+    echo ""
+    printf "\\033[36mConfigure:\\033[0m\\n"
+
+    # Auto-reset configuration
+    printf "\\033[96m  Enable auto-reset?\\033[0m (y/n) \\033[90m[${{FREQ_AUTO_RESET}}]\\033[0m\\n"
+    printf "  \\033[90m→ Options: y=enable daily reset, n=keep data forever, Enter=no change\\033[0m\\n"
+    printf "  \\033[96m>\\033[0m "
+    read -t 10 response || response=""
+    if [[ -n "$response" ]]; then
+        if [[ "$response" == "y" ]] || [[ "$response" == "Y" ]]; then
+            FREQ_AUTO_RESET="true"
+        else
+            FREQ_AUTO_RESET="false"
+        fi
+    fi
+    echo ""
+
+    if [[ "$FREQ_AUTO_RESET" == "true" ]]; then
+        printf "\\033[96m  Reset hour\\033[0m (0-23) \\033[90m[${{FREQ_RESET_HOUR}}]\\033[0m\\n"
+        printf "  \\033[90m→ Options: 0=midnight, 12=noon, 23=11pm, Enter=no change\\033[0m\\n"
+        printf "  \\033[96m>\\033[0m "
+        read -t 10 response || response=""
+        if [[ -n "$response" ]] && [[ "$response" =~ ^[0-9]+$ ]] && [[ "$response" -ge 0 ]] && [[ "$response" -le 23 ]]; then
+            FREQ_RESET_HOUR="$response"
+        fi
+        echo ""
+    fi
+
+    printf "\\033[96m  Number of directories to show\\033[0m (1-10) \\033[90m[${{FREQ_SHOW_COUNT}}]\\033[0m\\n"
+    printf "  \\033[90m→ Options: 1-10 directories, Enter=no change\\033[0m\\n"
+    printf "  \\033[96m>\\033[0m "
+    read response
+    if [[ -n "$response" ]] && [[ "$response" =~ ^[0-9]+$ ]] && [[ "$response" -ge 1 ]] && [[ "$response" -le 10 ]]; then
+        FREQ_SHOW_COUNT="$response"
+    fi
+    echo ""
+
+    # @feature time
+    printf "\\033[96m  Enable time tracking?\\033[0m (y/n) \\033[90m[${{FREQ_TRACK_TIME}}]\\033[0m\\n"
+    printf "  \\033[90m→ Options: y=track time spent, n=only track visits, Enter=no change\\033[0m\\n"
+    printf "  \\033[96m>\\033[0m "
+    read -t 10 response || response=""
+    if [[ -n "$response" ]]; then
+        if [[ "$response" == "y" ]] || [[ "$response" == "Y" ]]; then
+            FREQ_TRACK_TIME="true"
+        else
+            FREQ_TRACK_TIME="false"
+        fi
+    fi
+    echo ""
+
+    if [[ "$FREQ_TRACK_TIME" == "true" ]]; then
+        printf "\\033[96m  Minimum time to track\\033[0m (seconds) \\033[90m[${{FREQ_MIN_TIME}}]\\033[0m\\n"
+        printf "  \\033[90m→ Options: 0=track all, 5=default, 60=only 1min+, Enter=no change\\033[0m\\n"
+        printf "  \\033[96m>\\033[0m "
+        read -t 10 response || response=""
+        if [[ -n "$response" ]] && [[ "$response" =~ ^[0-9]+$ ]]; then
+            FREQ_MIN_TIME="$response"
+        fi
+        echo ""
+    fi
+
+    # @end feature
+    # @feature git
+    printf "\\033[96m  Enable git tracking?\\033[0m (y/n) \\033[90m[${{FREQ_TRACK_GIT}}]\\033[0m\\n"
+    printf "  \\033[90m→ Options: y=track git commits, n=disable git features, Enter=no change\\033[0m\\n"
+    printf "  \\033[96m>\\033[0m "
+    read -t 10 response || response=""
+    if [[ -n "$response" ]]; then
+        if [[ "$response" == "y" ]] || [[ "$response" == "Y" ]]; then
+            FREQ_TRACK_GIT="true"
+        else
+            FREQ_TRACK_GIT="false"
+        fi
+    fi
+    echo ""
+
+    # @end feature
+    # @feature tools
+    printf "\\033[96m  Enable tool tracking?\\033[0m (y/n) \\033[90m[${{FREQ_TRACK_TOOLS}}]\\033[0m\\n"
+    printf "  \\033[90m→ Options: y=track tool usage, n=disable tool tracking, Enter=no change\\033[0m\\n"
+    printf "  \\033[96m>\\033[0m "
+    read -t 10 response || response=""
+    if [[ -n "$response" ]]; then
+        if [[ "$response" == "y" ]] || [[ "$response" == "Y" ]]; then
+            FREQ_TRACK_TOOLS="true"
+        else
+            FREQ_TRACK_TOOLS="false"
+        fi
+    fi
+    echo ""
+
+    # @end feature
+    printf "\\033[96m  Sort by\\033[0m (visits/time/commits) \\033[90m[${{FREQ_SORT_BY}}]\\033[0m\\n"
+    printf "  \\033[90m→ Options: visits=most visited, time=longest time, commits=most commits, Enter=no change\\033[0m\\n"
+    printf "  \\033[96m>\\033[0m "
+    read response
+    if [[ -n "$response" ]] && [[ "$response" == "visits" || "$response" == "time" || "$response" == "commits" ]]; then
+        FREQ_SORT_BY="$response"
+    fi
+    echo ""
+
+    printf "\\033[96m  Enable project consolidation?\\033[0m (y/n) \\033[90m[${{FREQ_CONSOLIDATE}}]\\033[0m\\n"
+    printf "  \\033[90m→ Options: y=consolidate subdirs to projects, n=show all dirs, Enter=no change\\033[0m\\n"
+    printf "  \\033[96m>\\033[0m "
+    read -t 10 response || response=""
+    if [[ -n "$response" ]]; then
+        if [[ "$response" == "y" ]] || [[ "$response" == "Y" ]]; then
+            FREQ_CONSOLIDATE="true"
+        else
+            FREQ_CONSOLIDATE="false"
+        fi
+    fi
+    echo ""
+
+    if [[ "$FREQ_CONSOLIDATE" == "true" ]]; then
+        printf "\\033[96m  Max depth for project detection\\033[0m (1-10) \\033[90m[${{FREQ_CONSOLIDATE_DEPTH}}]\\033[0m\\n"
+        printf "  \\033[90m→ Options: 1-10 levels up to find project root, Enter=no change\\033[0m\\n"
+        printf "  \\033[96m>\\033[0m "
+        read -t 10 response || response=""
+        if [[ -n "$response" ]] && [[ "$response" =~ ^[0-9]+$ ]] && [[ "$response" -ge 1 ]] && [[ "$response" -le 10 ]]; then
+            FREQ_CONSOLIDATE_DEPTH="$response"
+        fi
+        echo ""
+
+        printf "\\033[96m  Show subdirectory count?\\033[0m (y/n) \\033[90m[${{FREQ_SHOW_SUBDIR_COUNT}}]\\033[0m\\n"
+        printf "  \\033[90m→ Options: y=show 'includes X subdirs', n=hide count, Enter=no change\\033[0m\\n"
+        printf "  \\033[96m>\\033[0m "
+        read -t 10 response || response=""
+        if [[ -n "$response" ]]; then
+            if [[ "$response" == "y" ]] || [[ "$response" == "Y" ]]; then
+                FREQ_SHOW_SUBDIR_COUNT="true"
+            else
+                FREQ_SHOW_SUBDIR_COUNT="false"
+            fi
+        fi
+        echo ""
+    fi
+
+    _freq_dirs_save_config
+    echo ""
+    printf "\\033[92m✅ Configuration saved!\\033[0m\\n"
+}}
+
+# @feature time
+# List directories by time spent between two days, from the session archive
+_freq_dirs_show_range() {{
+    python3 -c "
+import sys
+sys.path.insert(0, '{Path(__file__).resolve().parent}')
+from python.cli import main
+sys.exit(main(['range', *sys.argv[1:]]))
+" --show-count="$FREQ_SHOW_COUNT" --sort-by="$FREQ_SORT_BY" \\
+        --sessions="$FREQ_DIRS_SESSIONS" --dirs="$FREQ_DIRS_DIRS" "$@"
+}}
+# @end feature
+
+# Main wfreq function with argument parsing
+wfreq() {{
+    _freq_dirs_load_config
+
+    # Parse arguments
+    case "$1" in
+        --reset|-r)
+            _freq_dirs_reset
+            return $?
+            ;;
+        # @feature insights
+        --insights|-i)
+            echo ""
+            _freq_dirs_generate_insights
+            echo ""
+            return
+            ;;
+        # @end feature
+        # @feature tools
+        --tools|-t)
+            echo ""
+            _freq_dirs_analyze_tools_multi
+            echo ""
+            return
+            ;;
+        --slow)
+            echo ""
+            _freq_dirs_show_slow
+            echo ""
+            return
+            ;;
+        # @end feature
+        # @feature git
+        --git-perf)
+            echo ""
+            _freq_dirs_show_git_perf
+            echo ""
+            return
+            ;;
+        # @end feature
+        # @feature time
+        --since|--since=*|--until|--until=*)
+            echo ""
+            _freq_dirs_show_range "$@"
+            local exit_code=$?
+            echo ""
+            return $exit_code
+            ;;
+        # @end feature
+        # @feature export
+        --export|-e)
+            shift  # Move past --export
+            _freq_dirs_export_toml "$@"
+            return
+            ;;
+        # @end feature
+        # @feature profile
+        --profile)
+            echo ""
+            _freq_dirs_show_profile "${{@:2}}"
+            echo ""
+            return
+            ;;
+        --hook-profile)
+            echo ""
+            _freq_dirs_show_hook_profile "${{@:2}}"
+            echo ""
+            return
+            ;;
+        --startup)
+            echo ""
+            _freq_dirs_show_startup "${{@:2}}"
+            echo ""
+            return
+            ;;
+        --trace|--trace=*)
+            _freq_dirs_trace "$@"
+            return
+            ;;
+        # @end feature
+        --config|-c)
+            _freq_dirs_configure
+            return $?
+            ;;
+        --help|-h)
+            echo "PathWise - Be Wise About Your Paths 🗺️"
+            echo ""
+            echo "Usage:"
+            echo "  wfreq                              Show top directories"
+            # @feature insights
+            echo "  wfreq --insights                   Show productivity insights"
+            # @end feature
+            # @feature tools
+            echo "  wfreq --tools                      Show tool usage per directory"
+            echo "  wfreq --slow                       Show how long commands take per project"
+            # @end feature
+            # @feature git
+            echo "  wfreq --git-perf                   Show slow git commands per repository"
+            # @end feature
+            # @feature time
+            echo "  wfreq --since=DATE [--until=DATE]  Show directories over a date range"
+            # @end feature
+            # @feature export
+            echo "  wfreq --export [path] [-filter=x]  Export data to TOML"
+            # @end feature
+            # @feature profile
+            echo "  wfreq --profile [--reset]          Show hook timings (FREQ_PROFILE=1)"
+            echo "  wfreq --hook-profile [on|off]      Time every plugin's shell hooks"
+            echo "  wfreq --startup [--reset]          Show how long new shells take to start"
+            echo "  wfreq --trace=FILE [option]        Write a Chrome trace of one wfreq run"
+            # @end feature
+            echo "  wfreq --reset                      Reset all frequency data"
+            echo "  wfreq --config                     Configure settings"
+            echo "  wfreq --help                       Show this help"
+            echo ""
+            # @feature export
+            echo "Export examples:"
+            echo "  wfreq --export                     Export all to ./pathwise_export.toml"
+            echo "  wfreq --export ~/team/             Export to ~/team/ directory"
+            echo "  wfreq --export -filter=.           Export only current directory"
+            echo "  wfreq --export -filter=python      Export dirs containing 'python'"
+            echo "  wfreq --export --format=csv        Export rows to ./pathwise_export.csv"
+            echo "  wfreq --export --format=jsonl -    Stream JSON Lines to stdout"
+            echo "  wfreq --export --format=jsonl --since-last  Only what changed since last export"
+            echo "  pathwise merge ~/team/ -o team.toml  Merge team exports into one summary"
+            echo "  pathwise rename ~/old ~/new  Keep a moved directory's history"
+            echo ""
+            # @end feature
+            echo "Jump shortcuts:"
+            echo "  wj1-wj${{FREQ_SHOW_COUNT}}                         Jump to your top directories"
+            echo ""
+            echo "Philosophy:"
+            echo "  80% automation, 20% human wisdom, 100% growth 🚀"
+            return
+            ;;
+    esac
+
+    # Check for rotation
+    _freq_dirs_check_rotation
+    (( _FREQ_PROF_DEPTH )) && _freq_dirs_prof_step rotation
+
+    # Serve the ranked snapshot, rebuilding it only if the data changed
+    _freq_dirs_refresh_snapshot
+    (( _FREQ_PROF_DEPTH )) && _freq_dirs_prof_step snapshot
+
+    if [[ ! -s "$FREQ_DIRS_SNAPSHOT_LISTING" ]]; then
+        echo "No frequently visited directories yet. Start navigating!"
+        return
+    fi
+
+    print -r -- "$(<"$FREQ_DIRS_SNAPSHOT_LISTING")"
 }}
 """
 
@@ -1712,6 +2196,96 @@ wfreq() {{
 def generate_setup_functions() -> str:
     """Generate alias setup and cleanup functions"""
     return """
+# Append a jump alias definition to the snapshot alias file
+_freq_dirs_write_jump_alias() {
+    local alias_file="$1"
+    local index="$2"
+    local target="${3/#\\~/$HOME}"
+    local jump_cmd="cd ${(q)target}"
+
+    print -r -- "alias wj${index}=${(q)jump_cmd}" >> "$alias_file"
+}
+
+# Rebuild the ranked snapshot: jump aliases plus the pre-rendered listing
+_freq_dirs_write_snapshot() {
+    local gen="$1"
+    local tmp_tag="${2:-$$}"  # Subshells share $$, so workers pass their own tag
+    local alias_tmp="${FREQ_DIRS_SNAPSHOT}.${tmp_tag}"
+    local listing_tmp="${FREQ_DIRS_SNAPSHOT_LISTING}.${tmp_tag}"
+
+    : > "$alias_tmp"
+    _freq_dirs_render_listing "$alias_tmp" > "$listing_tmp"
+    echo "_FREQ_DIRS_SNAPSHOT_GEN=${gen}" >> "$alias_tmp"
+
+    # Swap in atomically so other shells never source a partial snapshot
+    mv -f "$listing_tmp" "$FREQ_DIRS_SNAPSHOT_LISTING"
+    mv -f "$alias_tmp" "$FREQ_DIRS_SNAPSHOT"
+}
+
+# Source the last snapshot and check it against the data generation
+# Sets REPLY to the current generation
+_freq_dirs_snapshot_is_fresh() {
+    REPLY=0
+    [[ -s "$FREQ_DIRS_GENERATION" ]] && REPLY=$(<"$FREQ_DIRS_GENERATION")
+
+    [[ -s "$FREQ_DIRS_SNAPSHOT" ]] && source "$FREQ_DIRS_SNAPSHOT"
+
+    [[ "$_FREQ_DIRS_SNAPSHOT_GEN" == "$REPLY" ]] && [[ -f "$FREQ_DIRS_SNAPSHOT_LISTING" ]]
+}
+
+# Load the ranked snapshot, rebuilding it if the data generation moved on
+_freq_dirs_refresh_snapshot() {
+    _freq_dirs_snapshot_is_fresh && return
+
+    # The generation was read before merging so concurrent updates keep it stale
+    _freq_dirs_write_snapshot "$REPLY"
+    source "$FREQ_DIRS_SNAPSHOT"
+}
+
+# Rebuild the snapshot in a background worker so the first prompt is not blocked
+_freq_dirs_async_snapshot() {
+    local gen="$1"
+    _FREQ_DIRS_PENDING_GEN="$gen"
+
+    # The worker reports on its pipe once the snapshot files are in place
+    exec {_FREQ_DIRS_ASYNC_FD}< <(_freq_dirs_write_snapshot "$gen" "$$.async" &>/dev/null; echo "$gen")
+
+    if ! zle -F "$_FREQ_DIRS_ASYNC_FD" _freq_dirs_async_snapshot_ready 2>/dev/null; then
+        # No line editor to call us back: let the worker finish on its own
+        # and pick up its snapshot from precmd instead
+        exec {_FREQ_DIRS_ASYNC_FD}<&-
+        _FREQ_DIRS_ASYNC_FD=""
+    fi
+}
+
+# zle -F callback: the background worker finished writing the snapshot
+_freq_dirs_async_snapshot_ready() {
+    local fd="$1"
+
+    zle -F "$fd"
+    exec {fd}<&-
+    _FREQ_DIRS_ASYNC_FD=""
+
+    _freq_dirs_finish_async_snapshot "zle"
+}
+
+# Load the freshly built snapshot and print the listing if it is still owed
+_freq_dirs_finish_async_snapshot() {
+    local from_zle="$1"
+
+    _FREQ_DIRS_PENDING_GEN=""
+    [[ -s "$FREQ_DIRS_SNAPSHOT" ]] && source "$FREQ_DIRS_SNAPSHOT"
+
+    if [[ "$_FREQ_DIRS_SHOWN" != "true" ]]; then
+        _FREQ_DIRS_SHOWN=true
+        if [[ -s "$FREQ_DIRS_SNAPSHOT_LISTING" ]]; then
+            # Clear the prompt so the listing lands above it; zle redraws afterwards
+            [[ -n "$from_zle" ]] && zle -I
+            print -r -- "$(<"$FREQ_DIRS_SNAPSHOT_LISTING")"
+        fi
+    fi
+}
+
 # Setup jump aliases on shell startup
 _freq_dirs_setup_aliases() {
     # Only setup aliases in interactive shells to prevent blocking
@@ -1719,366 +2293,148 @@ _freq_dirs_setup_aliases() {
 
     _freq_dirs_load_config
     _freq_dirs_check_rotation
+    (( ${+_PATHWISE_STARTUP} )) && _pathwise_startup_phase rotation_check
 
-    local merged_data=$(_freq_dirs_get_merged_data)
+    # Source the precomputed aliases; the last snapshot keeps wj1-wj10
+    # usable even while a newer one is being built
+    _freq_dirs_snapshot_is_fresh && return
 
-    if [[ -z "$merged_data" ]]; then
-        return
+    if [[ "$FREQ_ASYNC_STARTUP" == "true" ]]; then
+        _freq_dirs_async_snapshot "$REPLY"
+    else
+        _freq_dirs_write_snapshot "$REPLY"
+        source "$FREQ_DIRS_SNAPSHOT"
     fi
-
-    # Create aliases for top directories
-    # Process data without subshell to maintain variable state
-    local i=1
-    while IFS='|' read -r dir count time git_count period; do
-        eval "alias wj${i}='cd \\"${dir/#\\~/$HOME}\\"'"
-        i=$((i + 1))
-        [[ $i -gt 10 ]] && break  # Safety limit
-    done <<< "$merged_data"
 }
 
+# @feature time
 # Cleanup on exit (record final time)
 _freq_dirs_exit() {
     if [[ "$FREQ_TRACK_TIME" == "true" ]]; then
         _freq_dirs_record_time
     fi
 }
+# @end feature
 
+# @feature git
 # Git post-commit hook wrapper
 _freq_dirs_git_wrapper() {
     local git_cmd="$1"
     shift
 
-    # Run the actual git command
+    # Run the actual git command, timed once zsh/datetime is loaded
+    local started=$EPOCHREALTIME
     command git "$git_cmd" "$@"
     local exit_code=$?
+    (( _FREQ_PROF_DEPTH )) && _freq_dirs_prof_step git
+    [[ -n "$started" ]] && _freq_dirs_track_git_perf "$git_cmd" "$started"
+    (( _FREQ_PROF_DEPTH )) && _freq_dirs_prof_step perf
 
     # Track commit if successful
     if [[ "$git_cmd" == "commit" ]] && [[ $exit_code -eq 0 ]]; then
         _freq_dirs_track_git_commit
+        (( _FREQ_PROF_DEPTH )) && _freq_dirs_prof_step track
     fi
 
     return $exit_code
 }
+
+# Log how long a git subcommand took in the repository around $PWD
+_freq_dirs_track_git_perf() {
+    local subcommand="$1" milliseconds repo="$PWD"
+    # Options before the subcommand (git -C dir status) leave it unknown
+    [[ -z "$subcommand" || "$subcommand" == -* ]] && return 0
+    printf -v milliseconds '%.0f' $(( (EPOCHREALTIME - $2) * 1000 ))
+
+    # Walk up to the repository root without starting git again
+    while [[ -n "$repo" && ! -e "$repo/.git" ]]; do
+        repo="${repo%/*}"
+    done
+    [[ -n "$repo" ]] || return 0
+
+    _freq_dirs_dir_id "${repo/#$HOME/~}"
+    print -r -- "${REPLY}|${subcommand}|${EPOCHSECONDS}|${milliseconds}" >> "$FREQ_DIRS_GIT_PERF"
+}
+# @end feature
 """
 
 
 def generate_export_function() -> str:
-    """Generate TOML export functionality"""
-    return """
-# Get tool category for export
-_freq_dirs_get_tool_category() {
-    local tool="$1"
-
-    # Check known tools categories from our tracking
-    case "$tool" in
-        nano|vim|vi|nvim|emacs|code|subl|atom|gedit|kate|micro)
-            echo "editor"
-            ;;
-        python|python3|ruby|node|java|go|rust|gcc|g++|clang)
-            echo "language"
-            ;;
-        pip|pip3|npm|yarn|cargo|maven|gradle|gem|bundle)
-            echo "package_manager"
-            ;;
-        git|svn|hg|bzr)
-            echo "version_control"
-            ;;
-        pytest|jest|mocha|rspec|unittest|coverage)
-            echo "testing"
-            ;;
-        make|cmake|gradle|mvn|cargo)
-            echo "build"
-            ;;
-        docker|kubectl|helm|terraform)
-            echo "devops"
+    """Generate the pathwise command and the export delegating to Python"""
+    return f"""
+# pathwise <command>: Python-backed commands
+pathwise() {{
+    case "$1" in
+        export)
+            shift
+            _freq_dirs_export_toml "$@"
             ;;
-        ls|cd|cp|mv|rm|mkdir|find|grep|awk|sed)
-            echo "file_tool"
+        merge)
+            shift
+            python3 -c "
+import sys
+sys.path.insert(0, '{Path(__file__).resolve().parent}')
+from python.cli import main
+sys.exit(main(['merge', *sys.argv[1:]]))
+" "$@"
             ;;
-        mypy|ruff|flake8|black|prettier|eslint|pylint)
-            echo "linting"
+        rename)
+            shift
+            python3 -c "
+import sys
+sys.path.insert(0, '{Path(__file__).resolve().parent}')
+from python.cli import main
+sys.exit(main(['rename', *sys.argv[1:]]))
+" --dirs="$FREQ_DIRS_DIRS" "$@"
             ;;
         *)
-            # Check if it's a custom script or other tool
-            if [[ "$tool" == ./* ]] || [[ "$tool" == *".sh" ]]; then
-                echo "script"
-            elif command -v "$tool" >/dev/null 2>&1; then
-                echo "tool"
-            else
-                echo "other"
-            fi
+            echo "Usage: pathwise export [path|-] [-filter=x] [--format=toml|jsonl|csv] [--since-last]"
+            echo "       pathwise merge <export|dir>... [-o team.toml|-] [--top=N] [--jobs=N]"
+            echo "       pathwise rename <old-path> <new-path>"
+            return 1
             ;;
     esac
-}
+}}
 
-# Export PathWise data to TOML format
-_freq_dirs_export_toml() {
-    local output_path="pathwise_export.toml"
-    local filter_pattern=""
-
-    # Parse arguments - check for filter first, then output path
-    while [[ $# -gt 0 ]]; do
-        case "$1" in
-            -filter=*)
-                filter_pattern="${1#-filter=}"
-                shift
-                ;;
-            *)
-                # If it doesn't start with -, treat as output path
-                if [[ "$1" != -* ]]; then
-                    output_path="$1"
-                fi
-                shift
-                ;;
-        esac
+# Export PathWise data to TOML in one pass over every data file
+_freq_dirs_export_toml() {{
+    local filter_pattern="" arg
+    for arg in "$@"; do
+        [[ "$arg" == -filter=* ]] && filter_pattern="${{arg#-filter=}}"
     done
 
-    # Handle special filter cases
-    if [[ "$filter_pattern" == "." ]]; then
-        # Convert current directory to use ~ notation for matching
-        local current_dir="$(pwd)"
-        filter_pattern="${current_dir/#$HOME/~}"
-    fi
-
-    # If output path is a directory, add default filename
-    if [[ -d "$output_path" ]]; then
-        output_path="${output_path%/}/pathwise_export.toml"
-    fi
-
-    # Get filtered data
-    local merged_data=$(_freq_dirs_get_merged_data 100)  # Get more for filtering
-    local filtered_data=""
-
+    # Filters pick from the top 100 directories, not just the listing size
+    local merged_data
     if [[ -n "$filter_pattern" ]]; then
-        # For directory tree filtering, match directories that start with the filter pattern
-        # This allows filtering to current directory and its subdirectories
-        if [[ "$filter_pattern" == ~* ]] || [[ "$filter_pattern" == /* ]]; then
-            # It's a path - do prefix matching for tree filtering
-            # Remove trailing slash if present
-            filter_pattern="${filter_pattern%/}"
-            # Filter to show this directory and all subdirectories
-            filtered_data=$(echo "$merged_data" | while IFS='|' read -r dir rest; do
-                # Check if dir matches exactly or is a subdirectory
-                if [[ "$dir" == "$filter_pattern" ]] || [[ "$dir" == "$filter_pattern/"* ]]; then
-                    echo "${dir}|${rest}"
-                fi
-            done)
-        else
-            # Regular text filter - case-insensitive matching anywhere in path
-            filtered_data=$(echo "$merged_data" | grep -i "$filter_pattern")
-        fi
+        merged_data=$(_freq_dirs_get_merged_data 100)
     else
-        # Use configured limit
-        filtered_data=$(_freq_dirs_get_merged_data)
-    fi
-
-    if [[ -z "$filtered_data" ]]; then
-        echo "❌ No directories match filter: ${filter_pattern:-all}"
-        return 1
+        merged_data=$(_freq_dirs_get_merged_data)
     fi
 
-    # Start building TOML
-    {
-        # Metadata section
-        echo "[metadata]"
-        echo "exported_at = \\"$(date -Iseconds)\\""
-        echo "hostname = \\"$(hostname)\\""
-        echo "user = \\"$USER\\""
-        echo "filter = \\"${filter_pattern:-all}\\""
-        echo "tracking_period = \\"today + yesterday\\""
-        echo "sort_method = \\"$FREQ_SORT_BY\\""
-        echo "directories_shown = $FREQ_SHOW_COUNT"
-        echo ""
-
-        # Calculate summary statistics
-        local total_dirs=0
-        local total_visits=0
-        local total_time=0
-        local total_commits=0
-
-        while IFS='|' read -r dir count time git_count period; do
-            [[ -z "$dir" ]] && continue
-            total_dirs=$((total_dirs + 1))
-            total_visits=$((total_visits + count))
-            total_time=$((total_time + ${time:-0}))
-            total_commits=$((total_commits + ${git_count:-0}))
-        done <<< "$filtered_data"
-
-        # Summary section
-        echo "[summary]"
-        echo "total_directories = $total_dirs"
-        echo "total_visits = $total_visits"
-        echo "total_time_seconds = $total_time"
-        echo "total_time_formatted = \\"$(_freq_dirs_format_time $total_time)\\""
-        echo "total_commits = $total_commits"
-        echo ""
-
-        # Time patterns (if we have session data)
-        if [[ -s "$FREQ_DIRS_SESSIONS" ]]; then
-            echo "[time_patterns]"
-
-            # Find peak hour
-            local hour_counts=$(mktemp)
-            cat "$FREQ_DIRS_SESSIONS" | while IFS='|' read -r dir start_time end_time duration; do
-                # Filter sessions to match our directories
-                if echo "$filtered_data" | grep -q "^${dir}|"; then
-                    date -d "@$start_time" +%H 2>/dev/null >> "$hour_counts" || true
-                fi
-            done
-
-            if [[ -s "$hour_counts" ]]; then
-                local peak_hour=$(sort "$hour_counts" | uniq -c | sort -rn | head -1 | awk '{print $2}')
-                [[ -n "$peak_hour" ]] && echo "peak_hour = ${peak_hour}"
-            fi
-            rm -f "$hour_counts"
-
-            # Average session duration
-            local session_count=0
-            local total_session_time=0
-            while IFS='|' read -r dir start_time end_time duration; do
-                if echo "$filtered_data" | grep -q "^${dir}|"; then
-                    session_count=$((session_count + 1))
-                    total_session_time=$((total_session_time + duration))
-                fi
-            done < "$FREQ_DIRS_SESSIONS"
-
-            if [[ $session_count -gt 0 ]]; then
-                local avg_time=$((total_session_time / session_count))
-                echo "average_session_minutes = $((avg_time / 60))"
-            fi
-            echo ""
-        fi
-
-        # Export each directory
-        while IFS='|' read -r dir count time git_count period; do
-            [[ -z "$dir" ]] && continue
-
-            echo "[[directories]]"
-            echo "path = \\"$dir\\""
-            echo "visits = $count"
-            echo "time_seconds = ${time:-0}"
-            echo "time_formatted = \\"$(_freq_dirs_format_time ${time:-0})\\""
-            echo "last_visited = \\"$period\\""
-            echo "git_commits = ${git_count:-0}"
-
-            # Add tools used in this directory
-            if [[ "$FREQ_TRACK_TOOLS" == "true" ]] && [[ -s "$FREQ_DIRS_TOOLS" ]]; then
-                local tools_data=$(grep "^${dir}|" "$FREQ_DIRS_TOOLS" 2>/dev/null | \\
-                    awk -F'|' '{print $2}' | sort | uniq -c | sort -rn | head -10)
-
-                if [[ -n "$tools_data" ]]; then
-                    echo ""
-                    echo "[directories.tools_used]"
-                    while read count tool; do
-                        [[ -n "$tool" ]] && echo "$tool = $count"
-                    done <<< "$tools_data"
-                fi
-            fi
-
-            # Add git categories if available
-            if [[ "$FREQ_TRACK_GIT" == "true" ]] && [[ $git_count -gt 0 ]]; then
-                echo ""
-                echo "[directories.git_categories]"
-                # Use shared git analysis function
-                local git_analysis=$(_freq_dirs_analyze_git_commits "$dir" "toml")
-                if [[ -n "$git_analysis" ]]; then
-                    echo "$git_analysis"
-                else
-                    echo "# No categorized commits found"
-                fi
-            fi
-
-            echo ""
-        done <<< "$filtered_data"
-
-        # Tools section - show top N tools and where they're used
-        if [[ "$FREQ_TRACK_TOOLS" == "true" ]] && [[ -s "$FREQ_DIRS_TOOLS" ]]; then
-            echo "# Top Tools Analysis"
-            echo "# Shows where each tool is most frequently used"
-            echo ""
-
-            # Collect all tool usage for filtered directories
-            local all_tools=$(mktemp)
-            while IFS='|' read -r dir count time git_count period; do
-                [[ -z "$dir" ]] && continue
-                grep "^${dir}|" "$FREQ_DIRS_TOOLS" >> "$all_tools" 2>/dev/null || true
-            done <<< "$filtered_data"
-
-            if [[ -s "$all_tools" ]]; then
-                # Get top N tools
-                local top_n="${FREQ_SHOW_COUNT:-5}"
-                local top_tools=$(awk -F'|' '{print $2}' "$all_tools" | sort | uniq -c | sort -rn | head -n "$top_n" | awk '{print $2}')
-
-                while read tool; do
-                    [[ -z "$tool" ]] && continue
-
-                    echo "[tools.$tool]"
-
-                    # Get total uses
-                    local total=$(grep "|${tool}|" "$all_tools" | wc -l)
-                    echo "total_uses = $total"
-
-                    # Get category
-                    local category=$(_freq_dirs_get_tool_category "$tool")
-                    echo "category = \\"$category\\""
-
-                    # Show top directories where this tool is used
-                    echo "directories = ["
-                    grep "|${tool}|" "$all_tools" | awk -F'|' '{print $1}' | sort | uniq -c | sort -rn | head -5 | while read count dir; do
-                        local percent=$((count * 100 / total))
-                        echo "    { path = \\"$dir\\", uses = $count, percentage = $percent },"
-                    done
-                    echo "]"
-                    echo ""
-                done <<< "$top_tools"
-            fi
-            rm -f "$all_tools"
-        fi
-
-        # Navigation patterns
-        if [[ -s "$FREQ_DIRS_SESSIONS" ]]; then
-            echo "# Navigation Patterns"
-            echo ""
-
-            local patterns=$(mktemp)
-            local prev_dir=""
-            cat "$FREQ_DIRS_SESSIONS" | sort -t'|' -k2 -n | while IFS='|' read -r dir start_time end_time duration; do
-                # Only include if directory is in filtered set
-                if echo "$filtered_data" | grep -q "^${dir}|"; then
-                    if [[ -n "$prev_dir" ]] && [[ "$prev_dir" != "$dir" ]]; then
-                        echo "${prev_dir} → ${dir}" >> "$patterns"
-                    fi
-                    prev_dir="$dir"
-                fi
-            done
-
-            if [[ -s "$patterns" ]]; then
-                sort "$patterns" | uniq -c | sort -rn | head -10 | while read count pattern; do
-                    local from_dir=$(echo "$pattern" | awk -F' → ' '{print $1}')
-                    local to_dir=$(echo "$pattern" | awk -F' → ' '{print $2}')
-
-                    echo "[[navigation_patterns]]"
-                    echo "from = \\"$from_dir\\""
-                    echo "to = \\"$to_dir\\""
-                    echo "count = $count"
-                    echo ""
-                done
-            fi
-            rm -f "$patterns"
-        fi
-
-    } > "$output_path"
-
-    # Success message
-    echo "✅ Exported PathWise data to $output_path"
-    [[ -n "$filter_pattern" ]] && echo "   Filter applied: $filter_pattern"
-    echo "   Directories exported: $total_dirs"
-    echo "   Total visits tracked: $total_visits"
-    [[ "$FREQ_TRACK_TIME" == "true" ]] && echo "   Total time tracked: $(_freq_dirs_format_time $total_time)"
-    [[ "$FREQ_TRACK_GIT" == "true" ]] && [[ $total_commits -gt 0 ]] && echo "   Total commits tracked: $total_commits"
-    echo ""
-    echo "💡 Share this TOML with your team to show your work patterns!"
-}
+    local -a export_flags=(
+        --sort-by="$FREQ_SORT_BY" --show-count="$FREQ_SHOW_COUNT"
+        --sessions="$FREQ_DIRS_SESSIONS" --dirs="$FREQ_DIRS_DIRS"
+        --git-log="$FREQ_DIRS_GIT" --cursor="$FREQ_DIRS_EXPORT_CURSOR"
+        --tools-log="$FREQ_DIRS_TOOLS" --tool-counts="$FREQ_DIRS_TOOL_COUNTS"
+        --no-time --no-tools --no-git
+    )
+    # @feature time
+    [[ "$FREQ_TRACK_TIME" == "true" ]] && export_flags+=(--time)
+    # @end feature
+    # @feature tools
+    [[ "$FREQ_TRACK_TOOLS" == "true" ]] && export_flags+=(--tools)
+    # @end feature
+    # @feature git
+    [[ "$FREQ_TRACK_GIT" == "true" ]] && export_flags+=(--git)
+    # @end feature
+
+    print -r -- "$merged_data" | python3 -c "
+import sys
+sys.path.insert(0, '{Path(__file__).resolve().parent}')
+from python.cli import main
+sys.exit(main(['export', *sys.argv[1:]]))
+" "${{export_flags[@]}}" "$@"
+}}
 """
 
 
@@ -2089,78 +2445,298 @@ def generate_hooks() -> str:
 _FREQ_DIRS_SHOWN=false
 _show_freq_dirs_once() {
     if [[ "$_FREQ_DIRS_SHOWN" == "true" ]]; then
+        precmd_functions=(${precmd_functions[@]/_show_freq_dirs_once})
+        return
+    fi
+
+    # Listing is still being rendered in the background
+    if [[ -n "$_FREQ_DIRS_PENDING_GEN" ]]; then
+        if [[ -z "$_FREQ_DIRS_ASYNC_FD" ]]; then
+            # No zle callback registered: poll for the worker's snapshot
+            [[ -s "$FREQ_DIRS_SNAPSHOT" ]] && source "$FREQ_DIRS_SNAPSHOT"
+            if (( ${_FREQ_DIRS_SNAPSHOT_GEN:-0} >= _FREQ_DIRS_PENDING_GEN )); then
+                _freq_dirs_finish_async_snapshot
+                precmd_functions=(${precmd_functions[@]/_show_freq_dirs_once})
+            fi
+        fi
         return
     fi
     _FREQ_DIRS_SHOWN=true
 
-    # Quick check for data
-    if [[ -s "$HOME/.frequent_dirs.today" ]] || [[ -s "$HOME/.frequent_dirs.yesterday" ]]; then
-        wfreq
+    # Print the listing pre-rendered by _freq_dirs_setup_aliases
+    if [[ -s "$FREQ_DIRS_SNAPSHOT_LISTING" ]]; then
+        print -r -- "$(<"$FREQ_DIRS_SNAPSHOT_LISTING")"
     fi
 
     # Remove from precmd after showing
     precmd_functions=(${precmd_functions[@]/_show_freq_dirs_once})
 }
 
+(( ${+_PATHWISE_STARTUP} )) && _pathwise_startup_phase definitions
+
 # Hook into directory change
 autoload -U add-zsh-hook
 add-zsh-hook chpwd _freq_dirs_update
+# @feature time
 add-zsh-hook zshexit _freq_dirs_exit
+# @end feature
 add-zsh-hook precmd _show_freq_dirs_once
 
 # Load config first to check if tool tracking is enabled
 _freq_dirs_load_config
+(( ${+_PATHWISE_STARTUP} )) && _pathwise_startup_phase config_load
 
+# @feature tools
 # Hook to track tool usage
 if [[ "$FREQ_TRACK_TOOLS" == "true" ]]; then
+    zmodload zsh/datetime 2>/dev/null
     add-zsh-hook preexec _freq_dirs_track_tool
+    add-zsh-hook precmd _freq_dirs_track_runtime
 fi
+# @end feature
 
-# Create git alias to track commits
+# @feature git
+# Create git alias to track commits and time git subcommands
+zmodload zsh/datetime 2>/dev/null
 alias git='_freq_dirs_git_wrapper'
+# @end feature
+
+(( ${+_PATHWISE_STARTUP} )) && _pathwise_startup_phase hooks
 
 # Setup aliases on startup
 _freq_dirs_setup_aliases
+(( ${+_PATHWISE_STARTUP} )) && _pathwise_startup_phase alias_setup
 
 # Initialize session tracking
 FREQ_SESSION_START=$(date +%s)
+
+# @feature profile
+# Time PathWise step by step (`wfreq --profile`) and, from the first prompt,
+# every plugin's hook functions (`wfreq --hook-profile`)
+[[ "$FREQ_PROFILE" == "1" ]] && _freq_dirs_profile_enable
+[[ "$FREQ_HOOK_PROFILE" == "1" ]] && add-zsh-hook precmd _freq_dirs_hook_profile_start
+# @end feature
 """
 
 
-def main() -> None:
-    """Main function to build the plugin"""
-    print("Building PathWise plugin...")
+# Function definitions in the generated plugin start at column 0: name() {
+FUNCTION_DEF_RE = re.compile(r"^([A-Za-z_][A-Za-z0-9_]*)\(\) \{$")
+
+# Subsystems that can be left out with --features; "nav" is always built
+FEATURES = ("nav", "time", "git", "tools", "export", "insights", "profile")
+
+# Marker lines around feature-specific shell code in the generators
+FEATURE_START_RE = re.compile(r"^# @feature (!?)([a-z]+)$")
+FEATURE_END = "# @end feature"
+
+# Profiler step and start-up phase marks sit inside other features' blocks,
+# so they are matched by line
+PROFILE_MARKS = (
+    "(( _FREQ_PROF_DEPTH )) && _freq_dirs_prof_step ",
+    "(( ${+_PATHWISE_STARTUP} )) && _pathwise_startup_phase",
+    "(( ${+_FREQ_TRACE} )) && ",
+)
+
 
-    # Generate all parts
+def strip_feature_blocks(content: str, features: frozenset[str]) -> str:
+    """Drop '# @feature name' blocks whose feature is not being built
+
+    A '# @feature !name' block is kept only when the feature is left out.
+    The marker lines themselves never reach the generated plugin, and
+    profiler marks are dropped along with the profile feature.
+    """
+    profiled = "profile" in features
+    lines: list[str] = []
+    keep = True
+    for line in content.splitlines(keepends=True):
+        marker = line.strip()
+        match = FEATURE_START_RE.match(marker)
+        if match:
+            negated, feature = match.groups()
+            keep = (feature in features) != bool(negated)
+        elif marker == FEATURE_END:
+            keep = True
+        elif keep and (profiled or not marker.startswith(PROFILE_MARKS)):
+            lines.append(line)
+    return "".join(lines)
+
+
+def parse_features(value: str) -> frozenset[str]:
+    """Parse a --features list such as 'nav,time'"""
+    requested = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = requested - set(FEATURES)
+    if unknown:
+        msg = f"unknown feature(s): {', '.join(sorted(unknown))} (choose from {', '.join(FEATURES)})"
+        raise argparse.ArgumentTypeError(msg)
+    return frozenset(requested | {"nav"})
+
+
+def generate_body(features: frozenset[str] = frozenset(FEATURES)) -> str:
+    """Generate everything below the header, in source order
+
+    Subsystems missing from features are left out entirely, along with
+    their hooks, aliases and wfreq options.
+    """
     plugin_content = ""
-    plugin_content += generate_header()
     plugin_content += generate_data_files()
     plugin_content += generate_variables()
     plugin_content += generate_file_init()
     plugin_content += generate_config_functions()
     plugin_content += generate_utility_functions()
-    plugin_content += generate_git_functions()
-    plugin_content += generate_tool_tracking()
-    plugin_content += generate_tools_analysis_multi()
-    plugin_content += generate_export_function()
+    if "profile" in features:
+        plugin_content += generate_profiler()
+    if "git" in features:
+        plugin_content += generate_git_functions()
+        plugin_content += generate_git_perf()
+    if "tools" in features:
+        plugin_content += generate_tool_tracking()
+        plugin_content += generate_tools_analysis_multi()
+    if "export" in features:
+        plugin_content += generate_export_function()
     plugin_content += generate_rotation_functions()
-    plugin_content += generate_time_tracking()
+    if "time" in features:
+        plugin_content += generate_time_tracking()
     plugin_content += generate_directory_update()
-    plugin_content += generate_insights()
+    if "insights" in features:
+        plugin_content += generate_insights()
     plugin_content += generate_data_merge()
     plugin_content += generate_project_detection()
     plugin_content += generate_freq_command()
     plugin_content += generate_setup_functions()
     plugin_content += generate_hooks()
+    return strip_feature_blocks(plugin_content, features)
+
+
+def split_functions(content: str) -> tuple[str, dict[str, str]]:
+    """Split generated code into eager top-level code and function bodies
+
+    Returns:
+        Tuple of (top-level code, {function name: autoload file contents}).
+        Comment lines directly above a function travel with it.
+    """
+    eager: list[str] = []
+    functions: dict[str, str] = {}
+    pending_comments: list[str] = []
+    current_name = ""
+    current_body: list[str] = []
+
+    for line in content.splitlines(keepends=True):
+        if current_name:
+            if line.rstrip("\n") == "}":
+                functions[current_name] = "".join(current_body)
+                current_name = ""
+            else:
+                current_body.append(line)
+            continue
+
+        match = FUNCTION_DEF_RE.match(line.rstrip("\n"))
+        if match:
+            current_name = match.group(1)
+            current_body = pending_comments
+            pending_comments = []
+        elif line.startswith("#"):
+            pending_comments.append(line)
+        else:
+            eager.extend(pending_comments)
+            pending_comments = []
+            eager.append(line)
+
+    eager.extend(pending_comments)
+    return "".join(eager), functions
+
+
+def generate_autoload_prelude(function_names: list[str]) -> str:
+    """Generate the stub code that puts functions/ on fpath and autoloads them"""
+    names = " \\\n    ".join(function_names)
+    return f"""
+# Functions live in functions/ next to this file and load on first call
+typeset -g FREQ_DIRS_PLUGIN_DIR="${{${{(%):-%x}}:A:h}}"
+fpath=("${{FREQ_DIRS_PLUGIN_DIR}}/functions" "${{fpath[@]}}")
+autoload -Uz \\
+    {names}
+"""
+
+
+def zcompile(root: Path) -> bool:
+    """Compile the stub and a functions.zwc digest to zsh wordcode
+
+    zsh picks up functions.zwc automatically for the functions/ fpath entry
+    and pathwise.plugin.zsh.zwc when the stub is sourced.
+    """
+    if shutil.which("zsh") is None:
+        return False
+
+    script = "zcompile -Uz functions.zwc functions/*(.) && zcompile pathwise.plugin.zsh"
+    result = subprocess.run(  # noqa: S603
+        ["zsh", "-fc", script],  # noqa: S607
+        cwd=root,
+        check=False,
+        capture_output=True,
+    )
+    return result.returncode == 0
+
+
+def write_autoload_layout(root: Path, body: str) -> str:
+    """Write one autoload file per function and return the eager stub"""
+    eager, functions = split_functions(body)
+
+    functions_dir = root / "functions"
+    functions_dir.mkdir(exist_ok=True)
+    # Drop functions left over from earlier builds
+    for stale in functions_dir.iterdir():
+        if stale.is_file() and stale.name not in functions:
+            stale.unlink()
+
+    for name, function_body in functions.items():
+        (functions_dir / name).write_text(function_body)
+
+    return generate_header() + generate_autoload_prelude(list(functions)) + eager
+
+
+def main() -> None:
+    """Main function to build the plugin"""
+    parser = argparse.ArgumentParser(description="Build the PathWise zsh plugin")
+    parser.add_argument(
+        "--autoload",
+        action="store_true",
+        help="write each function to functions/ for autoloading and zcompile the result",
+    )
+    parser.add_argument(
+        "--features",
+        type=parse_features,
+        default=frozenset(FEATURES),
+        help=f"comma-separated subsystems to build (default: all of {','.join(FEATURES)})",
+    )
+    args = parser.parse_args()
+
+    print("Building PathWise plugin...")
+
+    root = Path(__file__).parent
+    body = generate_body(args.features)
+
+    if args.autoload:
+        plugin_content = write_autoload_layout(root, body)
+    else:
+        plugin_content = generate_header() + body
 
     # Write to file
-    output_path = Path(__file__).parent / "pathwise.plugin.zsh"
+    output_path = root / "pathwise.plugin.zsh"
     with output_path.open("w") as f:
         f.write(plugin_content)
 
     print(f"✅ Plugin built successfully: {output_path}")
     print(f"   Total size: {len(plugin_content)} bytes")
     print(f"   Lines: {plugin_content.count(chr(10))} lines")
+    if args.features != frozenset(FEATURES):
+        print(f"   Features: {', '.join(f for f in FEATURES if f in args.features)}")
+
+    if args.autoload:
+        function_count = len(list((root / "functions").iterdir()))
+        print(f"   Autoload functions: {function_count} in {root / 'functions'}")
+        if zcompile(root):
+            print("   Compiled: functions.zwc, pathwise.plugin.zsh.zwc")
+        else:
+            print("   ⚠️  zsh not available, skipped zcompile")
 
 
 if __name__ == "__main__":
@@ -118,7 +118,8 @@ if [ "$LOCAL_INSTALL" = true ]; then
     # Build the plugin if build script exists
     if [ -f "$SCRIPT_DIR/build_plugin.py" ]; then
         if command -v python3 &> /dev/null; then
-            (cd "$SCRIPT_DIR" && python3 build_plugin.py) > /dev/null 2>&1
+            # PATHWISE_BUILD_FLAGS=--autoload builds the autoload/zcompiled layout
+            (cd "$SCRIPT_DIR" && python3 build_plugin.py $PATHWISE_BUILD_FLAGS) > /dev/null 2>&1
             if [ "$UPDATE_MODE" = false ]; then
                 echo -e "${GREEN}✓${NC} Plugin built successfully"
             fi
@@ -132,6 +133,9 @@ if [ "$LOCAL_INSTALL" = true ]; then
     # Copy files from local directory
     mkdir -p "$PLUGIN_DIR"
     cp "$SCRIPT_DIR/pathwise.plugin.zsh" "$PLUGIN_DIR/" 2>/dev/null
+    [ -f "$SCRIPT_DIR/pathwise-startup.zsh" ] && cp "$SCRIPT_DIR/pathwise-startup.zsh" "$PLUGIN_DIR/"
+    [ -d "$SCRIPT_DIR/functions" ] && cp -r "$SCRIPT_DIR/functions" "$PLUGIN_DIR/"
+    cp "$SCRIPT_DIR"/*.zwc "$PLUGIN_DIR/" 2>/dev/null || true
     [ -f "$SCRIPT_DIR/README.md" ] && cp "$SCRIPT_DIR/README.md" "$PLUGIN_DIR/"
     [ -f "$SCRIPT_DIR/LICENSE" ] && cp "$SCRIPT_DIR/LICENSE" "$PLUGIN_DIR/"
     [ -f "$SCRIPT_DIR/install.sh" ] && cp "$SCRIPT_DIR/install.sh" "$PLUGIN_DIR/"
@@ -152,6 +156,7 @@ else
                 mkdir -p "$PLUGIN_DIR"
                 # Copy only the necessary plugin files
                 cp "$SCRIPT_DIR/pathwise.plugin.zsh" "$PLUGIN_DIR/" 2>/dev/null
+                [ -f "$SCRIPT_DIR/pathwise-startup.zsh" ] && cp "$SCRIPT_DIR/pathwise-startup.zsh" "$PLUGIN_DIR/"
                 [ -f "$SCRIPT_DIR/README.md" ] && cp "$SCRIPT_DIR/README.md" "$PLUGIN_DIR/"
                 [ -f "$SCRIPT_DIR/LICENSE" ] && cp "$SCRIPT_DIR/LICENSE" "$PLUGIN_DIR/"
                 [ -f "$SCRIPT_DIR/install.sh" ] && cp "$SCRIPT_DIR/install.sh" "$PLUGIN_DIR/"
@@ -167,7 +172,7 @@ else
         
         # Build the plugin if build script exists and we have Python
         if [ -f "$PLUGIN_DIR/build_plugin.py" ] && command -v python3 &> /dev/null; then
-            (cd "$PLUGIN_DIR" && python3 build_plugin.py) > /dev/null 2>&1
+            (cd "$PLUGIN_DIR" && python3 build_plugin.py $PATHWISE_BUILD_FLAGS) > /dev/null 2>&1
         fi
     else
         echo -e "${RED}Error: Git is required for installation${NC}"
@@ -0,0 +1,316 @@
+"""
+PathWise Command Line
+Python side of the `pathwise` shell command
+"""
+
+import argparse
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import TextIO
+
+from python.logic.dir_dictionary import rename_directory, tilde_path
+from python.logic.export_cursor import ExportCursor, load_cursor, save_cursor
+from python.logic.exporter import (
+    EXPORT_FORMATS,
+    ExportOptions,
+    ExportSources,
+    ExportSummary,
+    capture_export_cursor,
+    default_export_name,
+    default_sources,
+    filter_directories,
+    format_time,
+    parse_merged_data,
+    resolve_filter,
+    resolve_output_path,
+    write_export,
+)
+from python.logic.session_index import parse_day, range_report_for_shell
+from python.logic.team_merge import (
+    DEFAULT_TEAM_REPORT,
+    TEAM_DIRECTORIES,
+    TEAM_TOOLS,
+    expand_inputs,
+    merge_exports,
+    write_team_report,
+)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for all pathwise commands"""
+    parser = argparse.ArgumentParser(prog="pathwise")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    defaults = default_sources()
+    export = commands.add_parser(
+        "export",
+        help="export tracked data (merged directory data is read from stdin)",
+    )
+    export.add_argument(
+        "output",
+        nargs="?",
+        help="output file or directory, '-' for stdout (default: ./pathwise_export.<format>)",
+    )
+    export.add_argument(
+        "--format",
+        dest="export_format",
+        choices=EXPORT_FORMATS,
+        default="toml",
+        help="toml for reading, jsonl or csv for dashboards and scripts",
+    )
+    export.add_argument(
+        "-filter",
+        "--filter",
+        dest="filter_pattern",
+        default="",
+        help="'.' for the current tree, a path prefix, or text to match",
+    )
+    export.add_argument("--sort-by", default="frequency")
+    export.add_argument("--show-count", type=int, default=5)
+    export.add_argument("--time", action=argparse.BooleanOptionalAction, default=True)
+    export.add_argument("--tools", action=argparse.BooleanOptionalAction, default=True)
+    export.add_argument("--git", action=argparse.BooleanOptionalAction, default=True)
+    export.add_argument(
+        "--since-last",
+        action="store_true",
+        help="only activity added since the previous jsonl/csv export",
+    )
+    export.add_argument(
+        "--cursor",
+        default=str(Path.home() / ".frequent_dirs.export_cursor"),
+        help="where row exports remember how far they got",
+    )
+    export.add_argument("--sessions", default=defaults.sessions)
+    export.add_argument("--tools-log", default=defaults.tools)
+    export.add_argument("--tool-counts", default=defaults.tool_counts)
+    export.add_argument("--git-log", default=defaults.git)
+    export.add_argument("--dirs", dest="dictionary", default=defaults.dictionary)
+
+    merge = commands.add_parser("merge", help="combine many exports into a team summary")
+    merge.add_argument("inputs", nargs="+", help="TOML or JSON Lines exports, or directories")
+    merge.add_argument(
+        "-o",
+        "--output",
+        default=DEFAULT_TEAM_REPORT,
+        help=f"output file, '-' for stdout (default: ./{DEFAULT_TEAM_REPORT})",
+    )
+    merge.add_argument("--top", type=int, default=TEAM_DIRECTORIES, help="directories to list")
+    merge.add_argument("--top-tools", type=int, default=TEAM_TOOLS, help="tools to list")
+    merge.add_argument("--jobs", type=int, default=0, help="worker processes (default: CPUs)")
+
+    sessions = commands.add_parser("range", help="directory time between two days")
+    sessions.add_argument("--since", help="first day: YYYY-MM-DD, today, yesterday, 7d, 2w")
+    sessions.add_argument("--until", help="last day, inclusive (default: today)")
+    sessions.add_argument("--show-count", type=int, default=5)
+    sessions.add_argument("--sort-by", default="frequency")
+    sessions.add_argument("--sessions", default=defaults.sessions)
+    sessions.add_argument("--dirs", dest="dictionary", default=defaults.dictionary)
+
+    rename = commands.add_parser("rename", help="point a moved directory's history at its new home")
+    rename.add_argument("old", help="path the directory was recorded under")
+    rename.add_argument("new", help="path it lives at now")
+    rename.add_argument("--dirs", dest="dictionary", default=defaults.dictionary)
+
+    return parser
+
+
+def _export_cursor(
+    args: argparse.Namespace, sources: ExportSources
+) -> tuple[ExportCursor | None, ExportCursor] | None:
+    """Cursor pair for a row export, None for TOML
+
+    Row exports record where each source ended so the next one can be a delta.
+    """
+    if args.export_format == "toml":
+        return None
+    since = load_cursor(args.cursor) if args.since_last else None
+    return since, capture_export_cursor(sources, int(time.time()))
+
+
+def _write_output(
+    args: argparse.Namespace, write: Callable[[TextIO], ExportSummary], messages: TextIO
+) -> tuple[str, ExportSummary] | None:
+    """Write the export to stdout or the resolved output file
+
+    Returns:
+        (output name, summary), or None when the file could not be written
+    """
+    if args.output == "-":
+        return "stdout", write(sys.stdout)
+
+    output = resolve_output_path(
+        args.output or default_export_name(args.export_format), args.export_format
+    )
+    try:
+        with output.open("w", encoding="utf-8", newline="") as out:
+            return str(output), write(out)
+    except OSError as e:
+        print(f"❌ Could not write {output}: {e.strerror}", file=messages)
+        return None
+
+
+def run_export(args: argparse.Namespace) -> int:
+    """Run `pathwise export` and print the summary"""
+    # With '-' the export owns stdout, so messages go to stderr
+    messages = sys.stderr if args.output == "-" else sys.stdout
+
+    filter_pattern = resolve_filter(args.filter_pattern)
+    rows = filter_directories(parse_merged_data(sys.stdin), filter_pattern)
+    if not rows:
+        print(f"❌ No directories match filter: {filter_pattern or 'all'}", file=messages)
+        return 1
+
+    options = ExportOptions(
+        filter_pattern=filter_pattern,
+        sort_method=args.sort_by,
+        show_count=args.show_count,
+        track_time=args.time,
+        track_tools=args.tools,
+        track_git=args.git,
+    )
+    sources = ExportSources(
+        args.sessions, args.tools_log, args.tool_counts, args.git_log, args.dictionary
+    )
+    cursor = _export_cursor(args, sources)
+
+    written = _write_output(
+        args,
+        lambda out: write_export(
+            out, rows, options, sources, export_format=args.export_format, cursor=cursor
+        ),
+        messages,
+    )
+    if written is None:
+        return 1
+    output_name, summary = written
+
+    if cursor is not None:
+        try:
+            save_cursor(args.cursor, cursor[1])
+        except OSError as e:
+            print(f"⚠️  Could not save export cursor {args.cursor}: {e.strerror}", file=messages)
+
+    print(f"✅ Exported PathWise data to {output_name}", file=messages)
+    if cursor is not None and cursor[0] is not None:
+        print("   Delta since the previous export", file=messages)
+    elif args.since_last:
+        print("   No previous export cursor, exported everything", file=messages)
+    if filter_pattern:
+        print(f"   Filter applied: {filter_pattern}", file=messages)
+    print(f"   Directories exported: {summary.directories}", file=messages)
+    print(f"   Total visits tracked: {summary.visits}", file=messages)
+    if options.track_time:
+        print(f"   Total time tracked: {format_time(summary.time_seconds)}", file=messages)
+    if options.track_git and summary.commits > 0:
+        print(f"   Total commits tracked: {summary.commits}", file=messages)
+    if args.export_format == "toml":
+        print("", file=messages)
+        print("💡 Share this TOML with your team to show your work patterns!", file=messages)
+    return 0
+
+
+def run_merge(args: argparse.Namespace) -> int:
+    """Run `pathwise merge` and print the summary"""
+    to_stdout = args.output == "-"
+    messages = sys.stderr if to_stdout else sys.stdout
+
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        print("❌ No exports found to merge", file=messages)
+        return 1
+
+    totals = merge_exports(paths, args.jobs or None, sys.stderr)
+    if totals.exports == 0:
+        print("❌ None of the exports could be read", file=messages)
+        return 1
+
+    if to_stdout:
+        write_team_report(sys.stdout, totals, args.top, args.top_tools)
+    else:
+        try:
+            with Path(args.output).open("w", encoding="utf-8") as out:
+                write_team_report(out, totals, args.top, args.top_tools)
+        except OSError as e:
+            print(f"❌ Could not write {args.output}: {e.strerror}", file=messages)
+            return 1
+
+    output_name = "stdout" if to_stdout else args.output
+    print(f"✅ Merged {totals.exports} exports into {output_name}", file=messages)
+    print(f"   Team members: {len(totals.members)}", file=messages)
+    print(f"   Directories: {len(totals.visits)}", file=messages)
+    print(f"   Total visits tracked: {sum(totals.visits.values())}", file=messages)
+    return 0
+
+
+def run_range(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    """Run `wfreq --since/--until` and print the listing"""
+    try:
+        since = parse_day(args.since) if args.since else None
+        until = parse_day(args.until) if args.until else None
+    except ValueError:
+        parser.error("dates must be YYYY-MM-DD, today, yesterday, or a count like 7d or 2w")
+    if since is not None and until is not None and since > until:
+        parser.error(f"--since {since} is after --until {until}")
+
+    print(
+        range_report_for_shell(
+            args.sessions,
+            since,
+            until,
+            args.show_count,
+            sort_by=args.sort_by,
+            dictionary_file=args.dictionary,
+        )
+    )
+    return 0
+
+
+def run_rename(args: argparse.Namespace) -> int:
+    """Run `pathwise rename` and report how many directories moved"""
+    old = tilde_path(str(Path(args.old).expanduser()))
+    new = tilde_path(str(Path(args.new).expanduser()))
+    if old == new:
+        print("❌ Old and new paths are the same")
+        return 1
+
+    try:
+        renamed = rename_directory(args.dictionary, old, new)
+    except OSError as e:
+        print(f"❌ Could not update {args.dictionary}: {e.strerror}")
+        return 1
+
+    if not renamed:
+        print(f"❌ No recorded directories under {old}")
+        return 1
+    print(f"✅ Renamed {old} → {new} ({renamed} directories)")
+    print("   Today's and yesterday's lists keep the old path until they roll over")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for `python -m python.cli`"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        if args.since_last and args.export_format == "toml":
+            parser.error("--since-last needs --format=jsonl or --format=csv")
+        if sys.stdin.isatty():
+            parser.error(
+                "export reads merged directory data from stdin; use 'pathwise export' in zsh"
+            )
+        return run_export(args)
+    if args.command == "merge":
+        return run_merge(args)
+    if args.command == "range":
+        return run_range(args, parser)
+    if args.command == "rename":
+        return run_rename(args)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,417 @@
+"""
+Command Runtimes
+Keeps how long tracked commands ran as compact log-scale histograms per
+(directory, tool, day) and renders `wfreq --slow`: runtime percentiles per
+project, with commands that got slower than in the trailing week flagged
+"""
+
+import fcntl
+import math
+import os
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from datetime import date, timedelta
+from pathlib import Path
+from typing import NamedTuple
+
+from python.logic.dir_dictionary import load_dictionary, tilde_path
+from python.logic.project_detector import find_project_root
+from python.logic.session_store import percentile_rank
+from python.logic.tool_counters import (
+    BATCH_HEADER,
+    DAY_BUCKET_RETENTION,
+    OLDER_BUCKET,
+    batch_identity,
+    day_of,
+    pending_batch,
+)
+
+RESET = "\033[0m"
+DIM = "\033[90m"
+
+# Each bucket spans 25% more than the previous one, so a percentile read
+# from a histogram is within about 12% of the exact runtime
+BUCKET_BASE = 1.25
+
+# Commands whose runtime is how long the user kept them open, not work done
+INTERACTIVE_TOOLS = frozenset(
+    {
+        "vim", "nvim", "vi", "nano", "emacs", "hx", "micro", "less", "more", "man",
+        "top", "htop", "btop", "ssh", "mosh", "tmux", "screen", "watch", "tail",
+        "python", "python3", "ipython", "node", "psql", "mysql", "sqlite3", "fzf",
+    }
+)  # fmt: skip
+
+# Runs needed before a command is shown, and for each side of a comparison
+MIN_RUNS = 3
+
+# Today's median must be this much slower than last week's to be flagged
+REGRESSION_RATIO = 1.5
+
+TRAILING_DAYS = 7
+TOP_PROJECTS = 10
+TOOLS_PER_PROJECT = 6
+
+
+class RuntimeHistogram:
+    """Runs of a command, counted per log-scale duration bucket"""
+
+    __slots__ = ("buckets", "max_ms", "runs")
+
+    def __init__(self) -> None:
+        self.buckets: dict[int, int] = {}
+        self.runs = 0
+        self.max_ms = 0
+
+    @staticmethod
+    def bucket_of(milliseconds: int) -> int:
+        """Bucket index of a runtime"""
+        return int(math.log(max(milliseconds, 1), BUCKET_BASE))
+
+    def add(self, milliseconds: int) -> None:
+        """Count one run"""
+        bucket = self.bucket_of(milliseconds)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.runs += 1
+        self.max_ms = max(self.max_ms, milliseconds)
+
+    def merge(self, other: "RuntimeHistogram") -> None:
+        """Add another histogram's runs to this one"""
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+        self.runs += other.runs
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def percentile(self, percent: int) -> int:
+        """Nearest-rank percentile in milliseconds, at its bucket's midpoint"""
+        if not self.runs:
+            return 0
+        rank = percentile_rank(self.runs, percent)
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen > rank:
+                midpoint: float = BUCKET_BASE ** (bucket + 0.5)
+                return min(round(midpoint), self.max_ms)
+        return self.max_ms
+
+    def encode(self) -> str:
+        """Serialize as runs|max_ms|bucket:count,..."""
+        buckets = ",".join(f"{bucket}:{count}" for bucket, count in sorted(self.buckets.items()))
+        return f"{self.runs}|{self.max_ms}|{buckets}"
+
+    @classmethod
+    def decode(cls, runs: str, max_ms: str, buckets: str) -> "RuntimeHistogram":
+        """Rebuild a histogram from the fields `encode` wrote
+
+        Raises:
+            ValueError: When a field is not a number
+        """
+        histogram = cls()
+        histogram.runs, histogram.max_ms = int(runs), int(max_ms)
+        for pair in filter(None, buckets.split(",")):
+            bucket, _, count = pair.partition(":")
+            histogram.buckets[int(bucket)] = int(count)
+        return histogram
+
+
+class RuntimeRecord(NamedTuple):
+    """Runs of one tool in one directory on one day"""
+
+    directory: str
+    tool: str
+    day: str
+    histogram: RuntimeHistogram
+
+
+def parse_raw_record(line: str) -> RuntimeRecord | None:
+    """Parse a raw runtime log line: dir|tool|timestamp|milliseconds"""
+    fields = line.rstrip("\n").split("|")
+    if len(fields) != 4 or not fields[1] or not fields[3].isdigit():
+        return None
+    histogram = RuntimeHistogram()
+    histogram.add(int(fields[3]))
+    return RuntimeRecord(fields[0], fields[1], day_of(fields[2]), histogram)
+
+
+def parse_histogram_record(line: str) -> RuntimeRecord | None:
+    """Parse a histogram line: dir|tool|day|runs|max_ms|bucket:count,..."""
+    fields = line.rstrip("\n").split("|")
+    if len(fields) != 6 or not fields[1]:
+        return None
+    try:
+        histogram = RuntimeHistogram.decode(*fields[3:])
+    except ValueError:
+        return None
+    return RuntimeRecord(fields[0], fields[1], fields[2], histogram)
+
+
+def _read_records(
+    path: str, parse: Callable[[str], RuntimeRecord | None]
+) -> Iterator[RuntimeRecord]:
+    """Yield parsed records from a file, skipping malformed lines"""
+    try:
+        with Path(path).open(encoding="utf-8", errors="replace") as f:
+            for line in f:
+                record = parse(line)
+                if record is not None:
+                    yield record
+    except OSError:
+        return
+
+
+def iter_runtimes(runtimes_file: str, histogram_file: str) -> Iterator[RuntimeRecord]:
+    """Yield every recorded runtime, compacted histograms first
+
+    Args:
+        runtimes_file: Raw append-only runtime log (runs since the last compaction)
+        histogram_file: Compacted histogram file
+
+    Returns:
+        Iterator of RuntimeRecord, directories as logged
+    """
+    yield from _read_records(histogram_file, parse_histogram_record)
+    pending = pending_batch(runtimes_file, histogram_file)
+    if pending:
+        yield from _read_records(pending, parse_raw_record)
+    yield from _read_records(runtimes_file, parse_raw_record)
+
+
+def fold_runtimes(
+    records: Iterable[RuntimeRecord], today: date | None = None
+) -> dict[tuple[str, str, str], RuntimeHistogram]:
+    """Merge runtimes into per-day histograms, merging days past retention
+
+    Args:
+        records: Runtime records, histograms and raw runs alike
+        today: Reference day for retention (defaults to today)
+
+    Returns:
+        Dict mapping (directory, tool, day) -> histogram
+    """
+    reference = today or date.today()  # noqa: DTZ011
+    cutoff = (reference - timedelta(days=DAY_BUCKET_RETENTION)).isoformat()
+    folded: dict[tuple[str, str, str], RuntimeHistogram] = {}
+
+    for record in records:
+        day = record.day if record.day != OLDER_BUCKET and record.day >= cutoff else OLDER_BUCKET
+        folded.setdefault((record.directory, record.tool, day), RuntimeHistogram()).merge(
+            record.histogram
+        )
+    return folded
+
+
+def write_histograms(
+    histogram_file: str,
+    folded: dict[tuple[str, str, str], RuntimeHistogram],
+    batch: str = "",
+) -> None:
+    """Atomically replace the histogram file
+
+    Args:
+        histogram_file: Compacted histogram file
+        folded: Per-day histograms
+        batch: Identity of the raw batch folded in, recorded in the header
+    """
+    tmp_path = f"{histogram_file}.tmp.{os.getpid()}"
+    with Path(tmp_path).open("w", encoding="utf-8") as f:
+        if batch:
+            f.write(f"{BATCH_HEADER}{batch}\n")
+        for (directory, tool, day), histogram in sorted(folded.items()):
+            f.write(f"{directory}|{tool}|{day}|{histogram.encode()}\n")
+    Path(tmp_path).replace(histogram_file)
+
+
+def compact_runtime_log(runtimes_file: str, histogram_file: str) -> int:
+    """Fold the raw runtime log into the histogram file and truncate it
+
+    Works like the tool log compaction: the raw log is renamed aside first,
+    so runs logged meanwhile are never lost, and the histogram header
+    records the folded batch, so an interrupted run never folds it twice.
+
+    Args:
+        runtimes_file: Raw append-only runtime log
+        histogram_file: Compacted histogram file
+
+    Returns:
+        Number of raw runs folded into the histograms
+    """
+    pending = runtimes_file + ".compacting"
+
+    with Path(histogram_file + ".lock").open("w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+
+        if Path(pending).exists() and not pending_batch(runtimes_file, histogram_file):
+            Path(pending).unlink()  # Folded before an interrupted run could remove it
+
+        if Path(runtimes_file).is_file() and Path(runtimes_file).stat().st_size > 0:
+            if Path(pending).exists():
+                # Keep the unfinished batch and queue the new one behind it
+                batch = f"{runtimes_file}.{os.getpid()}"
+                Path(runtimes_file).replace(batch)
+                with (
+                    Path(pending).open("a", encoding="utf-8") as out,
+                    Path(batch).open(encoding="utf-8", errors="replace") as raw,
+                ):
+                    out.writelines(raw)
+                Path(batch).unlink()
+            else:
+                Path(runtimes_file).replace(pending)
+
+        if not Path(pending).exists():
+            return 0
+
+        raw_records = list(_read_records(pending, parse_raw_record))
+        histograms = _read_records(histogram_file, parse_histogram_record)
+        folded = fold_runtimes([*histograms, *raw_records])
+        write_histograms(histogram_file, folded, batch_identity(pending))
+        Path(pending).unlink()
+
+    return len(raw_records)
+
+
+def format_ms(milliseconds: int) -> str:
+    """Format a runtime with a readable unit"""
+    if milliseconds >= 60_000:
+        minutes, seconds = divmod(round(milliseconds / 1000), 60)
+        return f"{minutes}m {seconds:02d}s"
+    if milliseconds >= 1000:
+        return f"{milliseconds / 1000:.1f}s"
+    return f"{milliseconds}ms"
+
+
+class ToolRuntimes(NamedTuple):
+    """Runtimes of one tool in one project"""
+
+    tool: str
+    overall: RuntimeHistogram
+    today: RuntimeHistogram
+    trailing: RuntimeHistogram
+
+
+def project_runtimes(
+    records: Iterable[RuntimeRecord], dictionary_file: str | None = None, today: date | None = None
+) -> dict[str, dict[str, ToolRuntimes]]:
+    """Group runtimes by project root and tool
+
+    Args:
+        records: Runtime records with directories as logged
+        dictionary_file: Directory dictionary for decoding directory IDs
+        today: Day compared against the trailing week (defaults to today)
+
+    Returns:
+        Dict mapping project path -> tool -> ToolRuntimes
+    """
+    reference = today or date.today()  # noqa: DTZ011
+    current = reference.isoformat()
+    week_start = (reference - timedelta(days=TRAILING_DAYS)).isoformat()
+    dictionary = load_dictionary(dictionary_file)
+    roots: dict[str, str] = {}
+    projects: dict[str, dict[str, ToolRuntimes]] = {}
+
+    for record in records:
+        if record.tool in INTERACTIVE_TOOLS:
+            continue
+        if record.directory not in roots:
+            path = str(Path(dictionary.path_of(record.directory)).expanduser())
+            roots[record.directory] = tilde_path(find_project_root(path)[0])
+        tools = projects.setdefault(roots[record.directory], {})
+        if record.tool not in tools:
+            tools[record.tool] = ToolRuntimes(
+                record.tool, RuntimeHistogram(), RuntimeHistogram(), RuntimeHistogram()
+            )
+        runtimes = tools[record.tool]
+        runtimes.overall.merge(record.histogram)
+        if record.day == current:
+            runtimes.today.merge(record.histogram)
+        elif record.day != OLDER_BUCKET and week_start <= record.day < current:
+            runtimes.trailing.merge(record.histogram)
+    return projects
+
+
+def regression(runtimes: ToolRuntimes) -> float | None:
+    """How many times slower today's median is than the trailing week's
+
+    Returns:
+        The ratio when it reaches REGRESSION_RATIO with enough runs on both
+        sides, otherwise None
+    """
+    if runtimes.today.runs < MIN_RUNS or runtimes.trailing.runs < MIN_RUNS:
+        return None
+    baseline = runtimes.trailing.percentile(50)
+    ratio = runtimes.today.percentile(50) / max(baseline, 1)
+    return ratio if ratio >= REGRESSION_RATIO else None
+
+
+def slow_report(projects: dict[str, dict[str, ToolRuntimes]]) -> str:
+    """Render `wfreq --slow`
+
+    Returns:
+        Report text with ANSI colors, empty when no command ran often enough
+    """
+    ranked = []
+    for project, tools in projects.items():
+        shown = [runtimes for runtimes in tools.values() if runtimes.overall.runs >= MIN_RUNS]
+        shown.sort(key=lambda runtimes: (-runtimes.overall.percentile(95), runtimes.tool))
+        if shown:
+            ranked.append((shown[0].overall.percentile(95), project, shown))
+    if not ranked:
+        return ""
+    ranked.sort(key=lambda entry: (-entry[0], entry[1]))
+
+    lines = [f"\033[35m🐢 Command Runtimes:{RESET} {DIM}per project, p50 / p95 / max{RESET}"]
+    regressions = 0
+    for _, project, shown in ranked[:TOP_PROJECTS]:
+        lines.append("")
+        lines.append(f"\033[96m{project}{RESET}")
+        for runtimes in shown[:TOOLS_PER_PROJECT]:
+            overall = runtimes.overall
+            line = (
+                f"  {runtimes.tool[:16]:<16} {DIM}{overall.runs:>5} runs{RESET}  "
+                f"{format_ms(overall.percentile(50)):>8} / "
+                f"\033[93m{format_ms(overall.percentile(95)):>8}{RESET} / "
+                f"{format_ms(overall.max_ms):>8}"
+            )
+            ratio = regression(runtimes)
+            if ratio is not None:
+                regressions += 1
+                line += (
+                    f"  \033[91m⚠️  today {format_ms(runtimes.today.percentile(50))} vs "
+                    f"{format_ms(runtimes.trailing.percentile(50))} last week "
+                    f"(+{ratio - 1:.0%}){RESET}"
+                )
+            lines.append(line)
+
+    if regressions:
+        lines.append("")
+        lines.append(
+            f"\033[33m💡 {regressions} command(s) are slower today than over the "
+            f"past {TRAILING_DAYS} days{RESET}"
+        )
+    return "\n".join(lines)
+
+
+def slow_report_for_shell(
+    runtimes_file: str, histogram_file: str, dictionary_file: str | None = None
+) -> str:
+    """Build `wfreq --slow` from the runtime log and histograms"""
+    records = iter_runtimes(runtimes_file, histogram_file)
+    return slow_report(project_runtimes(records, dictionary_file))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 4 or sys.argv[1] not in ("compact", "report"):
+        print("Usage: python command_runtimes.py compact <runtimes_file> <histogram_file>")
+        print("       python command_runtimes.py report <runtimes_file> <histogram_file> [dirs]")
+        sys.exit(1)
+
+    command, runtimes_path, histogram_path = sys.argv[1:4]
+
+    if command == "compact":
+        compact_runtime_log(runtimes_path, histogram_path)
+    else:
+        report = slow_report_for_shell(
+            runtimes_path, histogram_path, sys.argv[4] if len(sys.argv) > 4 else None
+        )
+        if report:
+            print(report)
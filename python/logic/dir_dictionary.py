@@ -0,0 +1,136 @@
+"""
+Directory Dictionary
+Maps the compact integer IDs written in the logs back to directory paths,
+so records stay short and a renamed directory is fixed in one place
+"""
+
+import fcntl
+import os
+import sys
+from pathlib import Path
+
+DICTIONARY_NAME = ".frequent_dirs.dirs"
+
+
+class DirectoryDictionary:
+    """IDs and paths from the dictionary file"""
+
+    __slots__ = ("ids", "paths")
+
+    def __init__(self) -> None:
+        self.paths: dict[str, str] = {}
+        # A renamed directory can end up with several IDs
+        self.ids: dict[str, list[str]] = {}
+
+    def add(self, directory_id: str, path: str) -> None:
+        """Record one dictionary entry"""
+        self.paths[directory_id] = path
+        self.ids.setdefault(path, []).append(directory_id)
+
+    def path_of(self, field: str) -> str:
+        """Decode the directory field of a log record
+
+        Records written before the dictionary hold the path itself, which
+        is returned unchanged.
+        """
+        return self.paths.get(field, field)
+
+    def keys_for(self, path: str) -> list[str]:
+        """Every value the directory field can hold for a path"""
+        return [path, *self.ids.get(path, [])]
+
+
+def default_dictionary_path() -> str:
+    """Dictionary file used by the plugin"""
+    return str(Path.home() / DICTIONARY_NAME)
+
+
+def load_dictionary(path: str | None = None) -> DirectoryDictionary:
+    """Load the directory dictionary
+
+    Args:
+        path: Dictionary file of id|path lines (defaults to the plugin's)
+
+    Returns:
+        DirectoryDictionary, empty when the file is missing
+    """
+    dictionary = DirectoryDictionary()
+    try:
+        with Path(path or default_dictionary_path()).open(
+            encoding="utf-8", errors="surrogateescape"
+        ) as f:
+            for line in f:
+                directory_id, _, directory = line.rstrip("\n").partition("|")
+                if directory_id.isdigit() and directory:
+                    dictionary.add(directory_id, directory)
+    except OSError:
+        pass
+    return dictionary
+
+
+def tilde_path(path: str) -> str:
+    """Write a path the way the logs do, with ~ for the home directory"""
+    home = str(Path.home())
+    path = path.rstrip("/") or "/"
+    if path == home or path.startswith(home + "/"):
+        return "~" + path[len(home) :]
+    return path
+
+
+def rename_directory(dictionary_file: str, old: str, new: str) -> int:
+    """Point a directory and everything below it at a new path
+
+    Every log record stores the dictionary ID, so this one rewrite renames
+    the directory across sessions, tool usage and git history. Records
+    written before the dictionary existed still hold the old path.
+
+    Args:
+        dictionary_file: Dictionary file of id|path lines
+        old: Current path, in ~ form
+        new: New path, in ~ form
+
+    Returns:
+        Number of dictionary entries renamed
+    """
+    tmp_path = f"{dictionary_file}.tmp.{os.getpid()}"
+    renamed = 0
+
+    # The shell assigns new IDs under the same fcntl lock (zsystem flock)
+    with Path(dictionary_file + ".lock").open("w") as lock:
+        fcntl.lockf(lock, fcntl.LOCK_EX)
+        try:
+            with Path(dictionary_file).open(encoding="utf-8", errors="surrogateescape") as f:
+                lines = f.readlines()
+        except OSError:
+            return 0
+
+        with Path(tmp_path).open("w", encoding="utf-8", errors="surrogateescape") as out:
+            for line in lines:
+                directory_id, _, directory = line.rstrip("\n").partition("|")
+                if directory == old or directory.startswith(old + "/"):
+                    directory = new + directory[len(old) :]
+                    renamed += 1
+                out.write(f"{directory_id}|{directory}\n")
+        Path(tmp_path).replace(dictionary_file)
+
+    return renamed
+
+
+if __name__ == "__main__":
+    if (
+        len(sys.argv) < 3
+        or sys.argv[1] not in ("decode", "rename")
+        or (sys.argv[1] == "rename" and len(sys.argv) < 5)
+    ):
+        print("Usage: python dir_dictionary.py decode <dictionary> < log")
+        print("       python dir_dictionary.py rename <dictionary> <old> <new>")
+        sys.exit(1)
+
+    if sys.argv[1] == "rename":
+        count = rename_directory(sys.argv[2], tilde_path(sys.argv[3]), tilde_path(sys.argv[4]))
+        print(f"Renamed {count} directories")
+    else:
+        entries = load_dictionary(sys.argv[2])
+        for record in sys.stdin:
+            field, separator, rest = record.partition("|")
+            sys.stdout.write(entries.path_of(field) + separator + rest)
@@ -0,0 +1,261 @@
+"""
+Export Cursor
+Remembers how far each data file had been exported so `--since-last`
+exports only read and emit what was appended afterwards
+"""
+
+import json
+import os
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import NamedTuple
+
+from python.logic.log_index import log_head
+from python.logic.tool_counters import OLDER_BUCKET, ToolUsage
+
+CURSOR_VERSION = 1
+
+# Session (end) and commit (timestamp) lines both keep their time in this field
+TIME_FIELD = 2
+
+# Tail of a source searched for lines from the export's own second
+BOUNDARY_WINDOW = 64 * 1024
+
+
+class SourceCursor(NamedTuple):
+    """Position reached in one append-only source file
+
+    Attributes:
+        identity: Device and inode of the file
+        offset: Bytes exported so far
+        head: Checksum of the first bytes, telling a new file that reused
+            the inode apart from the same file grown
+    """
+
+    identity: str
+    offset: int
+    head: str
+
+
+class ExportCursor(NamedTuple):
+    """State of the data files at the last row export
+
+    Attributes:
+        exported_at: Unix time the export started
+        sources: Position reached in each source, keyed by file path
+        tool_day: Day whose tool buckets are recorded in tool_buckets
+        tool_buckets: Uses per dir|tool|alias|day bucket on tool_day
+        boundary: Lines of each source already exported whose time is
+            exported_at itself, which time alone cannot tell from later ones
+    """
+
+    exported_at: int
+    sources: dict[str, SourceCursor]
+    tool_day: str
+    tool_buckets: dict[str, int]
+    boundary: dict[str, list[str]]
+
+
+def file_head(path: str, size: int) -> str:
+    """Checksum of a file's first bytes, empty when it cannot be read"""
+    try:
+        return log_head(path, size)
+    except OSError:
+        return ""
+
+
+def file_cursor(path: str) -> SourceCursor | None:
+    """Current identity and size of a file, or None if it does not exist"""
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return None
+    return SourceCursor(f"{stat.st_dev}:{stat.st_ino}", stat.st_size, file_head(path, stat.st_size))
+
+
+def resumes(path: str, previous: SourceCursor | None, end: SourceCursor) -> bool:
+    """Whether a source is the file the previous export read, only grown since"""
+    return (
+        previous is not None
+        and previous.identity == end.identity
+        and previous.offset <= end.offset
+        and file_head(path, previous.offset) == previous.head
+    )
+
+
+def complete_lines_end(path: str, size: int) -> int:
+    """Offset just past the last complete line within the first size bytes"""
+    chunk = 4096
+    try:
+        with Path(path).open("rb") as f:
+            end = size
+            while end > 0:
+                start = max(0, end - chunk)
+                f.seek(start)
+                newline = f.read(end - start).rfind(b"\n")
+                if newline >= 0:
+                    return start + newline + 1
+                end = start
+    except OSError:
+        pass
+    return 0
+
+
+def load_cursor(path: str) -> ExportCursor | None:
+    """Load the export cursor, or None if there has been no row export yet"""
+    try:
+        with Path(path).open(encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != CURSOR_VERSION:
+            return None
+        return ExportCursor(
+            exported_at=int(data["exported_at"]),
+            sources={
+                source: SourceCursor(str(value[0]), int(value[1]), str(value[2]))
+                for source, value in data["sources"].items()
+            },
+            tool_day=str(data["tool_day"]),
+            tool_buckets={key: int(uses) for key, uses in data["tool_buckets"].items()},
+            boundary={
+                source: [str(line) for line in lines] for source, lines in data["boundary"].items()
+            },
+        )
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def save_cursor(path: str, cursor: ExportCursor) -> None:
+    """Atomically write the export cursor"""
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    data = {
+        "version": CURSOR_VERSION,
+        "exported_at": cursor.exported_at,
+        "sources": {source: list(value) for source, value in cursor.sources.items()},
+        "tool_day": cursor.tool_day,
+        "tool_buckets": cursor.tool_buckets,
+        "boundary": cursor.boundary,
+    }
+    with Path(tmp_path).open("w", encoding="utf-8") as f:
+        json.dump(data, f)
+    Path(tmp_path).replace(path)
+
+
+def capture_cursor(paths: list[str], started_at: int) -> ExportCursor:
+    """Record where every source ends as an export starts
+
+    Offsets stop at the last complete line. Tool buckets are filled in
+    separately once today's usage is known.
+
+    Args:
+        paths: Append-only source files
+        started_at: Unix time the export started
+
+    Returns:
+        ExportCursor with the current size of each existing source
+    """
+    sources = {}
+    for path in paths:
+        position = file_cursor(path)
+        if position is not None:
+            # A line still being written is left for the next export
+            offset = complete_lines_end(path, position.offset)
+            sources[path] = SourceCursor(position.identity, offset, file_head(path, offset))
+    day = datetime.fromtimestamp(started_at).date().isoformat()  # noqa: DTZ006
+    return ExportCursor(started_at, sources, day, {}, {})
+
+
+def line_time(line: str) -> int | None:
+    """Time field of a session or commit line, None when it is not a number"""
+    fields = line.split("|", TIME_FIELD + 1)
+    if len(fields) <= TIME_FIELD:
+        return None
+    try:
+        return int(fields[TIME_FIELD])
+    except ValueError:
+        return None
+
+
+def record_boundary(cursor: ExportCursor, path: str) -> None:
+    """Store the source's exported lines from the export's own second
+
+    Lines are appended in time order, so they are all in the tail before
+    the cursor's offset.
+    """
+    position = cursor.sources.get(path)
+    if position is None:
+        return
+    start = max(position.offset - BOUNDARY_WINDOW, 0)
+    try:
+        with Path(path).open("rb") as f:
+            f.seek(start)
+            tail = f.read(position.offset - start).decode("utf-8", "replace")
+    except OSError:
+        return
+    # A window starting mid-file begins with a partial line
+    lines = tail.split("\n")[1 if start else 0 : -1]
+    cursor.boundary[path] = [line for line in lines if (line_time(line) or 0) >= cursor.exported_at]
+
+
+def already_exported(since: ExportCursor, path: str, line: str) -> bool:
+    """Whether a reread or archived line went out with the previous export
+
+    Lines recorded before it started went out with it, except those from
+    its own second, which went out only if they are in its boundary.
+    """
+    moment = line_time(line)
+    if moment is None:
+        return True
+    return moment < since.exported_at or line in since.boundary.get(path, ())
+
+
+def read_appended(
+    path: str, since: ExportCursor | None, until: ExportCursor
+) -> tuple[Iterator[str], bool]:
+    """Lines appended to a source between two cursors
+
+    Reading resumes at the previous offset when the file is the same one
+    and has not shrunk. A replaced or truncated file is read from the start;
+    the caller must then drop records older than the previous export.
+
+    Args:
+        path: Source file
+        since: Cursor of the previous export (None reads everything)
+        until: Cursor captured when this export started
+
+    Returns:
+        Tuple of (iterator over complete lines, whether reading restarted)
+    """
+    end = until.sources.get(path)
+    if end is None:
+        return iter(()), False
+
+    previous = since.sources.get(path) if since is not None else None
+    resumed = resumes(path, previous, end)
+    start = previous.offset if resumed and previous is not None else 0
+    restarted = since is not None and not resumed
+
+    def lines() -> Iterator[str]:
+        try:
+            with Path(path).open("rb") as f:
+                f.seek(start)
+                remaining = end.offset - start
+                for raw in f:
+                    if remaining <= 0 or not raw.endswith(b"\n") or len(raw) > remaining:
+                        break
+                    remaining -= len(raw)
+                    yield raw.decode("utf-8", "replace").rstrip("\n")
+        except OSError:
+            return
+
+    return lines(), restarted
+
+
+def bucket_key(usage: ToolUsage) -> str:
+    """Cursor key for a tool usage bucket"""
+    return f"{usage.directory}|{usage.tool}|{usage.alias}|{usage.day}"
+
+
+def is_since(day: str, first_day: str) -> bool:
+    """Whether a usage bucket day falls on or after first_day"""
+    return day != OLDER_BUCKET and day >= first_day
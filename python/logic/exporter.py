@@ -0,0 +1,929 @@
+"""
+PathWise Data Export
+Joins merged directory data with sessions, tool usage and git history,
+reading each source once, and streams the report as TOML, JSON Lines or CSV
+"""
+
+import csv
+import fcntl
+import gzip
+import io
+import json
+import os
+import re
+import shutil
+import socket
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+from typing import NamedTuple, TextIO
+
+from python.logic.dir_dictionary import (
+    DirectoryDictionary,
+    default_dictionary_path,
+    load_dictionary,
+)
+from python.logic.export_cursor import (
+    ExportCursor,
+    already_exported,
+    bucket_key,
+    capture_cursor,
+    file_cursor,
+    is_since,
+    read_appended,
+    record_boundary,
+    resumes,
+)
+from python.logic.git_tracker import categorize_commit_like_shell
+from python.logic.log_index import read_records_by_directory
+from python.logic.session_analytics import hour_histogram, transition_counts
+from python.logic.session_archive import GZIP_SUFFIX, iter_session_lines, list_partitions
+from python.logic.session_store import SessionStore, load_session_history
+from python.logic.tool_counters import ToolUsage, iter_tool_usage
+
+EXPORT_FORMATS = ("toml", "jsonl", "csv")
+DEFAULT_EXPORT_STEM = "pathwise_export"
+
+# Version of the row layout in JSON Lines and CSV exports
+ROW_FORMAT_VERSION = 1
+
+# CSV columns: every row kind shares one header, unused cells stay empty
+CSV_COLUMNS = (
+    "record",
+    "directory",
+    "visits",
+    "time_seconds",
+    "last_visited",
+    "git_commits",
+    "start",
+    "end",
+    "duration",
+    "tool",
+    "tool_type",
+    "alias",
+    "day",
+    "uses",
+    "hash",
+    "timestamp",
+    "category",
+    "message",
+)
+
+# Report limits, matching the shell exporter this replaces
+TOOLS_PER_DIRECTORY = 10
+DIRECTORIES_PER_TOOL = 5
+NAVIGATION_PATTERNS = 10
+
+# Export key for each commit category, in report order
+GIT_CATEGORY_KEYS = {
+    "revert": "reverts",
+    "fix": "fixes",
+    "feat": "features",
+    "perf": "performance",
+    "refactor": "refactoring",
+    "test": "tests",
+    "build": "build",
+    "ci": "ci_cd",
+    "docs": "documentation",
+    "style": "style",
+    "chore": "chore",
+    "other": "other",
+}
+
+# Tool categories used in the export, first match wins
+EXPORT_TOOL_CATEGORIES: tuple[tuple[str, frozenset[str]], ...] = (
+    (
+        "editor",
+        frozenset(
+            ["nano", "vim", "vi", "nvim", "emacs", "code", "subl", "atom", "gedit", "kate", "micro"]
+        ),
+    ),
+    (
+        "language",
+        frozenset(
+            ["python", "python3", "ruby", "node", "java", "go", "rust", "gcc", "g++", "clang"]
+        ),
+    ),
+    (
+        "package_manager",
+        frozenset(["pip", "pip3", "npm", "yarn", "cargo", "maven", "gradle", "gem", "bundle"]),
+    ),
+    ("version_control", frozenset(["git", "svn", "hg", "bzr"])),
+    ("testing", frozenset(["pytest", "jest", "mocha", "rspec", "unittest", "coverage"])),
+    ("build", frozenset(["make", "cmake", "gradle", "mvn", "cargo"])),
+    ("devops", frozenset(["docker", "kubectl", "helm", "terraform"])),
+    ("file_tool", frozenset(["ls", "cd", "cp", "mv", "rm", "mkdir", "find", "grep", "awk", "sed"])),
+    ("linting", frozenset(["mypy", "ruff", "flake8", "black", "prettier", "eslint", "pylint"])),
+)
+
+BARE_KEY_RE = re.compile(r"^[A-Za-z0-9_-]+$")
+
+TOML_ESCAPES = {
+    "\\": "\\\\",
+    '"': '\\"',
+    "\b": "\\b",
+    "\t": "\\t",
+    "\n": "\\n",
+    "\f": "\\f",
+    "\r": "\\r",
+}
+
+
+class DirectoryRow(NamedTuple):
+    """One line of _freq_dirs_get_merged_data output"""
+
+    path: str
+    visits: int
+    time_seconds: int
+    git_commits: int
+    period: str
+
+
+class ExportSources(NamedTuple):
+    """Data files the exporter reads"""
+
+    sessions: str
+    tools: str
+    tool_counts: str
+    git: str
+    dictionary: str
+
+
+class ExportOptions(NamedTuple):
+    """Settings that shape the export"""
+
+    filter_pattern: str = ""
+    sort_method: str = "frequency"
+    show_count: int = 5
+    track_time: bool = True
+    track_tools: bool = True
+    track_git: bool = True
+
+
+class ExportSummary(NamedTuple):
+    """Totals reported after an export"""
+
+    directories: int
+    visits: int
+    time_seconds: int
+    commits: int
+
+
+class ToolStats:
+    """Tool usage totals for the exported directories"""
+
+    __slots__ = ("by_directory", "by_tool", "totals")
+
+    def __init__(self) -> None:
+        self.by_directory: dict[str, Counter[str]] = {}
+        self.by_tool: dict[str, Counter[str]] = {}
+        self.totals: Counter[str] = Counter()
+
+
+def default_sources() -> ExportSources:
+    """Data file locations used by the plugin"""
+    home = Path.home()
+    return ExportSources(
+        sessions=str(home / ".frequent_dirs.sessions"),
+        tools=str(home / ".frequent_dirs.tools"),
+        tool_counts=str(home / ".frequent_dirs.tools.counts"),
+        git=str(home / ".frequent_dirs.git"),
+        dictionary=default_dictionary_path(),
+    )
+
+
+def _to_int(value: str) -> int:
+    """Parse a numeric field, treating blanks and garbage as 0"""
+    try:
+        return int(value)
+    except ValueError:
+        return 0
+
+
+def format_time(seconds: int) -> str:
+    """Format a duration like _freq_dirs_format_time"""
+    hours, remainder = divmod(seconds, 3600)
+    minutes, secs = divmod(remainder, 60)
+    if hours > 0:
+        return f"{hours}h {minutes}m"
+    if minutes > 0:
+        return f"{minutes}m {secs}s"
+    return f"{secs}s"
+
+
+def toml_string(value: str) -> str:
+    """Quote a value as a TOML basic string"""
+    escaped = []
+    for char in value:
+        if char in TOML_ESCAPES:
+            escaped.append(TOML_ESCAPES[char])
+        elif ord(char) < 0x20 or ord(char) == 0x7F:
+            escaped.append(f"\\u{ord(char):04x}")
+        else:
+            escaped.append(char)
+    return '"' + "".join(escaped) + '"'
+
+
+def toml_key(key: str) -> str:
+    """Use a bare TOML key when allowed, a quoted one otherwise"""
+    return key if BARE_KEY_RE.match(key) else toml_string(key)
+
+
+def tool_category(tool: str) -> str:
+    """Categorize a tool for the export
+
+    Args:
+        tool: Tool name as recorded
+
+    Returns:
+        Category such as 'editor', 'script', 'tool' or 'other'
+    """
+    for category, tools in EXPORT_TOOL_CATEGORIES:
+        if tool in tools:
+            return category
+    if tool.startswith("./") or tool.endswith(".sh"):
+        return "script"
+    if shutil.which(tool):
+        return "tool"
+    return "other"
+
+
+def parse_merged_data(lines: Iterable[str]) -> list[DirectoryRow]:
+    """Parse dir|visits|time|commits|period[|...] lines
+
+    Args:
+        lines: Output of _freq_dirs_get_merged_data
+
+    Returns:
+        Directory rows in the given order
+    """
+    rows = []
+    for line in lines:
+        fields = line.rstrip("\n").split("|")
+        if not fields[0]:
+            continue
+        fields += [""] * (5 - len(fields))
+        rows.append(
+            DirectoryRow(
+                fields[0], _to_int(fields[1]), _to_int(fields[2]), _to_int(fields[3]), fields[4]
+            )
+        )
+    return rows
+
+
+def resolve_filter(pattern: str) -> str:
+    """Expand the '.' filter to the current directory in ~ form"""
+    if pattern != ".":
+        return pattern
+    # $PWD keeps the path as the shell sees it, symlinks included
+    cwd = os.environ.get("PWD") or str(Path.cwd())
+    home = str(Path.home())
+    if cwd == home or cwd.startswith(home + "/"):
+        return "~" + cwd[len(home) :]
+    return cwd
+
+
+def filter_directories(rows: list[DirectoryRow], pattern: str) -> list[DirectoryRow]:
+    """Apply an export filter
+
+    Paths (starting with ~ or /) select that directory and everything
+    below it. Anything else is a case-insensitive substring match.
+
+    Args:
+        rows: Directory rows to filter
+        pattern: Filter pattern, already resolved
+
+    Returns:
+        Matching rows in the original order
+    """
+    if not pattern:
+        return rows
+    if pattern.startswith(("~", "/")):
+        prefix = pattern.rstrip("/") or "/"
+        return [row for row in rows if row.path == prefix or row.path.startswith(prefix + "/")]
+    needle = pattern.lower()
+    return [row for row in rows if needle in row.path.lower()]
+
+
+def default_export_name(export_format: str) -> str:
+    """Default file name for an export format"""
+    return f"{DEFAULT_EXPORT_STEM}.{export_format}"
+
+
+def resolve_output_path(output: str, export_format: str = "toml") -> Path:
+    """Add the default file name when the output is a directory"""
+    path = Path(output)
+    return path / default_export_name(export_format) if path.is_dir() else path
+
+
+def scan_sessions(
+    path: str, directories: set[str], dictionary: DirectoryDictionary
+) -> SessionStore | None:
+    """Load the exported directories' sessions into a columnar store in one pass
+
+    Args:
+        path: Live sessions file (dir|start|end|duration), partitions sit beside it
+        directories: Directories being exported
+        dictionary: Directory dictionary to decode directory IDs with
+
+    Returns:
+        SessionStore over the live and archived sessions, or None when there
+        is no session data at all
+    """
+    sessions_file = Path(path)
+    live = sessions_file.is_file() and sessions_file.stat().st_size > 0
+    if not live and not list_partitions(path):
+        return None
+    return load_session_history(path, dictionary, directories)
+
+
+def scan_tools(
+    sources: ExportSources, directories: list[str], dictionary: DirectoryDictionary
+) -> ToolStats:
+    """Total tool usage per directory and per tool in one pass
+
+    Args:
+        sources: Data file locations
+        directories: Directories being exported
+        dictionary: Directory dictionary to decode directory IDs with
+
+    Returns:
+        ToolStats restricted to the exported directories
+    """
+    wanted = set(directories)
+    stats = ToolStats()
+
+    usage = iter_tool_usage(sources.tools, sources.tool_counts, directories, dictionary)
+    for record in usage:
+        if record.directory not in wanted:
+            continue
+        stats.by_directory.setdefault(record.directory, Counter())[record.tool] += record.uses
+        stats.by_tool.setdefault(record.tool, Counter())[record.directory] += record.uses
+        stats.totals[record.tool] += record.uses
+
+    return stats
+
+
+def scan_git(
+    path: str, directories: Iterable[str], dictionary: DirectoryDictionary
+) -> dict[str, Counter[str]]:
+    """Categorize each directory's commits, reading only its own records
+
+    Args:
+        path: Git log (dir|hash|timestamp|message)
+        directories: Directories to categorize
+        dictionary: Directory dictionary, to find records logged by ID
+
+    Returns:
+        Dict mapping directory -> Counter of categories
+    """
+    categories: dict[str, Counter[str]] = {}
+    for directory, records in read_records_by_directory(path, directories, dictionary).items():
+        counts: Counter[str] = Counter()
+        for record in records:
+            fields = record.split("|", 3)
+            if len(fields) == 4 and fields[3]:
+                counts[categorize_commit_like_shell(fields[3])] += 1
+        categories[directory] = counts
+    return categories
+
+
+def _ranked(counts: Counter[str], limit: int) -> list[tuple[str, int]]:
+    """Top entries by count, ties broken like `sort | uniq -c | sort -rn`"""
+    return sorted(counts.items(), key=lambda item: (item[1], item[0]), reverse=True)[:limit]
+
+
+def _write_directory(
+    out: TextIO,
+    row: DirectoryRow,
+    options: ExportOptions,
+    tools: ToolStats | None,
+    git: dict[str, Counter[str]],
+) -> None:
+    """Write one [[directories]] table"""
+    out.write("[[directories]]\n")
+    out.write(f"path = {toml_string(row.path)}\n")
+    out.write(f"visits = {row.visits}\n")
+    out.write(f"time_seconds = {row.time_seconds}\n")
+    out.write(f"time_formatted = {toml_string(format_time(row.time_seconds))}\n")
+    out.write(f"last_visited = {toml_string(row.period)}\n")
+    out.write(f"git_commits = {row.git_commits}\n")
+
+    if tools is not None and row.path in tools.by_directory:
+        out.write("\n[directories.tools_used]\n")
+        for tool, uses in _ranked(tools.by_directory[row.path], TOOLS_PER_DIRECTORY):
+            out.write(f"{toml_key(tool)} = {uses}\n")
+
+    if options.track_git and row.git_commits > 0:
+        out.write("\n[directories.git_categories]\n")
+        counts = git.get(row.path, Counter())
+        if not counts:
+            out.write("# No categorized commits found\n")
+        for category, key in GIT_CATEGORY_KEYS.items():
+            if counts[category]:
+                out.write(f"{key} = {counts[category]}\n")
+
+    out.write("\n")
+
+
+def _write_top_tools(out: TextIO, tools: ToolStats, limit: int) -> None:
+    """Write the [tools.<name>] tables for the most used tools"""
+    out.write("# Top Tools Analysis\n")
+    out.write("# Shows where each tool is most frequently used\n\n")
+
+    for tool, total in _ranked(tools.totals, limit):
+        out.write(f"[tools.{toml_key(tool)}]\n")
+        out.write(f"total_uses = {total}\n")
+        out.write(f"category = {toml_string(tool_category(tool))}\n")
+        out.write("directories = [\n")
+        for directory, uses in _ranked(tools.by_tool[tool], DIRECTORIES_PER_TOOL):
+            out.write(
+                f"    {{ path = {toml_string(directory)}, uses = {uses}, "
+                f"percentage = {uses * 100 // total} }},\n"
+            )
+        out.write("]\n\n")
+
+
+def _write_navigation(out: TextIO, sessions: SessionStore) -> None:
+    """Write the most common transitions between exported directories"""
+    out.write("# Navigation Patterns\n\n")
+
+    transitions: Counter[str] = Counter()
+    for (from_index, to_index), count in transition_counts(sessions).items():
+        transitions[f"{sessions.paths[from_index]} → {sessions.paths[to_index]}"] = count
+
+    for pattern, count in _ranked(transitions, NAVIGATION_PATTERNS):
+        from_dir, to_dir = pattern.split(" → ", 1)
+        out.write("[[navigation_patterns]]\n")
+        out.write(f"from = {toml_string(from_dir)}\n")
+        out.write(f"to = {toml_string(to_dir)}\n")
+        out.write(f"count = {count}\n\n")
+
+
+def summarize_rows(rows: list[DirectoryRow]) -> ExportSummary:
+    """Total the exported directory rows"""
+    return ExportSummary(
+        directories=len(rows),
+        visits=sum(row.visits for row in rows),
+        time_seconds=sum(row.time_seconds for row in rows),
+        commits=sum(row.git_commits for row in rows),
+    )
+
+
+def export_metadata(options: ExportOptions) -> dict[str, str | int]:
+    """Metadata describing an export, in report order"""
+    return {
+        "exported_at": datetime.now(timezone.utc).astimezone().isoformat(timespec="seconds"),
+        "hostname": socket.gethostname(),
+        "user": os.environ.get("USER", ""),
+        "filter": options.filter_pattern or "all",
+        "tracking_period": "today + yesterday",
+        "sort_method": options.sort_method,
+        "directories_shown": options.show_count,
+    }
+
+
+def write_toml(
+    out: TextIO, rows: list[DirectoryRow], options: ExportOptions, sources: ExportSources
+) -> ExportSummary:
+    """Write the export report as TOML, section by section
+
+    Args:
+        out: Destination stream
+        rows: Directories to export, in display order
+        options: Export settings
+        sources: Data file locations
+
+    Returns:
+        Totals for the exported directories
+    """
+    directories = [row.path for row in rows]
+    summary = summarize_rows(rows)
+
+    out.write("[metadata]\n")
+    for key, value in export_metadata(options).items():
+        out.write(f"{key} = {toml_string(value) if isinstance(value, str) else value}\n")
+    out.write("\n")
+
+    out.write("[summary]\n")
+    out.write(f"total_directories = {summary.directories}\n")
+    out.write(f"total_visits = {summary.visits}\n")
+    out.write(f"total_time_seconds = {summary.time_seconds}\n")
+    out.write(f"total_time_formatted = {toml_string(format_time(summary.time_seconds))}\n")
+    out.write(f"total_commits = {summary.commits}\n\n")
+
+    dictionary = load_dictionary(sources.dictionary)
+    sessions = scan_sessions(sources.sessions, set(directories), dictionary)
+    if sessions is not None:
+        out.write("[time_patterns]\n")
+        if len(sessions):
+            hours = hour_histogram(sessions)
+            peak_hour = max(range(24), key=lambda hour: (hours[hour], hour))
+            out.write(f"peak_hour = {peak_hour}\n")
+            average = sessions.total_duration() // len(sessions)
+            out.write(f"average_session_minutes = {average // 60}\n")
+        out.write("\n")
+
+    tools = scan_tools(sources, directories, dictionary) if options.track_tools else None
+    git = (
+        scan_git(sources.git, [row.path for row in rows if row.git_commits > 0], dictionary)
+        if options.track_git
+        else {}
+    )
+
+    for row in rows:
+        _write_directory(out, row, options, tools, git)
+
+    if tools is not None and tools.totals:
+        _write_top_tools(out, tools, options.show_count)
+
+    if sessions is not None:
+        _write_navigation(out, sessions)
+
+    return summary
+
+
+def _session_records(
+    lines: Iterable[str],
+    directories: set[str],
+    dictionary: DirectoryDictionary,
+    exported: Callable[[str], bool] | None = None,
+) -> Iterator[dict[str, object]]:
+    """Turn dir|start|end|duration lines into session rows
+
+    Args:
+        lines: Session lines
+        directories: Directories being exported
+        dictionary: Directory dictionary to decode directory IDs with
+        exported: Tells the lines that went out with the previous export
+
+    Returns:
+        Iterator of session rows
+    """
+    for line in lines:
+        fields = line.rstrip("\n").split("|")
+        if len(fields) < 4:
+            continue
+        directory = dictionary.path_of(fields[0])
+        if directory not in directories:
+            continue
+        if exported is not None and exported(line.rstrip("\n")):
+            continue
+        end = _to_int(fields[2])
+        yield {
+            "record": "session",
+            "directory": directory,
+            "start": _to_int(fields[1]),
+            "end": end,
+            "duration": _to_int(fields[3]),
+        }
+
+
+def _iter_session_records(
+    path: str, directories: set[str], dictionary: DirectoryDictionary
+) -> Iterator[dict[str, object]]:
+    """Stream session rows for the exported directories, archived ones first"""
+    lines = (line.decode("utf-8", "replace") for line in iter_session_lines(path))
+    yield from _session_records(lines, directories, dictionary)
+
+
+def _commit_record(directory: str, fields: list[str]) -> dict[str, object]:
+    """Build a commit row from the hash, timestamp and message fields"""
+    return {
+        "record": "commit",
+        "directory": directory,
+        "hash": fields[1],
+        "timestamp": _to_int(fields[2]),
+        "category": categorize_commit_like_shell(fields[3]),
+        "message": fields[3],
+    }
+
+
+def _iter_commit_records(
+    path: str, directories: list[str], dictionary: DirectoryDictionary
+) -> Iterator[dict[str, object]]:
+    """Stream commit rows, reading the directories' records via the log index"""
+    for directory, records in read_records_by_directory(path, directories, dictionary).items():
+        for record in records:
+            fields = record.split("|", 3)
+            if len(fields) == 4:
+                yield _commit_record(directory, fields)
+
+
+def _directory_record(row: DirectoryRow) -> dict[str, object]:
+    """Build a directory row from merged data"""
+    return {
+        "record": "directory",
+        "directory": row.path,
+        "visits": row.visits,
+        "time_seconds": row.time_seconds,
+        "last_visited": row.period,
+        "git_commits": row.git_commits,
+    }
+
+
+def _tool_record(usage: ToolUsage, uses: int) -> dict[str, object]:
+    """Build a tool_use row for one usage bucket"""
+    return {
+        "record": "tool_use",
+        "directory": usage.directory,
+        "tool": usage.tool,
+        "tool_type": usage.tool_type,
+        "alias": usage.alias,
+        "day": usage.day,
+        "uses": uses,
+    }
+
+
+def iter_export_records(
+    rows: list[DirectoryRow], options: ExportOptions, sources: ExportSources
+) -> Iterator[dict[str, object]]:
+    """Stream export rows: directories, then sessions, tool uses and commits
+
+    Nothing beyond the directory list is held in memory; each source is
+    read once and its rows are yielded as they are parsed.
+
+    Args:
+        rows: Directories to export, in display order
+        options: Export settings
+        sources: Data file locations
+
+    Returns:
+        Iterator of flat row dicts, each tagged with its "record" kind
+    """
+    directories = [row.path for row in rows]
+    wanted = set(directories)
+    dictionary = load_dictionary(sources.dictionary)
+
+    for row in rows:
+        yield _directory_record(row)
+
+    if options.track_time:
+        yield from _iter_session_records(sources.sessions, wanted, dictionary)
+
+    if options.track_tools:
+        usages = iter_tool_usage(sources.tools, sources.tool_counts, directories, dictionary)
+        for usage in usages:
+            if usage.directory in wanted:
+                yield _tool_record(usage, usage.uses)
+
+    if options.track_git:
+        yield from _iter_commit_records(sources.git, directories, dictionary)
+
+
+def capture_export_cursor(sources: ExportSources, started_at: int) -> ExportCursor:
+    """Record where the logs and every session archive partition end
+
+    The archive lock is held while capturing, so no partition is caught
+    halfway through being filed or compressed. Gzip partitions only ever
+    grow by whole members, so their raw size is their position.
+
+    Args:
+        sources: Data file locations
+        started_at: Unix time the export started
+
+    Returns:
+        ExportCursor for the next delta export
+    """
+    with Path(sources.sessions + ".lock").open("a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_SH)
+        partitions = list_partitions(sources.sessions)
+        plain = [partition.path for partition in partitions if not partition.compressed]
+        cursor = capture_cursor([sources.sessions, sources.git, *plain], started_at)
+        for partition in partitions:
+            position = file_cursor(partition.path) if partition.compressed else None
+            if position is not None:
+                cursor.sources[partition.path] = position
+
+    record_boundary(cursor, sources.sessions)
+    record_boundary(cursor, sources.git)
+    return cursor
+
+
+def record_tool_buckets(sources: ExportSources, until: ExportCursor) -> None:
+    """Store the current tool usage totals for the cursor's day"""
+    dictionary = load_dictionary(sources.dictionary)
+    for usage in iter_tool_usage(sources.tools, sources.tool_counts, dictionary=dictionary):
+        if usage.day == until.tool_day:
+            key = bucket_key(usage)
+            until.tool_buckets[key] = until.tool_buckets.get(key, 0) + usage.uses
+
+
+def _iter_tool_deltas(
+    sources: ExportSources,
+    wanted: set[str],
+    dictionary: DirectoryDictionary,
+    since: ExportCursor,
+    until: ExportCursor,
+) -> Iterator[dict[str, object]]:
+    """Tool usage added since the last export, per usage bucket
+
+    Buckets from the previous export's day onwards are totalled, the
+    totals stored in the previous cursor are subtracted, and today's totals
+    are recorded in the new cursor.
+    """
+    totals: dict[str, tuple[ToolUsage, int]] = {}
+    for usage in iter_tool_usage(sources.tools, sources.tool_counts, dictionary=dictionary):
+        if not is_since(usage.day, since.tool_day):
+            continue
+        key = bucket_key(usage)
+        first, uses = totals.get(key, (usage, 0))
+        totals[key] = (first, uses + usage.uses)
+
+    for key, (usage, uses) in totals.items():
+        if usage.day == until.tool_day:
+            until.tool_buckets[key] = uses
+        already_exported = since.tool_buckets.get(key, 0) if usage.day == since.tool_day else 0
+        if usage.directory in wanted and uses > already_exported:
+            yield _tool_record(usage, uses - already_exported)
+
+
+def _appended_gzip_lines(path: str, since: ExportCursor, until: ExportCursor) -> Iterator[str]:
+    """Lines added to a gzip partition between two cursors
+
+    A partition that was already compressed only gained whole gzip members,
+    read from its previous end. One compressed since the previous export is
+    decompressed past the bytes it held as a plain file.
+    """
+    end = until.sources.get(path)
+    if end is None:
+        return
+    previous = since.sources.get(path)
+    resumed = resumes(path, previous, end)
+    start = previous.offset if resumed and previous is not None else 0
+    plain = since.sources.get(path.removesuffix(GZIP_SUFFIX))
+    skip = plain.offset if plain is not None and not resumed else 0
+
+    try:
+        with Path(path).open("rb") as raw:
+            raw.seek(start)
+            added = raw.read(end.offset - start)
+        with gzip.GzipFile(fileobj=io.BytesIO(added)) as f:
+            for line in f:
+                if skip > 0:
+                    skip -= len(line)
+                    continue
+                yield line.decode("utf-8", "replace")
+    except (OSError, EOFError):
+        return
+
+
+def _iter_archived_lines(sessions: str, since: ExportCursor, until: ExportCursor) -> Iterator[str]:
+    """Session lines filed into the archive between two cursors
+
+    Each partition is read from where the previous export left it, so a
+    delta export never rescans months it has already seen.
+    """
+    for partition in list_partitions(sessions):
+        if partition.compressed:
+            yield from _appended_gzip_lines(partition.path, since, until)
+        else:
+            lines, _restarted = read_appended(partition.path, since, until)
+            yield from lines
+
+
+def iter_delta_records(
+    rows: list[DirectoryRow],
+    options: ExportOptions,
+    sources: ExportSources,
+    since: ExportCursor,
+    until: ExportCursor,
+) -> Iterator[dict[str, object]]:
+    """Stream directory rows plus only the activity added since the last export
+
+    Sessions and commits are read from where the previous export stopped.
+    Logs that were rotated or reset are reread and filtered by time, and
+    sessions archived by the daily rotation are picked up from the archive.
+
+    Args:
+        rows: Directories to export, in display order
+        options: Export settings
+        sources: Data file locations
+        since: Cursor saved by the previous row export
+        until: Cursor captured when this export started, updated in place
+
+    Returns:
+        Iterator of flat row dicts, each tagged with its "record" kind
+    """
+    wanted = {row.path for row in rows}
+    dictionary = load_dictionary(sources.dictionary)
+
+    for row in rows:
+        yield _directory_record(row)
+
+    if options.track_time:
+        exported = partial(already_exported, since, sources.sessions)
+        lines, restarted = read_appended(sources.sessions, since, until)
+        yield from _session_records(lines, wanted, dictionary, exported if restarted else None)
+        # Rotation moves sessions into the archive whether or not they were exported
+        archived = _iter_archived_lines(sources.sessions, since, until)
+        yield from _session_records(archived, wanted, dictionary, exported)
+
+    if options.track_tools:
+        yield from _iter_tool_deltas(sources, wanted, dictionary, since, until)
+
+    if options.track_git:
+        lines, restarted = read_appended(sources.git, since, until)
+        for line in lines:
+            fields = line.split("|", 3)
+            if len(fields) != 4:
+                continue
+            directory = dictionary.path_of(fields[0])
+            if directory not in wanted:
+                continue
+            if restarted and already_exported(since, sources.git, line):
+                continue
+            yield _commit_record(directory, fields)
+
+
+def write_jsonl(
+    out: TextIO, records: Iterable[dict[str, object]], metadata: dict[str, object]
+) -> None:
+    """Write rows as JSON Lines, after a leading metadata record
+
+    Args:
+        out: Destination stream
+        records: Rows from iter_export_records() or iter_delta_records()
+        metadata: Export metadata
+    """
+    header: dict[str, object] = {"record": "metadata", "format_version": ROW_FORMAT_VERSION}
+    header.update(metadata)
+    out.write(json.dumps(header, ensure_ascii=False) + "\n")
+
+    for record in records:
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def write_csv(
+    out: TextIO,
+    records: Iterable[dict[str, object]],
+    metadata: dict[str, object],  # noqa: ARG001
+) -> None:
+    """Write rows as CSV with one shared header for every row kind
+
+    Args:
+        out: Destination stream, opened with newline=""
+        records: Rows from iter_export_records() or iter_delta_records()
+        metadata: Export metadata (CSV has nowhere to put it)
+    """
+    writer = csv.DictWriter(out, fieldnames=CSV_COLUMNS, restval="")
+    writer.writeheader()
+    writer.writerows(records)
+
+
+ROW_WRITERS: dict[str, Callable[[TextIO, Iterable[dict[str, object]], dict[str, object]], None]] = {
+    "jsonl": write_jsonl,
+    "csv": write_csv,
+}
+
+
+def write_export(
+    out: TextIO,
+    rows: list[DirectoryRow],
+    options: ExportOptions,
+    sources: ExportSources,
+    *,
+    export_format: str = "toml",
+    cursor: tuple[ExportCursor | None, ExportCursor] | None = None,
+) -> ExportSummary:
+    """Write an export in the requested format
+
+    Row formats can carry an export cursor pair (since, until). With a
+    previous cursor only activity added since then is written; either way
+    until is completed so it can be saved for the next delta export.
+
+    Args:
+        out: Destination stream (opened with newline="" for CSV)
+        rows: Directories to export, in display order
+        options: Export settings
+        sources: Data file locations
+        export_format: One of EXPORT_FORMATS
+        cursor: Optional (previous cursor or None, cursor captured at start)
+
+    Returns:
+        Totals for the exported directories
+    """
+    if export_format == "toml":
+        return write_toml(out, rows, options, sources)
+
+    metadata: dict[str, object] = dict(export_metadata(options))
+    since, until = cursor if cursor is not None else (None, None)
+    metadata["since"] = (
+        datetime.fromtimestamp(since.exported_at, timezone.utc)
+        .astimezone()
+        .isoformat(timespec="seconds")
+        if since is not None
+        else None
+    )
+
+    if since is not None and until is not None:
+        records = iter_delta_records(rows, options, sources, since, until)
+        ROW_WRITERS[export_format](out, records, metadata)
+    else:
+        ROW_WRITERS[export_format](out, iter_export_records(rows, options, sources), metadata)
+        if until is not None and options.track_tools:
+            record_tool_buckets(sources, until)
+
+    return summarize_rows(rows)
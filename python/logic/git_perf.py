@@ -0,0 +1,268 @@
+"""
+Git Performance
+Reads how long the git wrapper saw each subcommand take per repository and
+renders `wfreq --git-perf`: where `git status` is slow, how big those
+repositories are and which git settings would speed them up
+"""
+
+import sys
+from collections.abc import Iterable
+from pathlib import Path
+from typing import NamedTuple
+
+from python.logic.command_runtimes import (
+    MIN_RUNS,
+    RuntimeHistogram,
+    RuntimeRecord,
+    format_ms,
+    iter_runtimes,
+)
+from python.logic.dir_dictionary import load_dictionary
+
+RESET = "\033[0m"
+DIM = "\033[90m"
+
+# `git status` this slow at p50 is noticeable at every prompt that runs it
+SLOW_STATUS_MS = 200
+
+# Tracked files above which fsmonitor pays off
+LARGE_REPO_FILES = 10_000
+
+TOP_REPOS = 10
+SUBCOMMANDS_PER_REPO = 5
+
+
+class RepoHints(NamedTuple):
+    """Size and settings of a repository that bear on `git status` speed
+
+    Attributes:
+        tracked_files: Entries in the index, None when it cannot be read
+        index_bytes: Size of the index file
+        pack_bytes: Size of the object packs
+        fsmonitor: core.fsmonitor setting, empty when unset
+        untracked_cache: core.untrackedCache setting, empty when unset
+        many_files: feature.manyFiles setting, empty when unset
+    """
+
+    tracked_files: int | None
+    index_bytes: int
+    pack_bytes: int
+    fsmonitor: str
+    untracked_cache: str
+    many_files: str
+
+
+def git_dir(repo: Path) -> Path | None:
+    """The .git directory of a repository, following worktree gitdir files"""
+    dot_git = repo / ".git"
+    if dot_git.is_dir():
+        return dot_git
+    try:
+        first_line = dot_git.read_text(encoding="utf-8").splitlines()[0]
+    except (OSError, IndexError):
+        return None
+    if not first_line.startswith("gitdir:"):
+        return None
+    return (repo / first_line[len("gitdir:") :].strip()).resolve()
+
+
+def index_entries(index: Path) -> int | None:
+    """Number of entries from an index file's header"""
+    try:
+        with index.open("rb") as f:
+            header = f.read(12)
+    except OSError:
+        return None
+    if len(header) < 12 or header[:4] != b"DIRC":
+        return None
+    return int.from_bytes(header[8:12], "big")
+
+
+def _file_size(path: Path) -> int:
+    """Size of a file, 0 when missing"""
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def read_config(path: Path, settings: dict[str, str]) -> None:
+    """Add section.key = value settings of a git config file to settings
+
+    Only plain `[section]` headers are understood; includes and
+    subsections are skipped, which is enough for core and feature keys.
+    """
+    try:
+        lines = path.read_text(encoding="utf-8", errors="replace").splitlines()
+    except OSError:
+        return
+    section = ""
+    for raw in lines:
+        line = raw.split("#", 1)[0].split(";", 1)[0].strip()
+        if line.startswith("[") and line.endswith("]"):
+            section = line[1:-1].strip().lower()
+        elif section and line:
+            key, _, value = line.partition("=")
+            # A bare key is a boolean set to true
+            settings[f"{section}.{key.strip().lower()}"] = value.strip() or "true"
+
+
+def repo_hints(repo: str) -> RepoHints:
+    """Collect size and settings of a repository without running git
+
+    Args:
+        repo: Repository root (a leading ~ is expanded)
+
+    Returns:
+        RepoHints; sizes are 0 and settings empty when unreadable
+    """
+    root = Path(repo).expanduser()
+    directory = git_dir(root)
+    settings: dict[str, str] = {}
+    home = Path.home()
+    read_config(home / ".gitconfig", settings)
+    read_config(home / ".config" / "git" / "config", settings)
+    if directory is None:
+        return RepoHints(None, 0, 0, "", "", "")
+
+    read_config(directory / "config", settings)
+    packs = directory / "objects" / "pack"
+    try:
+        pack_bytes = sum(_file_size(pack) for pack in packs.glob("*.pack"))
+    except OSError:
+        pack_bytes = 0
+    index = directory / "index"
+    return RepoHints(
+        index_entries(index),
+        _file_size(index),
+        pack_bytes,
+        settings.get("core.fsmonitor", ""),
+        settings.get("core.untrackedcache", ""),
+        settings.get("feature.manyfiles", ""),
+    )
+
+
+def _enabled(value: str) -> bool:
+    """Whether a git boolean (or fsmonitor hook path) setting is on"""
+    return value.lower() not in ("", "false", "no", "off", "0")
+
+
+def suggestions(hints: RepoHints) -> list[str]:
+    """git config commands likely to make `git status` faster"""
+    tips = []
+    large = hints.tracked_files is not None and hints.tracked_files >= LARGE_REPO_FILES
+    if large and not _enabled(hints.fsmonitor):
+        tips.append("git config core.fsmonitor true")
+    if not _enabled(hints.untracked_cache) and not _enabled(hints.many_files):
+        tips.append("git config core.untrackedCache true")
+    if large and not _enabled(hints.many_files):
+        tips.append("git config feature.manyFiles true")
+    return tips
+
+
+def format_bytes(size: int) -> str:
+    """Format a file size with a readable unit"""
+    if size < 1024:
+        return f"{size}B"
+    value = size / 1024
+    for unit in ("KB", "MB"):
+        if value < 1024:
+            return f"{value:.1f}{unit}"
+        value /= 1024
+    return f"{value:.1f}GB"
+
+
+def repo_timings(
+    records: Iterable[RuntimeRecord], dictionary_file: str | None = None
+) -> dict[str, dict[str, RuntimeHistogram]]:
+    """Merge timings over all days per repository and subcommand
+
+    Args:
+        records: Timings from the git wrapper's log and histograms
+        dictionary_file: Directory dictionary for decoding directory IDs
+
+    Returns:
+        Dict mapping repository path -> subcommand -> histogram
+    """
+    dictionary = load_dictionary(dictionary_file)
+    repos: dict[str, dict[str, RuntimeHistogram]] = {}
+    for record in records:
+        subcommands = repos.setdefault(dictionary.path_of(record.directory), {})
+        subcommands.setdefault(record.tool, RuntimeHistogram()).merge(record.histogram)
+    return repos
+
+
+def _hints_line(hints: RepoHints) -> str:
+    """One-line size summary of a repository"""
+    files = f"{hints.tracked_files:,} files" if hints.tracked_files is not None else "? files"
+    return (
+        f"{files} · index {format_bytes(hints.index_bytes)} · "
+        f"packs {format_bytes(hints.pack_bytes)}"
+    )
+
+
+def git_perf_report(repos: dict[str, dict[str, RuntimeHistogram]]) -> str:
+    """Render `wfreq --git-perf`
+
+    Returns:
+        Report text with ANSI colors, empty when no subcommand ran often enough
+    """
+    slow = []
+    for repo, subcommands in repos.items():
+        status = subcommands.get("status")
+        if status and status.runs >= MIN_RUNS and status.percentile(50) >= SLOW_STATUS_MS:
+            slow.append((status.percentile(95), repo, status))
+    slow.sort(key=lambda entry: (-entry[0], entry[1]))
+
+    ranked = []
+    for repo, subcommands in repos.items():
+        shown = [(name, hist) for name, hist in subcommands.items() if hist.runs >= MIN_RUNS]
+        if shown:
+            shown.sort(key=lambda item: (-item[1].percentile(95), item[0]))
+            ranked.append((shown[0][1].percentile(95), repo, shown))
+    if not ranked:
+        return ""
+    ranked.sort(key=lambda entry: (-entry[0], entry[1]))
+
+    lines = [f"\033[35m🐙 Git Performance:{RESET} {DIM}per repository, p50 / p95 / max{RESET}"]
+    if slow:
+        lines.append("")
+        lines.append(f"\033[91mSlow git status{RESET} {DIM}(p50 ≥ {SLOW_STATUS_MS}ms){RESET}")
+        for p95, repo, status in slow:
+            hints = repo_hints(repo)
+            lines.append(
+                f"  \033[96m{repo}{RESET}  {format_ms(status.percentile(50))} / "
+                f"\033[93m{format_ms(p95)}{RESET}  {DIM}{_hints_line(hints)}{RESET}"
+            )
+            lines.extend(f"    💡 {tip}" for tip in suggestions(hints))
+
+    for _, repo, shown in ranked[:TOP_REPOS]:
+        lines.append("")
+        lines.append(f"\033[96m{repo}{RESET}")
+        for name, histogram in shown[:SUBCOMMANDS_PER_REPO]:
+            lines.append(
+                f"  {name[:12]:<12} {DIM}{histogram.runs:>5} runs{RESET}  "
+                f"{format_ms(histogram.percentile(50)):>8} / "
+                f"\033[93m{format_ms(histogram.percentile(95)):>8}{RESET} / "
+                f"{format_ms(histogram.max_ms):>8}"
+            )
+    return "\n".join(lines)
+
+
+def git_perf_report_for_shell(
+    perf_file: str, histogram_file: str, dictionary_file: str | None = None
+) -> str:
+    """Build `wfreq --git-perf` from the git timing log and histograms"""
+    return git_perf_report(repo_timings(iter_runtimes(perf_file, histogram_file), dictionary_file))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python git_perf.py <perf_file> <histogram_file> [dictionary_file]")
+        sys.exit(1)
+
+    report = git_perf_report_for_shell(
+        sys.argv[1], sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None
+    )
+    if report:
+        print(report)
@@ -45,6 +45,50 @@ def categorize_commit(commit_message: str) -> str:
     return DEFAULT_CATEGORY
 
 
+# Categories the shell plugin reports on, in priority order
+SHELL_CATEGORIES = (
+    "revert",
+    "fix",
+    "feat",
+    "perf",
+    "refactor",
+    "test",
+    "build",
+    "ci",
+    "docs",
+    "style",
+    "chore",
+)
+
+
+def categorize_commit_like_shell(commit_message: str) -> str:
+    """
+    Categorize a commit the way the plugin's _freq_dirs_categorize_commit does.
+
+    Each matching keyword counts once, only SHELL_CATEGORIES are scored, and
+    the earlier category wins a tie, so exports agree with wfreq --insights.
+
+    Args:
+        commit_message: The commit message to categorize
+
+    Returns:
+        The category name with highest score, or 'other' if no match
+    """
+    msg_lower = commit_message.lower()
+    best_category = DEFAULT_CATEGORY
+    best_score = 0
+
+    for category in SHELL_CATEGORIES:
+        info = COMMIT_CATEGORIES[category]
+        keyword_count = sum(1 for keyword in info["keywords"] if keyword in msg_lower)
+        score = keyword_count * info["priority"]
+        if score > best_score:
+            best_score = score
+            best_category = category
+
+    return best_category
+
+
 def get_random_keyword_suggestions(
     num_suggestions: int = 3,
 ) -> list[tuple[str, str, str]]:
@@ -0,0 +1,213 @@
+"""
+Hook Profile
+Reads the FREQ_PROFILE=1 ring buffer and renders `wfreq --profile`: latency
+histograms per hook and the share of time and processes each step costs
+"""
+
+import sys
+from collections.abc import Iterable
+from pathlib import Path
+from typing import NamedTuple
+
+from python.logic.session_store import percentile_rank
+
+RESET = "\033[0m"
+DIM = "\033[90m"
+
+# Step name the shell records for a whole hook call
+TOTAL_STEP = "total"
+
+# Hooks listed first, in this order; everything else follows by name
+HOOK_ORDER = ("chpwd", "preexec", "git")
+
+# Histogram bucket upper bounds in microseconds, the last one open
+BUCKETS = (1_000, 2_000, 5_000, 10_000, 20_000, 50_000, 100_000, 200_000, 500_000, 1_000_000)
+
+BAR_WIDTH = 30
+
+
+class ProfileRecord(NamedTuple):
+    """One step of one profiled hook call
+
+    Attributes:
+        timestamp: Unix time the hook finished
+        hook: Hook name (chpwd, preexec, git, "wfreq --insights", ...)
+        step: Step within the hook, or "total" for the whole call
+        microseconds: Wall time of the step
+        processes: Processes started during the step, None when unknown
+    """
+
+    timestamp: int
+    hook: str
+    step: str
+    microseconds: int
+    processes: int | None
+
+
+class StepStats(NamedTuple):
+    """Aggregated timings of one step of a hook"""
+
+    step: str
+    calls: int
+    total_us: int
+    p50_us: int
+    p95_us: int
+    processes: float | None
+
+
+def parse_record(line: str) -> ProfileRecord | None:
+    """Parse a timestamp|hook|step|microseconds|processes line"""
+    fields = line.rstrip("\n").split("|")
+    if len(fields) != 5 or not fields[1] or not fields[2]:
+        return None
+    try:
+        timestamp, microseconds = int(fields[0]), int(fields[3])
+    except ValueError:
+        return None
+    processes = int(fields[4]) if fields[4].isdigit() else None
+    return ProfileRecord(timestamp, fields[1], fields[2], max(microseconds, 0), processes)
+
+
+def load_profile(path: str) -> list[ProfileRecord]:
+    """Read every record of a profile file, oldest first; empty when missing"""
+    try:
+        with Path(path).open(encoding="utf-8", errors="replace") as f:
+            return [record for record in map(parse_record, f) if record is not None]
+    except OSError:
+        return []
+
+
+def percentile(ordered: list[int], percent: int) -> int:
+    """Nearest-rank percentile of sorted values"""
+    return ordered[percentile_rank(len(ordered), percent)] if ordered else 0
+
+
+def histogram(values: Iterable[int]) -> list[int]:
+    """Count values per bucket of BUCKETS, plus one for everything slower"""
+    counts = [0] * (len(BUCKETS) + 1)
+    for value in values:
+        index = next((i for i, bound in enumerate(BUCKETS) if value < bound), len(BUCKETS))
+        counts[index] += 1
+    return counts
+
+
+def step_stats(records: list[ProfileRecord]) -> list[StepStats]:
+    """Per-step totals of one hook, most expensive first, "total" excluded"""
+    durations: dict[str, list[int]] = {}
+    processes: dict[str, list[int]] = {}
+    for record in records:
+        if record.step == TOTAL_STEP:
+            continue
+        durations.setdefault(record.step, []).append(record.microseconds)
+        if record.processes is not None:
+            processes.setdefault(record.step, []).append(record.processes)
+
+    stats = []
+    for step, values in durations.items():
+        ordered = sorted(values)
+        spawned = processes.get(step)
+        stats.append(
+            StepStats(
+                step,
+                len(ordered),
+                sum(ordered),
+                percentile(ordered, 50),
+                percentile(ordered, 95),
+                sum(spawned) / len(spawned) if spawned else None,
+            )
+        )
+    return sorted(stats, key=lambda stat: (-stat.total_us, stat.step))
+
+
+def format_us(microseconds: float) -> str:
+    """Format a latency with a readable unit"""
+    if microseconds >= 1_000_000:
+        return f"{microseconds / 1_000_000:.2f}s"
+    if microseconds >= 1000:
+        return f"{microseconds / 1000:.1f}ms"
+    return f"{microseconds:.0f}µs"
+
+
+def _bucket_label(index: int) -> str:
+    """Range label of histogram bucket index"""
+    if index == len(BUCKETS):
+        return f"≥ {format_us(BUCKETS[-1])}"
+    return f"< {format_us(BUCKETS[index])}"
+
+
+def hook_report(hook: str, records: list[ProfileRecord]) -> list[str]:
+    """Histogram and step breakdown of one hook"""
+    totals = sorted(record.microseconds for record in records if record.step == TOTAL_STEP)
+    if not totals:
+        return []
+
+    p50, p95 = format_us(percentile(totals, 50)), format_us(percentile(totals, 95))
+    lines = [
+        (
+            f"\033[96m{hook}{RESET}  {len(totals)} calls · p50 \033[93m{p50}{RESET} · "
+            f"p95 \033[93m{p95}{RESET} · max \033[91m{format_us(totals[-1])}{RESET}"
+        )
+    ]
+
+    counts = histogram(totals)
+    first = next(i for i, count in enumerate(counts) if count)
+    last = max(i for i, count in enumerate(counts) if count)
+    peak = max(counts)
+    for index in range(first, last + 1):
+        bar = "█" * max(round(counts[index] / peak * BAR_WIDTH), 1 if counts[index] else 0)
+        lines.append(f"  {_bucket_label(index):>9} {bar:<{BAR_WIDTH}} {DIM}{counts[index]}{RESET}")
+
+    steps = step_stats(records)
+    if steps:
+        spent = sum(totals) or 1
+        lines.append(f"  {DIM}{'step':<14} {'share':>6} {'p50':>8} {'p95':>8} {'procs':>6}{RESET}")
+        for stat in steps:
+            procs = f"{stat.processes:.1f}" if stat.processes is not None else "-"
+            lines.append(
+                f"  {stat.step:<14} {stat.total_us / spent:>6.0%} {format_us(stat.p50_us):>8} "
+                f"{format_us(stat.p95_us):>8} {procs:>6}"
+            )
+    return lines
+
+
+def profile_report(records: list[ProfileRecord]) -> str:
+    """Render `wfreq --profile` for a set of records
+
+    Returns:
+        Report text with ANSI colors, empty when there are no records
+    """
+    by_hook: dict[str, list[ProfileRecord]] = {}
+    for record in records:
+        by_hook.setdefault(record.hook, []).append(record)
+    if not by_hook:
+        return ""
+
+    order = [hook for hook in HOOK_ORDER if hook in by_hook]
+    order += sorted(hook for hook in by_hook if hook not in HOOK_ORDER)
+
+    calls = sum(1 for record in records if record.step == TOTAL_STEP)
+    lines = [f"\033[35m⏱️  Hook Profile:{RESET} {DIM}{calls} calls recorded{RESET}"]
+    for hook in order:
+        section = hook_report(hook, by_hook[hook])
+        if section:
+            lines.append("")
+            lines.extend(section)
+    if any(record.processes is not None for record in records):
+        lines.append("")
+        lines.append(f"{DIM}procs: processes started per call, machine-wide (approximate){RESET}")
+    return "\n".join(lines)
+
+
+def profile_report_for_shell(profile_file: str) -> str:
+    """Build `wfreq --profile` from the profile ring buffer"""
+    return profile_report(load_profile(profile_file))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python hook_profile.py <profile_file>")
+        sys.exit(1)
+
+    report = profile_report_for_shell(sys.argv[1])
+    if report:
+        print(report)
@@ -0,0 +1,226 @@
+"""
+Per-Directory Log Index
+Sidecar index mapping each directory to the byte offsets of its records in
+an append-only dir|... log, so per-directory queries skip everyone else's
+"""
+
+import os
+import sys
+import zlib
+from collections.abc import Collection, Iterable
+from pathlib import Path
+
+from python.logic.dir_dictionary import DirectoryDictionary, load_dictionary
+
+INDEX_SUFFIX = ".idx"
+INDEX_MAGIC = "#pathwise-log-index 1"
+
+# Bytes hashed from the start of the log to notice it was truncated and refilled
+HEAD_BYTES = 256
+
+# Once the wanted records are this share of the log, one pass beats seeking
+STREAM_SHARE = 0.5
+
+
+class LogIndex:
+    """Offsets of each directory's records in one log file"""
+
+    __slots__ = ("head", "identity", "offsets", "records", "size")
+
+    def __init__(self, identity: str = "", head: str = "", size: int = 0) -> None:
+        self.identity = identity
+        self.head = head
+        self.size = size
+        self.records = 0
+        self.offsets: dict[str, list[int]] = {}
+
+    def covers(self, identity: str, head: str, size: int) -> bool:
+        """Check whether this index describes a prefix of the current log"""
+        return self.identity == identity and self.head == head and self.size <= size
+
+
+def index_path(log_path: str) -> str:
+    """Sidecar index path for a log file"""
+    return log_path + INDEX_SUFFIX
+
+
+def log_head(log_path: str, size: int) -> str:
+    """Checksum of the first bytes of the log"""
+    with Path(log_path).open("rb") as f:
+        return f"{zlib.crc32(f.read(min(size, HEAD_BYTES))):08x}"
+
+
+def load_index(log_path: str, keys: Collection[str] | None = None) -> LogIndex:
+    """Load the sidecar index for a log, or an empty index if there is none
+
+    Args:
+        log_path: Path to the indexed log
+        keys: Only parse the offsets of these directory keys (all when None)
+
+    Returns:
+        LogIndex as last written, empty when missing or unreadable
+    """
+    try:
+        with Path(index_path(log_path)).open(encoding="utf-8", errors="surrogateescape") as f:
+            header = f.readline().rstrip("\n").split("|")
+            if len(header) != 4 or header[0] != INDEX_MAGIC:
+                return LogIndex()
+            index = LogIndex(header[1], header[2], int(header[3]))
+            for line in f:
+                directory, _, offsets = line.rstrip("\n").rpartition("|")
+                index.records += offsets.count(" ") + 1
+                if keys is None or directory in keys:
+                    index.offsets[directory] = [int(offset) for offset in offsets.split()]
+    except (OSError, ValueError):
+        return LogIndex()
+    return index
+
+
+def save_index(log_path: str, index: LogIndex) -> None:
+    """Atomically write the sidecar index for a log"""
+    path = index_path(log_path)
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    try:
+        with Path(tmp_path).open("w", encoding="utf-8", errors="surrogateescape") as f:
+            f.write(f"{INDEX_MAGIC}|{index.identity}|{index.head}|{index.size}\n")
+            for directory, offsets in index.offsets.items():
+                f.write(f"{directory}|{' '.join(map(str, offsets))}\n")
+        Path(tmp_path).replace(path)
+    except OSError:
+        Path(tmp_path).unlink(missing_ok=True)
+
+
+def update_index(log_path: str, keys: Collection[str] | None = None) -> LogIndex:
+    """Bring the index up to date with the log, scanning only new records
+
+    A log that was replaced, truncated or rewritten is reindexed from the
+    start. A trailing record still being written is left for the next call.
+
+    Args:
+        log_path: Path to the indexed log
+        keys: Directory keys the caller needs; while the index is current,
+            only their offsets are parsed (all when None)
+
+    Returns:
+        LogIndex covering every complete record in the log
+    """
+    try:
+        stat = Path(log_path).stat()
+    except OSError:
+        return LogIndex()
+
+    identity = f"{stat.st_dev}:{stat.st_ino}"
+    head = log_head(log_path, stat.st_size)
+    index = load_index(log_path, keys)
+    if not index.covers(identity, head, stat.st_size):
+        index = LogIndex(identity, head)
+    if index.size == stat.st_size:
+        return index
+    if keys is not None and index.size:
+        # New records to index: the rewritten sidecar needs every directory
+        index = load_index(log_path)
+
+    offset = index.size
+    with Path(log_path).open("rb") as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            directory = line.split(b"|", 1)[0].decode("utf-8", "surrogateescape")
+            index.offsets.setdefault(directory, []).append(offset)
+            index.records += 1
+            offset += len(line)
+
+    index.size = offset
+    save_index(log_path, index)
+    return index
+
+
+def _stream_records(log_path: str, owners: dict[str, str], records: dict[str, list[str]]) -> None:
+    """Collect the wanted records in one pass over the whole log"""
+    try:
+        with Path(log_path).open("rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                key = line.split(b"|", 1)[0].decode("utf-8", "surrogateescape")
+                directory = owners.get(key)
+                if directory is not None:
+                    records[directory].append(line.rstrip(b"\n").decode("utf-8", "replace"))
+    except OSError:
+        return
+
+
+def _seek_records(log_path: str, owners: dict[str, str], records: dict[str, list[str]]) -> None:
+    """Collect the wanted records by seeking to their indexed offsets"""
+    index = update_index(log_path, owners.keys())
+    wanted = sorted(
+        (offset, directory)
+        for key, directory in owners.items()
+        for offset in index.offsets.get(key, [])
+    )
+    if not wanted:
+        return
+    if len(wanted) >= index.records * STREAM_SHARE:
+        _stream_records(log_path, owners, records)
+        return
+
+    with Path(log_path).open("rb") as f:
+        for offset, directory in wanted:
+            f.seek(offset)
+            records[directory].append(f.readline().rstrip(b"\n").decode("utf-8", "replace"))
+
+
+def read_records_by_directory(
+    log_path: str, directories: Iterable[str], dictionary: DirectoryDictionary | None = None
+) -> dict[str, list[str]]:
+    """Read the records of several directories from an indexed log
+
+    The index is loaded and brought up to date once for all directories.
+    When they own most of the log (STREAM_SHARE), seeking record by record
+    costs more than reading the log once, so it is streamed instead.
+
+    Args:
+        log_path: Path to the log (dir|... records, one per line)
+        directories: Directories whose records to read, in ~ form
+        dictionary: Directory dictionary, to also find records logged by ID
+
+    Returns:
+        Dict mapping each requested directory -> its records in log order,
+        without trailing newlines
+    """
+    records: dict[str, list[str]] = {directory: [] for directory in directories}
+    owners: dict[str, str] = {}
+    for directory in records:
+        keys = dictionary.keys_for(directory) if dictionary is not None else [directory]
+        for key in keys:
+            owners.setdefault(key, directory)
+
+    if records:
+        _seek_records(log_path, owners, records)
+    return records
+
+
+def read_directory_records(
+    log_path: str, directory: str, dictionary: DirectoryDictionary | None = None
+) -> list[str]:
+    """Read one directory's records from an indexed log
+
+    Args:
+        log_path: Path to the log (dir|... records, one per line)
+        directory: Directory whose records to read, in ~ form
+        dictionary: Directory dictionary, to also find records logged by ID
+
+    Returns:
+        The directory's records in log order, without trailing newlines
+    """
+    return read_records_by_directory(log_path, [directory], dictionary)[directory]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python log_index.py <log_file> <directory>")
+        sys.exit(1)
+
+    for record in read_directory_records(sys.argv[1], sys.argv[2], load_dictionary()):
+        print(record)
@@ -21,6 +21,7 @@ from python.constants.project_indicators import (
     is_blacklisted,
     suggests_parent_check,
 )
+from python.logic.trace_events import span
 
 # Cache file for project roots (JSON format)
 CACHE_FILE = os.path.expanduser("~/.frequent_dirs.project_cache")
@@ -40,7 +41,7 @@ def load_cache() -> Dict[str, Tuple[str, str, float]]:
         return {}
 
     try:
-        with open(CACHE_FILE, "r") as f:
+        with span("io", "load_cache", CACHE_FILE), open(CACHE_FILE, "r") as f:
             cache_data = json.load(f)
             # Convert lists back to tuples
             return {k: tuple(v) for k, v in cache_data.items()}
@@ -53,7 +54,7 @@ def save_cache(cache: Dict[str, Tuple[str, str, float]]) -> None:
     try:
         # Convert tuples to lists for JSON serialization
         cache_data = {k: list(v) for k, v in cache.items()}
-        with open(CACHE_FILE, "w") as f:
+        with span("io", "save_cache", CACHE_FILE), open(CACHE_FILE, "w") as f:
             json.dump(cache_data, f)
     except IOError:
         pass  # Fail silently if we can't write cache
@@ -75,7 +76,8 @@ def check_indicators(
         return None
 
     try:
-        dir_contents = os.listdir(directory)
+        with span("io", "listdir", directory):
+            dir_contents = os.listdir(directory)
     except (PermissionError, OSError):
         return None
 
@@ -271,7 +273,8 @@ def get_project_info_for_shell(directory: str) -> str:
     Returns:
         String in format: "project_root|project_type|subdir_count"
     """
-    root, project_type, subdirs = find_project_root(directory)
+    with span("detect", "find_project_root", directory):
+        root, project_type, subdirs = find_project_root(directory)
     subdir_count = len(subdirs)
 
     # Convert home directory to ~ for consistency
@@ -0,0 +1,159 @@
+"""
+Session Analytics
+Histograms, per-directory totals, percentiles and rankings over a session
+store, vectorized with NumPy when it is installed and the store is large
+"""
+
+import os
+import sys
+from collections import Counter
+from collections.abc import Sequence
+from functools import lru_cache
+from types import ModuleType
+from typing import TYPE_CHECKING
+
+from python.logic.dir_dictionary import load_dictionary
+from python.logic.session_store import (
+    LOCAL_TIME_SLOT,
+    SessionStore,
+    load_session_store,
+    local_time,
+    percentile_rank,
+)
+
+if TYPE_CHECKING:
+    import numpy
+    from numpy.typing import NDArray
+
+# Below this many sessions importing NumPy costs more than it saves
+NUMPY_MIN_SESSIONS = 20_000
+
+# Set to any value to always use the pure-Python loops
+DISABLE_NUMPY_ENV = "PATHWISE_NO_NUMPY"
+
+
+@lru_cache(maxsize=1)
+def _import_numpy() -> ModuleType | None:
+    """Import NumPy on first use, None when it is not installed"""
+    try:
+        import numpy  # noqa: PLC0415
+    except ImportError:
+        return None
+    return numpy
+
+
+def numpy_backend(size: int) -> ModuleType | None:
+    """The numpy module when it should be used for size values, else None"""
+    if size < NUMPY_MIN_SESSIONS or os.environ.get(DISABLE_NUMPY_ENV):
+        return None
+    return _import_numpy()
+
+
+def _local_slot_values(np: ModuleType, store: SessionStore, field: str) -> "NDArray[numpy.int64]":
+    """Array of a local time field for every session start"""
+    starts = np.frombuffer(store.starts, dtype=np.int64)
+    slots, inverse = np.unique(starts // LOCAL_TIME_SLOT, return_inverse=True)
+    values = np.fromiter(
+        (getattr(local_time(int(slot) * LOCAL_TIME_SLOT), field) for slot in slots),
+        dtype=np.int64,
+        count=len(slots),
+    )
+    per_session: NDArray[numpy.int64] = values[inverse]
+    return per_session
+
+
+def hour_histogram(store: SessionStore) -> list[int]:
+    """Sessions started in each local hour of the day, 0-23"""
+    np = numpy_backend(len(store))
+    if np is None:
+        return store.hour_histogram()
+    counts = np.bincount(_local_slot_values(np, store, "tm_hour"), minlength=24)
+    return [int(count) for count in counts]
+
+
+def weekday_histogram(store: SessionStore) -> list[int]:
+    """Sessions started on each local weekday, Monday first"""
+    np = numpy_backend(len(store))
+    if np is None:
+        return store.weekday_histogram()
+    counts = np.bincount(_local_slot_values(np, store, "tm_wday"), minlength=7)
+    return [int(count) for count in counts]
+
+
+def directory_totals(store: SessionStore) -> tuple[list[int], list[int]]:
+    """Sessions and seconds per directory index, indexed like store.paths"""
+    np = numpy_backend(len(store))
+    if np is None:
+        return store.directory_totals()
+    directories = np.frombuffer(store.directories, dtype=np.uint32)
+    visits = np.bincount(directories, minlength=len(store.paths))
+    seconds = np.zeros(len(store.paths), dtype=np.int64)
+    np.add.at(seconds, directories, np.frombuffer(store.durations, dtype=np.uint32))
+    return visits.tolist(), seconds.tolist()
+
+
+def duration_percentiles(store: SessionStore, percents: Sequence[int]) -> list[int]:
+    """Nearest-rank percentiles of session duration, 0 when empty"""
+    np = numpy_backend(len(store))
+    if np is None:
+        return store.duration_percentiles(percents)
+    ranks = [percentile_rank(len(store), percent) for percent in percents]
+    durations = np.frombuffer(store.durations, dtype=np.uint32)
+    partitioned = np.partition(durations, sorted(set(ranks)))
+    return [int(partitioned[rank]) for rank in ranks]
+
+
+def transition_counts(store: SessionStore) -> Counter[tuple[int, int]]:
+    """Moves between different directories, as (from, to) index pairs"""
+    np = numpy_backend(len(store))
+    if np is None:
+        return store.transitions()
+
+    # Same order as the pure-Python pass: by start, ties by directory path
+    path_count = len(store.paths)
+    path_ranks = np.empty(path_count, dtype=np.int64)
+    path_ranks[sorted(range(path_count), key=store.paths.__getitem__)] = np.arange(path_count)
+    directories = np.frombuffer(store.directories, dtype=np.uint32).astype(np.int64)
+    order = np.lexsort((path_ranks[directories], np.frombuffer(store.starts, dtype=np.int64)))
+
+    visited = directories[order]
+    previous, current = visited[:-1], visited[1:]
+    moved = previous != current
+    pairs, counts = np.unique(previous[moved] * path_count + current[moved], return_counts=True)
+    return Counter(
+        {
+            divmod(int(pair), path_count): int(count)
+            for pair, count in zip(pairs, counts, strict=True)
+        }
+    )
+
+
+def top_indexes(values: Sequence[int], limit: int) -> list[int]:
+    """Indexes of the largest values, ties going to the lower index"""
+    np = numpy_backend(len(values))
+    if np is None:
+        return sorted(range(len(values)), key=lambda index: (-values[index], index))[:limit]
+    if limit <= 0:
+        return []
+
+    scores = np.asarray(values, dtype=np.int64)
+    candidates = np.arange(len(scores))
+    if limit < len(scores):
+        # Everything tied with the limit-th largest value stays a candidate
+        threshold = scores[np.argpartition(-scores, limit - 1)[limit - 1]]
+        candidates = np.flatnonzero(scores >= threshold)
+    order = np.lexsort((candidates, -scores[candidates]))
+    return [int(index) for index in candidates[order][:limit]]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python session_analytics.py <sessions_file> [dictionary]")
+        sys.exit(1)
+
+    sessions = load_session_store(
+        sys.argv[1], load_dictionary(sys.argv[2] if len(sys.argv) > 2 else None)
+    )
+    print(f"backend: {'numpy' if numpy_backend(len(sessions)) is not None else 'python'}")
+    for hour, count in enumerate(hour_histogram(sessions)):
+        print(f"{hour:02d}|{count}")
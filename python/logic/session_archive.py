@@ -0,0 +1,314 @@
+"""
+Session Archive Partitions
+Daily rotation files sessions into one archive per month, gzips months once
+they are over, and trims the oldest months to a retention and size budget
+"""
+
+import fcntl
+import gzip
+import os
+import shutil
+import sys
+import time
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import NamedTuple
+
+# Single archive file written before partitioning, migrated on the next rotation
+LEGACY_ARCHIVE_SUFFIX = ".archive"
+
+DEFAULT_RETENTION_MONTHS = 24
+DEFAULT_MAX_MB = 50
+
+GZIP_SUFFIX = ".gz"
+
+# Copy buffer for appending and compressing partitions
+COPY_BUFFER = 1 << 20
+
+
+class Partition(NamedTuple):
+    """One month of archived sessions
+
+    Attributes:
+        month: YYYY-MM of the session starts it holds ("" for the legacy archive)
+        path: File path
+        compressed: Whether the file is gzip-compressed
+    """
+
+    month: str
+    path: str
+    compressed: bool
+
+
+def month_of(timestamp: int) -> str:
+    """Local YYYY-MM of a unix timestamp"""
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m")  # noqa: DTZ006
+
+
+def months_before(month: str, count: int) -> str:
+    """The YYYY-MM count months before month"""
+    year, number = (int(part) for part in month.split("-"))
+    index = year * 12 + number - 1 - count
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def partition_path(sessions_file: str, month: str, *, compressed: bool = False) -> str:
+    """Archive file for one month"""
+    return f"{sessions_file}.{month}{GZIP_SUFFIX if compressed else ''}"
+
+
+def _is_month(text: str) -> bool:
+    """Whether text looks like YYYY-MM"""
+    return len(text) == 7 and text[4] == "-" and text[:4].isdigit() and text[5:].isdigit()
+
+
+def list_partitions(sessions_file: str) -> list[Partition]:
+    """Archive files for a sessions file, oldest month first
+
+    Args:
+        sessions_file: Path to the live sessions file
+
+    Returns:
+        Partitions sorted by month, the legacy archive (if any) first
+    """
+    base = Path(sessions_file)
+    partitions: list[Partition] = []
+
+    legacy = sessions_file + LEGACY_ARCHIVE_SUFFIX
+    if Path(legacy).is_file():
+        partitions.append(Partition("", legacy, compressed=False))
+
+    prefix = base.name + "."
+    try:
+        candidates = list(base.parent.iterdir())
+    except OSError:
+        return partitions
+    for candidate in candidates:
+        if not candidate.name.startswith(prefix):
+            continue
+        suffix = candidate.name[len(prefix) :]
+        compressed = suffix.endswith(GZIP_SUFFIX)
+        month = suffix[: -len(GZIP_SUFFIX)] if compressed else suffix
+        if _is_month(month):
+            partitions.append(Partition(month, str(candidate), compressed))
+
+    return sorted(partitions, key=lambda partition: (partition.month, partition.compressed))
+
+
+def iter_partition_lines(partition: Partition) -> Iterator[bytes]:
+    """Stream the raw lines of a partition, decompressing as it goes"""
+    try:
+        if partition.compressed:
+            with gzip.open(partition.path, "rb") as f:
+                yield from f
+        else:
+            with Path(partition.path).open("rb") as f:
+                yield from f
+    except (OSError, EOFError):
+        return
+
+
+def iter_session_lines(sessions_file: str) -> Iterator[bytes]:
+    """Stream every kept session: the partitions, oldest month first, then the live file
+
+    Daily maintenance files the live sessions away, so readers that cover
+    all kept history read the archive too.
+    """
+    for partition in list_partitions(sessions_file):
+        yield from iter_partition_lines(partition)
+    yield from iter_partition_lines(Partition("", sessions_file, compressed=False))
+
+
+def _month_of_line(line: bytes) -> str | None:
+    """Partition month of a dir|start|end|duration line"""
+    fields = line.split(b"|", 2)
+    if len(fields) < 3:
+        return None
+    try:
+        return month_of(int(fields[1]))
+    except (ValueError, OverflowError, OSError):
+        return None
+
+
+def _append_lines(sessions_file: str, month: str, lines: list[bytes]) -> None:
+    """Append lines to a month, as a new gzip member if it is already closed"""
+    compressed = partition_path(sessions_file, month, compressed=True)
+    if Path(compressed).exists():
+        with gzip.open(compressed, "ab") as out:
+            out.writelines(lines)
+    else:
+        with Path(partition_path(sessions_file, month)).open("ab") as out:
+            out.writelines(lines)
+
+
+def _file_lines(sessions_file: str, source: str) -> int:
+    """Split a flat session file into month partitions
+
+    Returns:
+        Number of sessions filed
+    """
+    pending: dict[str, list[bytes]] = {}
+    filed = 0
+    with Path(source).open("rb") as f:
+        for line in f:
+            month = _month_of_line(line)
+            if month is None:
+                continue
+            pending.setdefault(month, []).append(line if line.endswith(b"\n") else line + b"\n")
+            filed += 1
+            # Flush in batches so a large legacy archive is not held in memory
+            if len(pending[month]) >= 4096:
+                _append_lines(sessions_file, month, pending.pop(month))
+    for month, lines in pending.items():
+        _append_lines(sessions_file, month, lines)
+    return filed
+
+
+def archive_sessions(sessions_file: str) -> int:
+    """Move the live sessions file into its month partitions
+
+    The live file is renamed aside first, so sessions recorded while this
+    runs land in a fresh file. A leftover batch from an interrupted run is
+    filed on the next call, as is the legacy single-file archive.
+
+    Args:
+        sessions_file: Path to the live sessions file
+
+    Returns:
+        Number of sessions archived
+    """
+    pending = sessions_file + ".archiving"
+    filed = 0
+
+    if Path(sessions_file).is_file() and Path(sessions_file).stat().st_size > 0:
+        if Path(pending).exists():
+            batch = f"{sessions_file}.{os.getpid()}"
+            Path(sessions_file).replace(batch)
+            with Path(pending).open("ab") as out, Path(batch).open("rb") as raw:
+                shutil.copyfileobj(raw, out, COPY_BUFFER)
+            Path(batch).unlink()
+        else:
+            Path(sessions_file).replace(pending)
+
+    if Path(pending).exists():
+        filed += _file_lines(sessions_file, pending)
+        Path(pending).unlink()
+
+    legacy = sessions_file + LEGACY_ARCHIVE_SUFFIX
+    if Path(legacy).exists():
+        staged = f"{sessions_file}.legacy"
+        Path(legacy).replace(staged)
+        filed += _file_lines(sessions_file, staged)
+        Path(staged).unlink()
+        Path(legacy + ".tidx").unlink(missing_ok=True)
+
+    return filed
+
+
+def close_partitions(sessions_file: str, current_month: str) -> list[str]:
+    """Gzip every plain partition for a month that is over
+
+    Args:
+        sessions_file: Path to the live sessions file
+        current_month: YYYY-MM that stays uncompressed
+
+    Returns:
+        Months compressed
+    """
+    closed = []
+    for partition in list_partitions(sessions_file):
+        if partition.compressed or not partition.month or partition.month >= current_month:
+            continue
+        target = partition_path(sessions_file, partition.month, compressed=True)
+        tmp_path = f"{target}.tmp.{os.getpid()}"
+        with Path(partition.path).open("rb") as raw, gzip.open(tmp_path, "wb") as out:
+            shutil.copyfileobj(raw, out, COPY_BUFFER)
+        if Path(target).exists():
+            # Never overwrite a closed month; add this data as another gzip member
+            with Path(tmp_path).open("rb") as raw, Path(target).open("ab") as out:
+                shutil.copyfileobj(raw, out, COPY_BUFFER)
+            Path(tmp_path).unlink()
+        else:
+            Path(tmp_path).replace(target)
+        Path(partition.path).unlink()
+        Path(partition.path + ".tidx").unlink(missing_ok=True)
+        closed.append(partition.month)
+    return closed
+
+
+def enforce_retention(
+    sessions_file: str, current_month: str, months: int, max_bytes: int
+) -> list[str]:
+    """Delete archive months past retention, then the oldest over the budget
+
+    Args:
+        sessions_file: Path to the live sessions file
+        current_month: YYYY-MM that is never deleted
+        months: Months to keep including the current one (0 keeps all)
+        max_bytes: Disk budget for all partitions (0 for no budget)
+
+    Returns:
+        Paths deleted
+    """
+    partitions = [p for p in list_partitions(sessions_file) if p.month]
+    deleted = []
+
+    if months > 0:
+        cutoff = months_before(current_month, months - 1)
+        for partition in [p for p in partitions if p.month < cutoff]:
+            Path(partition.path).unlink(missing_ok=True)
+            deleted.append(partition.path)
+        partitions = [p for p in partitions if p.month >= cutoff]
+
+    if max_bytes > 0:
+        sizes = {p.path: Path(p.path).stat().st_size for p in partitions}
+        total = sum(sizes.values())
+        for partition in partitions:
+            if total <= max_bytes or partition.month >= current_month:
+                break
+            Path(partition.path).unlink(missing_ok=True)
+            total -= sizes[partition.path]
+            deleted.append(partition.path)
+
+    for path in deleted:
+        Path(path + ".tidx").unlink(missing_ok=True)
+    return deleted
+
+
+def rotate_archive(
+    sessions_file: str,
+    months: int = DEFAULT_RETENTION_MONTHS,
+    max_mb: int = DEFAULT_MAX_MB,
+    now: int | None = None,
+) -> int:
+    """Daily archive maintenance: file sessions, close old months, trim
+
+    Args:
+        sessions_file: Path to the live sessions file
+        months: Months of history to keep (0 keeps all)
+        max_mb: Disk budget in megabytes (0 for no budget)
+        now: Reference unix time (defaults to now)
+
+    Returns:
+        Number of sessions archived
+    """
+    current_month = month_of(now if now is not None else int(time.time()))
+
+    with Path(sessions_file + ".lock").open("w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        filed = archive_sessions(sessions_file)
+        close_partitions(sessions_file, current_month)
+        enforce_retention(sessions_file, current_month, months, max_mb * 1024 * 1024)
+
+    return filed
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python session_archive.py <sessions_file> [months] [max_mb]")
+        sys.exit(1)
+
+    retention = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_RETENTION_MONTHS
+    budget = int(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_MAX_MB
+    rotate_archive(sys.argv[1], retention, budget)
@@ -0,0 +1,411 @@
+"""
+Session Archive Time Index
+Sparse index of plain session archives, one (offset, earliest, latest start)
+entry per block of records, so a date range query maps only the blocks it needs
+"""
+
+import bisect
+import mmap
+import os
+import sys
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime, timedelta
+from itertools import chain
+from pathlib import Path
+from typing import NamedTuple
+
+from python.logic.dir_dictionary import DirectoryDictionary, load_dictionary
+from python.logic.exporter import format_time
+from python.logic.log_index import log_head
+from python.logic.session_analytics import directory_totals
+from python.logic.session_archive import iter_partition_lines, list_partitions, month_of
+from python.logic.session_store import SessionStore
+
+TIME_INDEX_SUFFIX = ".tidx"
+TIME_INDEX_MAGIC = "#pathwise-time-index 1"
+
+# Records per index entry: larger blocks mean a smaller index but more to scan
+BLOCK_RECORDS = 256
+
+RESET = "\033[0m"
+DIM = "\033[90m"
+DIR_COLOR = "\033[96m"
+
+
+class Session(NamedTuple):
+    """One dir|start|end|duration record"""
+
+    directory: str
+    start: int
+    end: int
+    duration: int
+
+
+class Block(NamedTuple):
+    """A run of BLOCK_RECORDS archive records"""
+
+    offset: int
+    first_start: int
+    last_start: int
+
+
+class TimeIndex:
+    """Sparse time index of one session archive"""
+
+    __slots__ = ("blocks", "head", "identity", "size")
+
+    def __init__(self, identity: str = "", head: str = "", size: int = 0) -> None:
+        self.identity = identity
+        self.head = head
+        # End of the last complete block; records after it are scanned directly
+        self.size = size
+        self.blocks: list[Block] = []
+
+    def covers(self, identity: str, head: str, size: int) -> bool:
+        """Check whether this index describes a prefix of the current archive"""
+        return self.identity == identity and self.head == head and self.size <= size
+
+
+def parse_session(line: bytes) -> Session | None:
+    """Parse an archive line, or None if it is malformed"""
+    fields = line.rstrip(b"\n").split(b"|")
+    if len(fields) < 4:
+        return None
+    try:
+        return Session(
+            fields[0].decode("utf-8", "replace"), int(fields[1]), int(fields[2]), int(fields[3])
+        )
+    except ValueError:
+        return None
+
+
+def time_index_path(archive_path: str) -> str:
+    """Sidecar index path for a session archive"""
+    return archive_path + TIME_INDEX_SUFFIX
+
+
+def load_time_index(archive_path: str) -> TimeIndex:
+    """Load the time index for an archive, or an empty index if there is none"""
+    try:
+        with Path(time_index_path(archive_path)).open(encoding="utf-8") as f:
+            header = f.readline().rstrip("\n").split("|")
+            if len(header) != 5 or header[0] != TIME_INDEX_MAGIC:
+                return TimeIndex()
+            if int(header[4]) != BLOCK_RECORDS:
+                return TimeIndex()
+            index = TimeIndex(header[1], header[2], int(header[3]))
+            for line in f:
+                offset, first_start, last_start = line.split()
+                index.blocks.append(Block(int(offset), int(first_start), int(last_start)))
+    except (OSError, ValueError):
+        return TimeIndex()
+    return index
+
+
+def save_time_index(archive_path: str, index: TimeIndex) -> None:
+    """Atomically write the time index for an archive"""
+    path = time_index_path(archive_path)
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    try:
+        with Path(tmp_path).open("w", encoding="utf-8") as f:
+            f.write(
+                f"{TIME_INDEX_MAGIC}|{index.identity}|{index.head}|{index.size}|{BLOCK_RECORDS}\n"
+            )
+            for block in index.blocks:
+                f.write(f"{block.offset} {block.first_start} {block.last_start}\n")
+        Path(tmp_path).replace(path)
+    except OSError:
+        Path(tmp_path).unlink(missing_ok=True)
+
+
+def _complete_end(data: mmap.mmap) -> int:
+    """Offset just past the last complete line in the mapping"""
+    return data.rfind(b"\n") + 1
+
+
+def _iter_lines(data: mmap.mmap, start: int, end: int) -> Iterator[tuple[int, bytes]]:
+    """Yield (offset, line) for each complete line between two offsets"""
+    offset = start
+    while offset < end:
+        newline = data.find(b"\n", offset, end)
+        if newline < 0:
+            return
+        yield offset, data[offset : newline + 1]
+        offset = newline + 1
+
+
+def update_time_index(archive_path: str, data: mmap.mmap) -> TimeIndex:
+    """Bring the time index up to date, indexing only new complete blocks
+
+    Args:
+        archive_path: Path to the session archive
+        data: The archive mapped into memory
+
+    Returns:
+        TimeIndex covering every complete block of the archive
+    """
+    stat = Path(archive_path).stat()
+    identity = f"{stat.st_dev}:{stat.st_ino}"
+    head = log_head(archive_path, len(data))
+    index = load_time_index(archive_path)
+    if not index.covers(identity, head, len(data)):
+        index = TimeIndex(identity, head)
+
+    block_start = index.size
+    starts: list[int] = []
+    added = False
+    for offset, line in _iter_lines(data, index.size, _complete_end(data)):
+        if not starts:
+            block_start = offset
+        session = parse_session(line)
+        # Malformed lines still count towards the block so offsets stay aligned
+        starts.append(session.start if session is not None else -1)
+        if len(starts) == BLOCK_RECORDS:
+            valid = [start for start in starts if start >= 0] or [0]
+            index.blocks.append(Block(block_start, min(valid), max(valid)))
+            index.size = offset + len(line)
+            starts = []
+            added = True
+
+    if added:
+        save_time_index(archive_path, index)
+    return index
+
+
+def _block_range(blocks: list[Block], since: int, until: int) -> tuple[int, int]:
+    """First and past-the-end blocks that can hold starts in [since, until)
+
+    Records are archived roughly in time order, but sessions from shells
+    open side by side can interleave, so a running maximum and a trailing
+    minimum keep the bisection exact.
+    """
+    latest_so_far: list[int] = []
+    latest = -1
+    for block in blocks:
+        latest = max(latest, block.last_start)
+        latest_so_far.append(latest)
+
+    earliest_after = [0] * len(blocks)
+    earliest = sys.maxsize
+    for i in range(len(blocks) - 1, -1, -1):
+        earliest = min(earliest, blocks[i].first_start)
+        earliest_after[i] = earliest
+
+    first = bisect.bisect_left(latest_so_far, since)
+    last = bisect.bisect_left(earliest_after, until)
+    return first, max(first, last)
+
+
+def iter_archive_range(archive_path: str, since: int, until: int) -> Iterator[Session]:
+    """Sessions from the archive that started in [since, until)
+
+    Args:
+        archive_path: Path to the session archive
+        since: Earliest start, unix time
+        until: Start limit (exclusive), unix time
+
+    Returns:
+        Iterator of matching sessions in archive order
+    """
+    try:
+        with Path(archive_path).open("rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return
+
+    with data:
+        index = update_time_index(archive_path, data)
+        first, last = _block_range(index.blocks, since, until)
+        spans = []
+        if first < last:
+            end = index.blocks[last].offset if last < len(index.blocks) else index.size
+            spans.append((index.blocks[first].offset, end))
+        spans.append((index.size, _complete_end(data)))
+
+        for start, end in spans:
+            for _offset, line in _iter_lines(data, start, end):
+                session = parse_session(line)
+                if session is not None and since <= session.start < until:
+                    yield session
+
+
+def iter_archived_range(sessions_path: str, since: int, until: int) -> Iterator[Session]:
+    """Sessions from every archive partition that started in [since, until)
+
+    Partitions hold the sessions that started in their month, so months
+    outside the range are never opened. The open month is read through its
+    time index; closed months are decompressed as a stream.
+
+    Args:
+        sessions_path: Path to the live sessions file the archive belongs to
+        since: Earliest start, unix time
+        until: Start limit (exclusive), unix time
+
+    Returns:
+        Iterator of matching sessions, oldest month first
+    """
+    first_month = month_of(since)
+    last_month = month_of(max(since, until - 1))
+    for partition in list_partitions(sessions_path):
+        if partition.month and not first_month <= partition.month <= last_month:
+            continue
+        if not partition.compressed:
+            yield from iter_archive_range(partition.path, since, until)
+            continue
+        for line in iter_partition_lines(partition):
+            session = parse_session(line)
+            if session is not None and since <= session.start < until:
+                yield session
+
+
+def iter_sessions_range(sessions_path: str, since: int, until: int) -> Iterator[Session]:
+    """Sessions from the current, unarchived sessions file in [since, until)"""
+    try:
+        with Path(sessions_path).open("rb") as f:
+            for line in f:
+                session = parse_session(line)
+                if session is not None and since <= session.start < until:
+                    yield session
+    except OSError:
+        return
+
+
+def parse_day(text: str, today: date | None = None) -> date:
+    """Parse a --since/--until day
+
+    Args:
+        text: YYYY-MM-DD, 'today', 'yesterday', or Nd / Nw for days or weeks ago
+        today: Reference day (defaults to today)
+
+    Returns:
+        The day meant
+
+    Raises:
+        ValueError: If the text is not a recognised day
+    """
+    reference = today or date.today()  # noqa: DTZ011
+    value = text.strip().lower()
+    if value == "today":
+        return reference
+    if value == "yesterday":
+        return reference - timedelta(days=1)
+    if value[:-1].isdigit() and value[-1:] in ("d", "w"):
+        days = int(value[:-1]) * (7 if value.endswith("w") else 1)
+        return reference - timedelta(days=days)
+    return date.fromisoformat(value)
+
+
+def day_start(day: date) -> int:
+    """Unix time of local midnight at the start of a day"""
+    return int(datetime(day.year, day.month, day.day).timestamp())  # noqa: DTZ001
+
+
+def summarize_sessions(
+    sessions: Iterable[Session], dictionary: DirectoryDictionary | None = None
+) -> dict[str, tuple[int, int]]:
+    """Total visits and seconds per directory
+
+    Args:
+        sessions: Sessions to total
+        dictionary: Directory dictionary to decode directory IDs with
+
+    Returns:
+        Dict mapping directory -> (sessions, seconds)
+    """
+    store = SessionStore()
+    for session in sessions:
+        directory = dictionary.path_of(session.directory) if dictionary else session.directory
+        store.append(directory, session.start, session.end, session.duration)
+    visits, seconds = directory_totals(store)
+    return {path: (visits[index], seconds[index]) for index, path in enumerate(store.paths)}
+
+
+def format_range_report(
+    totals: dict[str, tuple[int, int]], label: str, limit: int, sort_by: str = "frequency"
+) -> str:
+    """Render the `wfreq --since/--until` listing
+
+    Args:
+        totals: Visits and seconds per directory
+        label: Description of the range for the header
+        limit: Directories to show
+        sort_by: 'time' ranks by seconds, anything else by visits
+
+    Returns:
+        Report text with ANSI colors
+    """
+    if not totals:
+        return f"No sessions recorded {label}."
+
+    def rank(item: tuple[str, tuple[int, int]]) -> tuple[int, int]:
+        visits, seconds = item[1]
+        return (seconds, visits) if sort_by == "time" else (visits, seconds)
+
+    ranked = sorted(totals.items(), key=rank, reverse=True)[:limit]
+    visits_total = sum(visits for visits, _seconds in totals.values())
+    seconds_total = sum(seconds for _visits, seconds in totals.values())
+
+    lines = [f"PathWise Directory Frequency {label}:", ""]
+    for directory, (visits, seconds) in ranked:
+        lines.append(f"  {DIR_COLOR}{directory}{RESET}")
+        lines.append(f"      ├─ {visits} visits · {format_time(seconds)}")
+    lines.append("")
+    lines.append(
+        f"  {DIM}{len(totals)} directories · {visits_total} visits · "
+        f"{format_time(seconds_total)} in range{RESET}"
+    )
+    return "\n".join(lines)
+
+
+def range_report_for_shell(
+    sessions_path: str,
+    since: date | None,
+    until: date | None,
+    limit: int,
+    *,
+    sort_by: str = "frequency",
+    dictionary_file: str | None = None,
+) -> str:
+    """Build the `wfreq --since/--until` report
+
+    Args:
+        sessions_path: Path to the live sessions file, archives sit beside it
+        since: First day included (None for the beginning)
+        until: Last day included (None for today)
+        limit: Directories to show
+        sort_by: Listing order, as in the config
+        dictionary_file: Directory dictionary (defaults to the plugin's)
+
+    Returns:
+        Report text
+    """
+    start = day_start(since) if since is not None else 0
+    end = day_start((until or date.today()) + timedelta(days=1))  # noqa: DTZ011
+
+    if since is not None and until is not None:
+        label = f"from {since.isoformat()} to {until.isoformat()}"
+    elif since is not None:
+        label = f"since {since.isoformat()}"
+    else:
+        label = f"until {until.isoformat() if until else 'today'}"
+
+    sessions = chain(
+        iter_archived_range(sessions_path, start, end),
+        iter_sessions_range(sessions_path, start, end),
+    )
+    totals = summarize_sessions(sessions, load_dictionary(dictionary_file))
+    return format_range_report(totals, label, limit, sort_by)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 4:
+        print("Usage: python session_index.py <archive> <since YYYY-MM-DD> <until YYYY-MM-DD>")
+        sys.exit(1)
+
+    first_day = parse_day(sys.argv[2])
+    last_day = parse_day(sys.argv[3])
+    next_day = day_start(last_day + timedelta(days=1))
+    for match in iter_archive_range(sys.argv[1], day_start(first_day), next_day):
+        print(f"{match.directory}|{match.start}|{match.end}|{match.duration}")
@@ -0,0 +1,90 @@
+"""
+Session Insights
+Renders the session part of `wfreq --insights` (peak times, session lengths,
+where the time went and common moves) from the columnar session store
+"""
+
+import sys
+
+from python.logic.dir_dictionary import load_dictionary
+from python.logic.exporter import format_time
+from python.logic.session_analytics import (
+    directory_totals,
+    duration_percentiles,
+    hour_histogram,
+    top_indexes,
+    transition_counts,
+    weekday_histogram,
+)
+from python.logic.session_store import SessionStore, load_session_history
+
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+RESET = "\033[0m"
+DIM = "\033[90m"
+
+
+def _top_transitions(store: SessionStore, limit: int) -> list[tuple[str, str, int]]:
+    """Most common moves, ties broken like `sort | uniq -c | sort -rn`"""
+    moves = [
+        (store.paths[from_index], store.paths[to_index], count)
+        for (from_index, to_index), count in transition_counts(store).items()
+    ]
+    moves.sort(key=lambda move: (move[2], f"{move[0]} → {move[1]}"), reverse=True)
+    return moves[:limit]
+
+
+def session_patterns_report(store: SessionStore, top: int = 3) -> str:
+    """Render the Session Patterns and Navigation sections of `wfreq --insights`
+
+    Args:
+        store: Sessions to analyze
+        top: Directories and navigation patterns to list
+
+    Returns:
+        Report text with ANSI colors, empty when there are no sessions
+    """
+    if not len(store):
+        return ""
+
+    hours = hour_histogram(store)
+    weekdays = weekday_histogram(store)
+    peak_hour = max(range(24), key=lambda hour: (hours[hour], hour))
+    busiest_day = max(range(7), key=lambda day: (weekdays[day], -day))
+    median, longest = duration_percentiles(store, (50, 90))
+    _visits, seconds = directory_totals(store)
+
+    lines = ["\033[35m📈 Session Patterns:\033[0m"]
+    lines.append(f"  Peak activity hour: \033[93m{peak_hour:02d}:00{RESET}")
+    lines.append(f"  Busiest day: \033[93m{WEEKDAYS[busiest_day]}{RESET}")
+    average = store.total_duration() // len(store)
+    lines.append(f"  Average time per directory: \033[92m{format_time(average)}{RESET}")
+    lines.append(
+        f"  Typical session: \033[92m{format_time(median)}{RESET} median · "
+        f"\033[92m{format_time(longest)}{RESET} at the 90th percentile"
+    )
+    lines.append("  Most time overall:")
+    for index in top_indexes(seconds, top):
+        lines.append(f"    {store.paths[index]:<40} \033[92m{format_time(seconds[index])}{RESET}")
+
+    lines.append("")
+    lines.append("\033[96m🔄 Common Navigation Patterns:\033[0m")
+    for from_dir, to_dir, count in _top_transitions(store, top):
+        lines.append(f"  {from_dir} \033[93m→{RESET} {to_dir} {DIM}({count}x){RESET}")
+    return "\n".join(lines)
+
+
+def session_patterns_for_shell(sessions_file: str, dictionary_file: str | None = None) -> str:
+    """Build the session part of `wfreq --insights` from the live and archived sessions"""
+    store = load_session_history(sessions_file, load_dictionary(dictionary_file))
+    return session_patterns_report(store)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python session_insights.py <sessions_file> [dictionary]")
+        sys.exit(1)
+
+    report = session_patterns_for_shell(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
+    if report:
+        print(report)
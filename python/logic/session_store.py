@@ -0,0 +1,260 @@
+"""
+Columnar Session Store
+Holds sessions as parallel typed arrays instead of one object per record,
+so analytics over millions of sessions are tight loops over flat buffers
+"""
+
+import sys
+import time
+from array import array
+from collections import Counter
+from collections.abc import Iterable
+from pathlib import Path
+
+from python.logic.dir_dictionary import DirectoryDictionary, load_dictionary
+from python.logic.session_archive import iter_session_lines
+
+# Local time offsets are whole multiples of 15 minutes, so every instant in
+# one of these slots shares the same local hour and weekday
+LOCAL_TIME_SLOT = 900
+
+# Durations are stored unsigned 32-bit; anything longer is clamped
+MAX_DURATION = 0xFFFFFFFF
+
+# Marks a directory field that is outside the requested directories
+SKIPPED = -1
+
+
+class SessionStore:
+    """Sessions as columns: start, end, duration and directory index
+
+    Directories are interned: `paths[index]` is the decoded path of every
+    session whose `directories` entry is index. Each session costs 24 bytes
+    of array storage, whatever the number of sessions.
+    """
+
+    __slots__ = ("directories", "durations", "ends", "indexes", "paths", "starts")
+
+    def __init__(self) -> None:
+        self.starts = array("q")
+        self.ends = array("q")
+        self.durations = array("I")
+        self.directories = array("I")
+        self.paths: list[str] = []
+        self.indexes: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def directory_index(self, path: str) -> int:
+        """Index of a directory path, interning it on first sight"""
+        index = self.indexes.get(path)
+        if index is None:
+            index = self.indexes[path] = len(self.paths)
+            self.paths.append(path)
+        return index
+
+    def append(self, path: str, start: int, end: int, duration: int) -> None:
+        """Add one session"""
+        self.starts.append(start)
+        self.ends.append(end)
+        self.durations.append(_clamp(duration))
+        self.directories.append(self.directory_index(path))
+
+    def add_lines(
+        self,
+        lines: Iterable[str],
+        dictionary: DirectoryDictionary,
+        directories: set[str] | None = None,
+    ) -> int:
+        """Parse dir|start|end|duration lines into the columns
+
+        Args:
+            lines: Session lines, with directory IDs or paths
+            dictionary: Directory dictionary to decode directory IDs with
+            directories: Only keep sessions in these directories (all when None)
+
+        Returns:
+            Number of sessions added
+        """
+        # Each distinct directory field is decoded and filtered only once
+        resolved: dict[str, int] = {}
+        add_start, add_end = self.starts.append, self.ends.append
+        add_duration, add_directory = self.durations.append, self.directories.append
+        added = 0
+        for line in lines:
+            # int() ignores the trailing newline on the duration
+            fields = line.split("|", 3)
+            if len(fields) < 4:
+                continue
+            index = resolved.get(fields[0])
+            if index is None:
+                path = dictionary.path_of(fields[0])
+                wanted = directories is None or path in directories
+                index = resolved[fields[0]] = self.directory_index(path) if wanted else SKIPPED
+            if index == SKIPPED:
+                continue
+            try:
+                start, end, duration = int(fields[1]), int(fields[2]), int(fields[3])
+            except ValueError:
+                start, end, duration = (_to_int(field) for field in fields[1:])
+            add_start(start)
+            add_end(end)
+            add_duration(duration if 0 <= duration <= MAX_DURATION else _clamp(duration))
+            add_directory(index)
+            added += 1
+        return added
+
+    def total_duration(self) -> int:
+        """Seconds across all sessions"""
+        return sum(self.durations)
+
+    def _local_histogram(self, field: str, buckets: int) -> list[int]:
+        """Count session starts by a field of their local time"""
+        counts = [0] * buckets
+        slot_values: dict[int, int] = {}
+        for start in self.starts:
+            slot = start // LOCAL_TIME_SLOT
+            value = slot_values.get(slot)
+            if value is None:
+                value = slot_values[slot] = getattr(local_time(slot * LOCAL_TIME_SLOT), field)
+            counts[value] += 1
+        return counts
+
+    def hour_histogram(self) -> list[int]:
+        """Sessions started in each local hour of the day, 0-23"""
+        return self._local_histogram("tm_hour", 24)
+
+    def weekday_histogram(self) -> list[int]:
+        """Sessions started on each local weekday, Monday first"""
+        return self._local_histogram("tm_wday", 7)
+
+    def duration_percentiles(self, percents: Iterable[int]) -> list[int]:
+        """Nearest-rank percentiles of session duration, 0 when empty"""
+        ordered = sorted(self.durations)
+        return [ordered[percentile_rank(len(ordered), p)] if ordered else 0 for p in percents]
+
+    def directory_totals(self) -> tuple[list[int], list[int]]:
+        """Sessions and seconds per directory index
+
+        Returns:
+            Tuple of (visits, seconds) lists, both indexed like `paths`
+        """
+        visits = [0] * len(self.paths)
+        seconds = [0] * len(self.paths)
+        for index, duration in zip(self.directories, self.durations, strict=True):
+            visits[index] += 1
+            seconds[index] += duration
+        return visits, seconds
+
+    def chronological_order(self) -> Iterable[int]:
+        """Session positions by start time, ties broken by directory path
+
+        Logs are appended in time order, so the sort is skipped when the
+        columns are already in order.
+        """
+        starts, directories, paths = self.starts, self.directories, self.paths
+        for position in range(1, len(starts)):
+            start, previous = starts[position], starts[position - 1]
+            if start < previous or (
+                start == previous
+                and paths[directories[position]] < paths[directories[position - 1]]
+            ):
+                return sorted(range(len(starts)), key=lambda i: (starts[i], paths[directories[i]]))
+        return range(len(starts))
+
+    def transitions(self) -> Counter[tuple[int, int]]:
+        """Moves between different directories, as (from, to) index pairs"""
+        counts: Counter[tuple[int, int]] = Counter()
+        directories = self.directories
+        previous = SKIPPED
+        for position in self.chronological_order():
+            current = directories[position]
+            if previous not in (SKIPPED, current):
+                counts[(previous, current)] += 1
+            previous = current
+        return counts
+
+
+def percentile_rank(count: int, percent: int) -> int:
+    """Position of the nearest-rank percentile in count sorted values"""
+    return max((percent * count + 99) // 100, 1) - 1
+
+
+def _clamp(duration: int) -> int:
+    """Fit a duration into the unsigned 32-bit column"""
+    return min(max(duration, 0), MAX_DURATION)
+
+
+def _to_int(value: str) -> int:
+    """Parse a numeric field, treating blanks and garbage as 0"""
+    try:
+        return int(value)
+    except ValueError:
+        return 0
+
+
+def local_time(timestamp: int) -> time.struct_time:
+    """Local time of a unix timestamp, the epoch for out of range values"""
+    try:
+        return time.localtime(timestamp)
+    except (OverflowError, OSError, ValueError):
+        return time.localtime(0)
+
+
+def load_session_store(
+    path: str,
+    dictionary: DirectoryDictionary,
+    directories: set[str] | None = None,
+) -> SessionStore:
+    """Load a sessions file into a columnar store
+
+    Args:
+        path: Sessions file (dir|start|end|duration)
+        dictionary: Directory dictionary to decode directory IDs with
+        directories: Only keep sessions in these directories (all when None)
+
+    Returns:
+        SessionStore, empty when the file is missing
+    """
+    store = SessionStore()
+    try:
+        with Path(path).open(encoding="utf-8", errors="replace") as f:
+            store.add_lines(f, dictionary, directories)
+    except OSError:
+        pass
+    return store
+
+
+def load_session_history(
+    sessions_file: str,
+    dictionary: DirectoryDictionary,
+    directories: set[str] | None = None,
+) -> SessionStore:
+    """Load every kept session, archived and live, into a columnar store
+
+    Args:
+        sessions_file: Live sessions file, archive partitions sit beside it
+        dictionary: Directory dictionary to decode directory IDs with
+        directories: Only keep sessions in these directories (all when None)
+
+    Returns:
+        SessionStore, empty when nothing was recorded
+    """
+    store = SessionStore()
+    lines = (line.decode("utf-8", "replace") for line in iter_session_lines(sessions_file))
+    store.add_lines(lines, dictionary, directories)
+    return store
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python session_store.py <sessions_file> [dictionary]")
+        sys.exit(1)
+
+    sessions = load_session_store(
+        sys.argv[1], load_dictionary(sys.argv[2] if len(sys.argv) > 2 else None)
+    )
+    session_visits, session_seconds = sessions.directory_totals()
+    for directory_index, directory in enumerate(sessions.paths):
+        print(f"{directory}|{session_visits[directory_index]}|{session_seconds[directory_index]}")
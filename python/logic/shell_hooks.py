@@ -0,0 +1,213 @@
+"""
+Shell Hook Profile
+Reads the timings `wfreq --hook-profile` records for every function in the
+precmd, preexec and chpwd hooks, including other plugins', and shows which
+of them make the prompt slow, overall and per directory
+"""
+
+import sys
+from pathlib import Path
+from typing import NamedTuple
+
+from python.logic.dir_dictionary import load_dictionary, tilde_path
+from python.logic.hook_profile import DIM, RESET, format_us, percentile
+
+# Hook events in report order, with what the user waits for
+EVENTS = {
+    "precmd": "before each prompt",
+    "preexec": "before each command",
+    "chpwd": "after each cd",
+}
+
+# A function this slow at p95 makes the prompt feel sluggish and is called out
+SLOW_US = 10_000
+
+# Directories listed in the per-directory section
+TOP_DIRECTORIES = 5
+
+
+class HookCall(NamedTuple):
+    """One timed call of a hook function
+
+    Attributes:
+        timestamp: Unix time the call finished
+        event: Hook array the function was found in (precmd, preexec, chpwd)
+        function: Function name
+        directory: Working directory after the call, as a dictionary ID or path
+        microseconds: Wall time of the call
+        firing: Shell PID and counter shared by the calls of one hook run
+    """
+
+    timestamp: int
+    event: str
+    function: str
+    directory: str
+    microseconds: int
+    firing: str
+
+
+class FunctionStats(NamedTuple):
+    """Aggregated timings of one hook function"""
+
+    function: str
+    calls: int
+    total_us: int
+    p50_us: int
+    p95_us: int
+    max_us: int
+
+
+def parse_call(line: str) -> HookCall | None:
+    """Parse a timestamp|event|function|directory|microseconds|firing line"""
+    fields = line.rstrip("\n").split("|")
+    if len(fields) != 6 or not all(fields[1:3]) or not fields[5]:
+        return None
+    try:
+        timestamp, microseconds = int(fields[0]), int(fields[4])
+    except ValueError:
+        return None
+    return HookCall(timestamp, fields[1], fields[2], fields[3], max(microseconds, 0), fields[5])
+
+
+def load_calls(path: str) -> list[HookCall]:
+    """Read every call of a hook profile file, oldest first; empty when missing"""
+    try:
+        with Path(path).open(encoding="utf-8", errors="replace") as f:
+            return [call for call in map(parse_call, f) if call is not None]
+    except OSError:
+        return []
+
+
+def firing_totals(calls: list[HookCall]) -> list[int]:
+    """Time of each hook run, all its functions together, sorted"""
+    totals: dict[str, int] = {}
+    for call in calls:
+        totals[call.firing] = totals.get(call.firing, 0) + call.microseconds
+    return sorted(totals.values())
+
+
+def function_stats(calls: list[HookCall]) -> list[FunctionStats]:
+    """Per-function timings, most total time first"""
+    durations: dict[str, list[int]] = {}
+    for call in calls:
+        durations.setdefault(call.function, []).append(call.microseconds)
+
+    stats = []
+    for function, values in durations.items():
+        ordered = sorted(values)
+        stats.append(
+            FunctionStats(
+                function,
+                len(ordered),
+                sum(ordered),
+                percentile(ordered, 50),
+                percentile(ordered, 95),
+                ordered[-1],
+            )
+        )
+    return sorted(stats, key=lambda stat: (-stat.total_us, stat.function))
+
+
+def event_report(event: str, calls: list[HookCall]) -> list[str]:
+    """Latency of one hook event and the functions it is spent in"""
+    totals = firing_totals(calls)
+    p50, p95 = format_us(percentile(totals, 50)), format_us(percentile(totals, 95))
+    lines = [
+        (
+            f"\033[96m{event}{RESET} {DIM}({EVENTS.get(event, 'hook')}){RESET}  "
+            f"{len(totals)} runs · p50 \033[93m{p50}{RESET} · p95 \033[93m{p95}{RESET}"
+        ),
+        f"  {DIM}{'function':<32} {'share':>6} {'p50':>8} {'p95':>8} {'max':>8}{RESET}",
+    ]
+
+    spent = sum(totals) or 1
+    for stat in function_stats(calls):
+        name = f"{stat.function[:31]:<32}"
+        if stat.p95_us >= SLOW_US:
+            name = f"\033[91m{name}{RESET}"
+        lines.append(
+            f"  {name} {stat.total_us / spent:>6.0%} {format_us(stat.p50_us):>8} "
+            f"{format_us(stat.p95_us):>8} {format_us(stat.max_us):>8}"
+        )
+    return lines
+
+
+def directory_report(calls: list[HookCall], dictionary_file: str | None = None) -> list[str]:
+    """Directories where the hooks are slowest, with the function to blame"""
+    by_directory: dict[str, list[HookCall]] = {}
+    for call in calls:
+        by_directory.setdefault(call.directory, []).append(call)
+
+    ranked = []
+    for directory, directory_calls in by_directory.items():
+        totals = firing_totals(directory_calls)
+        ranked.append((percentile(totals, 95), len(totals), directory, directory_calls))
+    ranked.sort(key=lambda entry: (-entry[0], entry[2]))
+
+    dictionary = load_dictionary(dictionary_file)
+    lines = [f"\033[35m📁 Slowest Directories:{RESET} {DIM}p95 of a hook run there{RESET}"]
+    for p95, runs, directory, directory_calls in ranked[:TOP_DIRECTORIES]:
+        worst = function_stats(directory_calls)[0]
+        share = worst.total_us / (sum(call.microseconds for call in directory_calls) or 1)
+        lines.append(
+            f"  \033[93m{format_us(p95):>8}{RESET}  {tilde_path(dictionary.path_of(directory))} "
+            f"{DIM}· {runs} runs · {worst.function} {share:.0%}{RESET}"
+        )
+    return lines
+
+
+def hook_profile_report(calls: list[HookCall], dictionary_file: str | None = None) -> str:
+    """Render `wfreq --hook-profile` for a set of calls
+
+    Args:
+        calls: Timed hook function calls
+        dictionary_file: Directory dictionary for decoding directory IDs
+
+    Returns:
+        Report text with ANSI colors, empty when there are no calls
+    """
+    by_event: dict[str, list[HookCall]] = {}
+    for call in calls:
+        by_event.setdefault(call.event, []).append(call)
+    if not by_event:
+        return ""
+
+    functions = len({call.function for call in calls})
+    lines = [
+        (
+            f"\033[35m🪝 Shell Hook Profile:{RESET} "
+            f"{DIM}{len(calls)} calls of {functions} hook functions{RESET}"
+        )
+    ]
+    order = [event for event in EVENTS if event in by_event]
+    order += sorted(event for event in by_event if event not in EVENTS)
+    for event in order:
+        lines.append("")
+        lines.extend(event_report(event, by_event[event]))
+
+    lines.append("")
+    lines.extend(directory_report(calls, dictionary_file))
+
+    worst = function_stats(calls)[0]
+    share = worst.total_us / (sum(call.microseconds for call in calls) or 1)
+    lines.append("")
+    lines.append(
+        f"\033[33m💡 {worst.function} takes {share:.0%} of all hook time "
+        f"(p95 {format_us(worst.p95_us)} per call){RESET}"
+    )
+    return "\n".join(lines)
+
+
+def hook_profile_report_for_shell(profile_file: str, dictionary_file: str | None = None) -> str:
+    """Build `wfreq --hook-profile` from the hook profile ring buffer"""
+    return hook_profile_report(load_calls(profile_file), dictionary_file)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python shell_hooks.py <hook_profile_file> [dictionary_file]")
+        sys.exit(1)
+
+    report = hook_profile_report_for_shell(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
+    if report:
+        print(report)
@@ -0,0 +1,205 @@
+"""
+Startup Profile
+Reads the rolling history pathwise-startup.zsh writes for each new shell and
+renders `wfreq --startup`: how start-up time has moved day by day and which
+~/.zshrc sections and PathWise phases cost the most
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import NamedTuple
+
+from python.logic.hook_profile import BAR_WIDTH, DIM, RESET, format_us, percentile
+
+# Record kinds: one total per shell, and the parts it is made of
+TOTAL_KIND = "total"
+PART_KINDS = {
+    "section": "~/.zshrc sections",
+    "pathwise": "PathWise phases",
+}
+
+# Offenders are ranked over the newest shells, so fixed problems drop out
+RECENT_SHELLS = 20
+OFFENDERS_PER_KIND = 8
+
+TREND_DAYS = 14
+
+# The newest shells' median this much above the ones before is flagged
+REGRESSION_RATIO = 1.25
+
+
+class StartupRecord(NamedTuple):
+    """One timing of one shell start-up
+
+    Attributes:
+        timestamp: Unix time the shell showed its first prompt
+        pid: Process ID of the shell
+        kind: total, section or pathwise
+        label: Section or phase name
+        microseconds: Time spent
+    """
+
+    timestamp: int
+    pid: str
+    kind: str
+    label: str
+    microseconds: int
+
+
+class ShellStartup(NamedTuple):
+    """Every timing of one shell start-up"""
+
+    timestamp: int
+    total_us: int
+    parts: list[StartupRecord]
+
+
+def parse_record(line: str) -> StartupRecord | None:
+    """Parse a timestamp|pid|kind|label|microseconds line"""
+    fields = line.rstrip("\n").split("|")
+    if len(fields) != 5 or not fields[2]:
+        return None
+    try:
+        timestamp, microseconds = int(fields[0]), int(fields[4])
+    except ValueError:
+        return None
+    return StartupRecord(timestamp, fields[1], fields[2], fields[3], max(microseconds, 0))
+
+
+def load_startups(path: str) -> list[ShellStartup]:
+    """Read the history, one ShellStartup per shell, oldest first
+
+    Shells whose total is missing (cut off by trimming) are skipped.
+    """
+    shells: dict[tuple[int, str], list[StartupRecord]] = {}
+    try:
+        with Path(path).open(encoding="utf-8", errors="replace") as f:
+            for record in map(parse_record, f):
+                if record is not None:
+                    shells.setdefault((record.timestamp, record.pid), []).append(record)
+    except OSError:
+        return []
+
+    startups = []
+    for (timestamp, _), records in shells.items():
+        total = next((r.microseconds for r in records if r.kind == TOTAL_KIND), None)
+        if total is not None:
+            parts = [record for record in records if record.kind != TOTAL_KIND]
+            startups.append(ShellStartup(timestamp, total, parts))
+    return sorted(startups, key=lambda startup: startup.timestamp)
+
+
+def daily_medians(startups: list[ShellStartup]) -> list[tuple[str, int, int]]:
+    """Median start-up per day over the newest TREND_DAYS days with shells
+
+    Returns:
+        List of (day, shells, median microseconds), oldest first
+    """
+    days: dict[str, list[int]] = {}
+    for startup in startups:
+        day = datetime.fromtimestamp(startup.timestamp).date().isoformat()  # noqa: DTZ006
+        days.setdefault(day, []).append(startup.total_us)
+    return [
+        (day, len(totals), percentile(sorted(totals), 50))
+        for day, totals in sorted(days.items())[-TREND_DAYS:]
+    ]
+
+
+def offenders(startups: list[ShellStartup], kind: str) -> list[tuple[str, int, int]]:
+    """Parts of one kind by median time over the newest shells
+
+    Returns:
+        List of (label, median microseconds, worst microseconds), slowest first
+    """
+    timings: dict[str, list[int]] = {}
+    for startup in startups[-RECENT_SHELLS:]:
+        for part in startup.parts:
+            if part.kind == kind:
+                timings.setdefault(part.label, []).append(part.microseconds)
+
+    ranked = [
+        (label, percentile(sorted(values), 50), max(values)) for label, values in timings.items()
+    ]
+    return sorted(ranked, key=lambda entry: (-entry[1], entry[0]))[:OFFENDERS_PER_KIND]
+
+
+def startup_regression(startups: list[ShellStartup]) -> tuple[int, int] | None:
+    """Median of the newest shells against the ones before, when clearly slower
+
+    Returns:
+        (recent median, earlier median) in microseconds, or None
+    """
+    half = RECENT_SHELLS // 2
+    if len(startups) < RECENT_SHELLS:
+        return None
+    recent = sorted(startup.total_us for startup in startups[-half:])
+    earlier = sorted(startup.total_us for startup in startups[-RECENT_SHELLS:-half])
+    recent_median, earlier_median = percentile(recent, 50), percentile(earlier, 50)
+    if recent_median >= earlier_median * REGRESSION_RATIO:
+        return recent_median, earlier_median
+    return None
+
+
+def startup_report(startups: list[ShellStartup]) -> str:
+    """Render `wfreq --startup`
+
+    Returns:
+        Report text with ANSI colors, empty when no shell was recorded
+    """
+    if not startups:
+        return ""
+
+    totals = sorted(startup.total_us for startup in startups)
+    lines = [
+        f"\033[35m🚀 Shell Startup:{RESET} {DIM}{len(startups)} shells recorded{RESET}",
+        (
+            f"  latest \033[93m{format_us(startups[-1].total_us)}{RESET} · "
+            f"p50 \033[93m{format_us(percentile(totals, 50))}{RESET} · "
+            f"p95 \033[93m{format_us(percentile(totals, 95))}{RESET}"
+        ),
+    ]
+
+    trend = daily_medians(startups)
+    if len(trend) > 1:
+        lines.append("")
+        lines.append(f"\033[36m📈 Trend:{RESET} {DIM}median per day{RESET}")
+        peak = max(median for _, _, median in trend) or 1
+        for day, shells, median in trend:
+            bar = "█" * max(round(median / peak * BAR_WIDTH), 1)
+            lines.append(
+                f"  {day}  {bar:<{BAR_WIDTH}} {format_us(median):>8} {DIM}{shells} shells{RESET}"
+            )
+
+    for kind, title in PART_KINDS.items():
+        ranked = offenders(startups, kind)
+        if not ranked:
+            continue
+        lines.append("")
+        lines.append(f"\033[36m{title}:{RESET} {DIM}median / worst, newest shells{RESET}")
+        for label, median, worst in ranked:
+            lines.append(f"  {format_us(median):>8} / {format_us(worst):>8}  {label}")
+
+    slower = startup_regression(startups)
+    if slower is not None:
+        lines.append("")
+        lines.append(
+            f"\033[91m⚠️  New shells take {format_us(slower[0])}, "
+            f"up from {format_us(slower[1])}{RESET}"
+        )
+    return "\n".join(lines)
+
+
+def startup_report_for_shell(history_file: str) -> str:
+    """Build `wfreq --startup` from the start-up history"""
+    return startup_report(load_startups(history_file))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python startup_profile.py <startup_file>")
+        sys.exit(1)
+
+    report = startup_report_for_shell(sys.argv[1])
+    if report:
+        print(report)
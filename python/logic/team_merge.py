@@ -0,0 +1,453 @@
+"""
+Team Report Merge
+Streams many PathWise exports (TOML or JSON Lines) and combines their
+directory, tool and git-category totals into one team summary
+"""
+
+import heapq
+import json
+import os
+import sys
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TextIO
+
+from python.logic.exporter import (
+    DIRECTORIES_PER_TOOL,
+    GIT_CATEGORY_KEYS,
+    format_time,
+    toml_key,
+    toml_string,
+    tool_category,
+)
+
+DEFAULT_TEAM_REPORT = "pathwise_team.toml"
+EXPORT_SUFFIXES = (".toml", ".jsonl")
+
+# Directories and tools listed in the team report
+TEAM_DIRECTORIES = 20
+TEAM_TOOLS = 10
+
+# Below this many exports the pool costs more than it saves
+POOL_THRESHOLD = 8
+
+TOML_UNESCAPES = {"b": "\b", "t": "\t", "n": "\n", "f": "\f", "r": "\r", '"': '"', "\\": "\\"}
+
+
+class ExportTotals:
+    """Totals read from one or more exports"""
+
+    __slots__ = (
+        "commits",
+        "contributors",
+        "exports",
+        "git_categories",
+        "members",
+        "time_seconds",
+        "tool_directories",
+        "tool_uses",
+        "visits",
+    )
+
+    def __init__(self) -> None:
+        self.exports = 0
+        self.members: set[str] = set()
+        self.visits: Counter[str] = Counter()
+        self.time_seconds: Counter[str] = Counter()
+        self.commits: Counter[str] = Counter()
+        self.contributors: Counter[str] = Counter()
+        self.tool_uses: Counter[str] = Counter()
+        self.tool_directories: dict[str, Counter[str]] = {}
+        self.git_categories: Counter[str] = Counter()
+
+    def add_directory(self, path: str, visits: int, time_seconds: int, commits: int) -> None:
+        """Count one export's row for a directory"""
+        self.visits[path] += visits
+        self.time_seconds[path] += time_seconds
+        self.commits[path] += commits
+        self.contributors[path] += 1
+
+    def add_tool(self, tool: str, directory: str, uses: int) -> None:
+        """Count uses of a tool in a directory"""
+        self.tool_directories.setdefault(tool, Counter())[directory] += uses
+
+    def merge(self, other: "ExportTotals") -> None:
+        """Fold another set of totals into this one"""
+        self.exports += other.exports
+        self.members |= other.members
+        self.visits.update(other.visits)
+        self.time_seconds.update(other.time_seconds)
+        self.commits.update(other.commits)
+        self.contributors.update(other.contributors)
+        self.tool_uses.update(other.tool_uses)
+        for tool, directories in other.tool_directories.items():
+            self.tool_directories.setdefault(tool, Counter()).update(directories)
+        self.git_categories.update(other.git_categories)
+
+
+def _to_int(value: object) -> int:
+    """Read a count, treating anything non-numeric as 0"""
+    return value if isinstance(value, int) and not isinstance(value, bool) else 0
+
+
+def parse_toml_string(text: str) -> tuple[str, str]:
+    """Parse a TOML basic string at the start of text
+
+    Args:
+        text: Text starting with a double quote
+
+    Returns:
+        Tuple of (unescaped value, text after the closing quote)
+    """
+    chars: list[str] = []
+    i = 1
+    while i < len(text):
+        char = text[i]
+        if char == '"':
+            return "".join(chars), text[i + 1 :]
+        if char == "\\" and i + 1 < len(text):
+            escape = text[i + 1]
+            if escape in "uU":
+                width = 4 if escape == "u" else 8
+                chars.append(chr(int(text[i + 2 : i + 2 + width], 16)))
+                i += 2 + width
+                continue
+            chars.append(TOML_UNESCAPES.get(escape, escape))
+            i += 2
+            continue
+        chars.append(char)
+        i += 1
+    msg = "unterminated string"
+    raise ValueError(msg)
+
+
+def _parse_key(text: str) -> tuple[str, str]:
+    """Split a bare or quoted key from the rest of the line"""
+    if text.startswith('"'):
+        return parse_toml_string(text)
+    key, _, rest = text.partition("=")
+    return key.strip(), "=" + rest
+
+
+def _parse_value(text: str) -> object:
+    """Parse the string and integer values exports contain, None otherwise"""
+    text = text.strip()
+    if text.startswith('"'):
+        return parse_toml_string(text)[0]
+    try:
+        return int(text.split("#", 1)[0])
+    except ValueError:
+        return None
+
+
+def iter_toml_entries(lines: Iterable[str]) -> Iterator[tuple[str, str, object]]:
+    """Stream (table, key, value) entries from a PathWise TOML export
+
+    Only the subset the exporter writes is understood: [table] and
+    [[array]] headers with string or integer values. Multi-line arrays are
+    skipped, since their totals are also written as plain keys.
+
+    Args:
+        lines: Lines of the export
+
+    Returns:
+        Iterator of entries; array tables start with a ("[[name]]", "", None) entry
+    """
+    table = ""
+    in_array = False
+    for raw in lines:
+        line = raw.strip()
+        if not line or line.startswith("#"):
+            continue
+        if in_array:
+            in_array = line != "]"
+            continue
+        if line.startswith("[["):
+            table = line[2:].rsplit("]]", 1)[0].strip()
+            yield f"[[{table}]]", "", None
+            continue
+        if line.startswith("["):
+            table = line[1:].rsplit("]", 1)[0].strip()
+            continue
+
+        key, rest = _parse_key(line)
+        rest = rest.lstrip()
+        if not rest.startswith("="):
+            continue
+        value_text = rest[1:].strip()
+        if value_text.startswith("["):
+            in_array = not value_text.rstrip().endswith("]")
+            continue
+        yield table, key, _parse_value(value_text)
+
+
+def _tool_table(table: str) -> str:
+    """Tool name from a [tools.<name>] header"""
+    name = table[len("tools.") :]
+    return parse_toml_string(name)[0] if name.startswith('"') else name
+
+
+def read_toml_export(lines: Iterable[str]) -> ExportTotals:
+    """Total one TOML export
+
+    Args:
+        lines: Lines of the export
+
+    Returns:
+        ExportTotals for the export
+
+    Raises:
+        ValueError: If the file has no [metadata] table
+    """
+    totals = ExportTotals()
+    totals.exports = 1
+    metadata: dict[str, object] = {}
+    directory: dict[str, object] | None = None
+
+    def finish_directory() -> None:
+        if directory is not None and isinstance(directory.get("path"), str):
+            totals.add_directory(
+                str(directory["path"]),
+                _to_int(directory.get("visits")),
+                _to_int(directory.get("time_seconds")),
+                _to_int(directory.get("git_commits")),
+            )
+
+    for table, key, value in iter_toml_entries(lines):
+        if table == "[[directories]]":
+            finish_directory()
+            directory = {}
+        elif table == "metadata":
+            metadata[key] = value
+        elif table == "directories" and directory is not None:
+            directory[key] = value
+        elif table == "directories.tools_used" and directory is not None:
+            path = directory.get("path")
+            if isinstance(path, str):
+                totals.add_tool(key, path, _to_int(value))
+        elif table == "directories.git_categories":
+            totals.git_categories[key] += _to_int(value)
+        elif table.startswith("tools.") and key == "total_uses":
+            totals.tool_uses[_tool_table(table)] += _to_int(value)
+    finish_directory()
+
+    if not metadata:
+        msg = "no [metadata] table"
+        raise ValueError(msg)
+    totals.members.add(f"{metadata.get('user', '')}@{metadata.get('hostname', '')}")
+    return totals
+
+
+def read_jsonl_export(lines: Iterable[str]) -> ExportTotals:
+    """Total one JSON Lines export
+
+    Args:
+        lines: Lines of the export
+
+    Returns:
+        ExportTotals for the export
+
+    Raises:
+        ValueError: If a line is not JSON or there is no metadata record
+    """
+    totals = ExportTotals()
+    totals.exports = 1
+    for line in lines:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        kind = record.get("record")
+        if kind == "directory":
+            totals.add_directory(
+                str(record.get("directory", "")),
+                _to_int(record.get("visits")),
+                _to_int(record.get("time_seconds")),
+                _to_int(record.get("git_commits")),
+            )
+        elif kind == "tool_use":
+            tool = str(record.get("tool", ""))
+            uses = _to_int(record.get("uses"))
+            totals.tool_uses[tool] += uses
+            totals.add_tool(tool, str(record.get("directory", "")), uses)
+        elif kind == "commit":
+            category = str(record.get("category", "other"))
+            totals.git_categories[GIT_CATEGORY_KEYS.get(category, "other")] += 1
+        elif kind == "metadata":
+            totals.members.add(f"{record.get('user', '')}@{record.get('hostname', '')}")
+    if not totals.members:
+        msg = "no metadata record"
+        raise ValueError(msg)
+    return totals
+
+
+def read_export(path: str) -> ExportTotals:
+    """Total one export file, TOML or JSON Lines
+
+    Args:
+        path: Export file; .jsonl files and files starting with '{' are JSON Lines
+
+    Returns:
+        ExportTotals for the export
+    """
+    with Path(path).open(encoding="utf-8", errors="replace") as f:
+        first = f.readline()
+        f.seek(0)
+        if path.endswith(".jsonl") or first.lstrip().startswith("{"):
+            return read_jsonl_export(f)
+        return read_toml_export(f)
+
+
+def _read_export_safely(path: str) -> tuple[str, ExportTotals | None, str]:
+    """Pool worker: total an export, reporting failures instead of raising"""
+    try:
+        return path, read_export(path), ""
+    except OSError as e:
+        return path, None, e.strerror or str(e)
+    except (ValueError, IndexError) as e:
+        return path, None, f"not a PathWise export ({e})"
+
+
+def expand_inputs(inputs: Iterable[str]) -> list[str]:
+    """Expand directories to the exports they contain
+
+    Args:
+        inputs: Export files and directories of exports
+
+    Returns:
+        Export paths, directory contents sorted by name
+    """
+    paths: list[str] = []
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            paths.extend(
+                str(child)
+                for child in sorted(path.iterdir())
+                if child.suffix in EXPORT_SUFFIXES and child.is_file()
+            )
+        else:
+            paths.append(item)
+    return paths
+
+
+def _iter_results(paths: list[str], jobs: int) -> Iterator[tuple[str, ExportTotals | None, str]]:
+    """Read exports, in a process pool when there are enough of them
+
+    At most two exports per worker are in flight, so memory stays bounded
+    by the merged totals no matter how many exports there are.
+    """
+    if jobs <= 1 or len(paths) < POOL_THRESHOLD:
+        for path in paths:
+            yield _read_export_safely(path)
+        return
+
+    pending = iter(paths)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        running: set[Future[tuple[str, ExportTotals | None, str]]] = set()
+        for path in pending:
+            running.add(pool.submit(_read_export_safely, path))
+            if len(running) >= jobs * 2:
+                break
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+                next_path = next(pending, None)
+                if next_path is not None:
+                    running.add(pool.submit(_read_export_safely, next_path))
+
+
+def merge_exports(
+    paths: list[str], jobs: int | None = None, errors: TextIO | None = None
+) -> ExportTotals:
+    """Merge export files into team totals
+
+    Args:
+        paths: Export files
+        jobs: Worker processes (defaults to the CPU count)
+        errors: Stream for warnings about skipped files
+
+    Returns:
+        Combined ExportTotals; unreadable exports are skipped
+    """
+    merged = ExportTotals()
+    for path, totals, error in _iter_results(paths, jobs or os.cpu_count() or 1):
+        if totals is None:
+            print(f"⚠️  Skipped {path}: {error}", file=errors or sys.stderr)
+            continue
+        merged.merge(totals)
+    return merged
+
+
+def _ranked(counts: Counter[str], limit: int) -> list[tuple[str, int]]:
+    """Top entries by count, ties by name"""
+    return heapq.nlargest(limit, counts.items(), key=lambda item: (item[1], item[0]))
+
+
+def write_team_report(
+    out: TextIO,
+    totals: ExportTotals,
+    directory_limit: int = TEAM_DIRECTORIES,
+    tool_limit: int = TEAM_TOOLS,
+) -> None:
+    """Write merged totals as a TOML team summary
+
+    Args:
+        out: Destination stream
+        totals: Merged totals
+        directory_limit: Directories to list, by visits
+        tool_limit: Tools to list, by uses
+    """
+    merged_at = datetime.now(timezone.utc).astimezone().isoformat(timespec="seconds")
+    out.write("[metadata]\n")
+    out.write(f"merged_at = {toml_string(merged_at)}\n")
+    out.write(f"exports = {totals.exports}\n")
+    out.write(f"members = {len(totals.members)}\n\n")
+
+    total_time = sum(totals.time_seconds.values())
+    out.write("[summary]\n")
+    out.write(f"total_directories = {len(totals.visits)}\n")
+    out.write(f"total_visits = {sum(totals.visits.values())}\n")
+    out.write(f"total_time_seconds = {total_time}\n")
+    out.write(f"total_time_formatted = {toml_string(format_time(total_time))}\n")
+    out.write(f"total_commits = {sum(totals.commits.values())}\n\n")
+
+    if totals.git_categories:
+        out.write("[git_categories]\n")
+        for key in GIT_CATEGORY_KEYS.values():
+            if totals.git_categories[key]:
+                out.write(f"{key} = {totals.git_categories[key]}\n")
+        out.write("\n")
+
+    for path, visits in _ranked(totals.visits, directory_limit):
+        out.write("[[directories]]\n")
+        out.write(f"path = {toml_string(path)}\n")
+        out.write(f"visits = {visits}\n")
+        out.write(f"time_seconds = {totals.time_seconds[path]}\n")
+        out.write(f"time_formatted = {toml_string(format_time(totals.time_seconds[path]))}\n")
+        out.write(f"git_commits = {totals.commits[path]}\n")
+        out.write(f"contributors = {totals.contributors[path]}\n\n")
+
+    if totals.tool_uses:
+        out.write("# Team Tools\n\n")
+    for tool, uses in _ranked(totals.tool_uses, tool_limit):
+        out.write(f"[tools.{toml_key(tool)}]\n")
+        out.write(f"total_uses = {uses}\n")
+        out.write(f"category = {toml_string(tool_category(tool))}\n")
+        out.write("directories = [\n")
+        for directory, count in _ranked(
+            totals.tool_directories.get(tool, Counter()), DIRECTORIES_PER_TOOL
+        ):
+            out.write(f"    {{ path = {toml_string(directory)}, uses = {count} }},\n")
+        out.write("]\n\n")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python team_merge.py <export> [export ...]")
+        sys.exit(1)
+
+    write_team_report(sys.stdout, merge_exports(expand_inputs(sys.argv[1:])))
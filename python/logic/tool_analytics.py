@@ -0,0 +1,274 @@
+"""
+Tool Usage Analytics Logic
+Single-pass aggregation of tool usage for the insights and --tools reports
+"""
+
+import heapq
+import sys
+from collections import Counter
+from collections.abc import Iterable
+
+from python.constants.tools import TRACKED_TOOLS, get_tool_category
+from python.logic.dir_dictionary import load_dictionary
+from python.logic.tool_counters import ToolUsage, iter_tool_usage
+
+# Tools shown per directory in the --tools report
+TOP_TOOLS_PER_DIR = 5
+
+# Tools shown in the single-directory insights report
+TOP_TOOLS_IN_DIR = 10
+
+# Human readable labels for TRACKED_TOOLS categories
+CATEGORY_LABELS = {
+    "ai_tools": "AI assistant",
+    "editors": "editor",
+    "version_control": "version control",
+    "package_managers": "package manager",
+    "build_tools": "build tool",
+    "runners": "runner",
+    "file_tools": "file tool",
+    "system_tools": "system tool",
+    "testing": "test runner",
+}
+
+RESET = "\033[0m"
+DIM = "\033[90m"
+DIR_COLOR = "\033[96m"
+
+
+class DirectoryTools:
+    """Tool counts for a single directory
+
+    Every tool keeps its full count while records stream in, since a tool's
+    rank is only known once all of them are counted. Memory grows with the
+    distinct tools used there; top() picks the leaders when rendering.
+    """
+
+    __slots__ = ("aliases", "counts", "tool_types", "total")
+
+    def __init__(self) -> None:
+        self.counts: Counter[str] = Counter()
+        self.tool_types: dict[str, str] = {}
+        self.aliases: dict[str, set[str]] = {}
+        self.total = 0
+
+    def add(self, tool: str, tool_type: str, uses: int = 1, alias: str = "") -> None:
+        """Count uses of a tool, remembering the type it was first logged with"""
+        self.counts[tool] += uses
+        self.tool_types.setdefault(tool, tool_type)
+        if alias:
+            self.aliases.setdefault(tool, set()).add(alias.split("=", 1)[0])
+        self.total += uses
+
+    def top(self, limit: int = TOP_TOOLS_PER_DIR) -> list[tuple[str, int]]:
+        """Most used tools, ties broken like `sort | uniq -c | sort -rn`
+
+        Args:
+            limit: Maximum number of tools to return
+
+        Returns:
+            List of (tool, count) tuples, most used first
+        """
+        return heapq.nlargest(limit, self.counts.items(), key=lambda item: (item[1], item[0]))
+
+
+def aggregate_tools(
+    records: Iterable[ToolUsage], directories: Iterable[str]
+) -> dict[str, DirectoryTools]:
+    """Group tool usage by directory and tool in one pass
+
+    Records for directories that are not requested are skipped without
+    being counted.
+
+    Args:
+        records: Tool usage from the counters file and the raw log
+        directories: Directories to report on
+
+    Returns:
+        Dict mapping directory -> DirectoryTools, for requested directories only
+    """
+    stats = {directory: DirectoryTools() for directory in directories}
+
+    for record in records:
+        directory_stats = stats.get(record.directory)
+        if directory_stats is not None:
+            directory_stats.add(record.tool, record.tool_type, record.uses, record.alias)
+
+    return stats
+
+
+def category_label(tool: str, tool_type: str) -> str:
+    """Describe a tool for the --tools report
+
+    Args:
+        tool: Tool name as logged
+        tool_type: Type field from the tool log
+
+    Returns:
+        Short label such as 'editor' or 'custom script'
+    """
+    if tool_type == "custom":
+        return "custom script" if tool.startswith(("./", "../")) else "user tool"
+    # Older logs record "known" instead of the TRACKED_TOOLS category
+    category = tool_type if tool_type in CATEGORY_LABELS else get_tool_category(tool)
+    return CATEGORY_LABELS.get(category, "tool")
+
+
+def percent_color(percent: int) -> str:
+    """Pick the highlight color for a tool's share of a directory's usage"""
+    if percent > 40:
+        return "\033[91m"  # Bright red for dominant
+    if percent > 25:
+        return "\033[93m"  # Yellow for frequent
+    if percent > 15:
+        return "\033[92m"  # Green for moderate
+    return "\033[37m"
+
+
+def format_tools_report(stats: dict[str, DirectoryTools]) -> str:
+    """Render the per-directory section of `wfreq --tools`
+
+    Args:
+        stats: Aggregated tool counts, in display order
+
+    Returns:
+        Report text with ANSI colors, empty if no directory has tool usage
+    """
+    lines: list[str] = []
+
+    for directory, directory_stats in stats.items():
+        if not directory_stats.total:
+            continue
+
+        lines.append(
+            f"{DIR_COLOR}📁 {directory}{RESET} "
+            f"{DIM}({directory_stats.total} tool invocations){RESET}"
+        )
+        for tool, count in directory_stats.top():
+            percent = count * 100 // directory_stats.total
+            label = category_label(tool, directory_stats.tool_types[tool])
+            lines.append(
+                f"   {percent_color(percent)}{tool + ':':<12} {count:3d} uses ({percent:2d}%)"
+                f"{RESET}  {DIM}← {label}{RESET}"
+            )
+        lines.append("")
+
+    return "\n".join(lines)
+
+
+def format_directory_report(directory: str, directory_stats: DirectoryTools) -> str:
+    """Render the tool section of `wfreq --insights` for one directory
+
+    Args:
+        directory: Directory the report is for
+        directory_stats: Aggregated tool counts for that directory
+
+    Returns:
+        Report text with ANSI colors, empty if the directory has no tool usage
+    """
+    if not directory_stats.total:
+        return ""
+
+    lines = [
+        f"\033[94m🛠️  Tool Usage in {directory}:{RESET}",
+        f"  \033[93mTotal tool invocations: {directory_stats.total}{RESET}",
+        "",
+        f"  \033[36mTop {TOP_TOOLS_IN_DIR} Tools:{RESET}",
+    ]
+
+    for tool, count in directory_stats.top(TOP_TOOLS_IN_DIR):
+        percent = count * 100 // directory_stats.total
+        tool_type = directory_stats.tool_types[tool]
+        if tool_type == "custom":
+            color = "\033[95m"  # Magenta for custom
+        elif tool_type == "known" or tool_type in CATEGORY_LABELS:
+            color = "\033[96m"  # Cyan for known
+        else:
+            color = "\033[37m"
+        via = ""
+        if directory_stats.aliases.get(tool):
+            via = f" (via {', '.join(sorted(directory_stats.aliases[tool]))})"
+        lines.append(
+            f"    {color}{tool + ':':<15}{RESET} {count:3d} uses {DIM}({percent}%){via}{RESET}"
+        )
+
+    lines.extend(
+        [
+            "",
+            f"  {DIM}💡 Use 'wfreq --tools' to see tool usage across top directories{RESET}",
+            "",
+        ]
+    )
+
+    custom_scripts = sorted(
+        tool
+        for tool, tool_type in directory_stats.tool_types.items()
+        if tool_type == "custom" and tool.startswith("./")
+    )
+    ai_tools = sorted(
+        tool for tool in directory_stats.counts if tool in TRACKED_TOOLS["ai_tools"]["tools"]
+    )
+
+    if custom_scripts:
+        lines.append(f"  \033[35mCustom Scripts Used Here:{RESET}")
+        lines.extend(f"    📜 {tool}" for tool in custom_scripts[:5])
+        lines.append("")
+
+    if ai_tools:
+        lines.append(f"  \033[94mAI Assistants Used Here:{RESET}")
+        lines.extend(f"    🤖 {tool}" for tool in ai_tools[:5])
+
+    return "\n".join(lines)
+
+
+def tools_report_for_shell(
+    tools_file: str,
+    counts_file: str,
+    merged_data: Iterable[str],
+    dictionary_file: str | None = None,
+) -> str:
+    """Build the `wfreq --tools` report from recorded usage and merged data
+
+    Args:
+        tools_file: Path to the raw tool usage log
+        counts_file: Path to the compacted tool counters
+        merged_data: Lines from _freq_dirs_get_merged_data (dir|count|...)
+        dictionary_file: Directory dictionary (defaults to the plugin's)
+
+    Returns:
+        Report text, empty if no requested directory has tool usage
+    """
+    directories = [line.split("|", 1)[0] for line in merged_data if line.strip()]
+    usage = iter_tool_usage(tools_file, counts_file, directories, load_dictionary(dictionary_file))
+    return format_tools_report(aggregate_tools(usage, directories))
+
+
+def directory_report_for_shell(
+    tools_file: str, counts_file: str, directory: str, dictionary_file: str | None = None
+) -> str:
+    """Build the tool section of `wfreq --insights` for one directory
+
+    Args:
+        tools_file: Path to the raw tool usage log
+        counts_file: Path to the compacted tool counters
+        directory: Directory to report on, in ~ form
+        dictionary_file: Directory dictionary (defaults to the plugin's)
+
+    Returns:
+        Report text, empty if the directory has no tool usage
+    """
+    usage = iter_tool_usage(tools_file, counts_file, [directory], load_dictionary(dictionary_file))
+    return format_directory_report(directory, aggregate_tools(usage, [directory])[directory])
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python tool_analytics.py <tools_file> <counts_file> [dir] < merged_data")
+        sys.exit(1)
+
+    if len(sys.argv) > 3:
+        report = directory_report_for_shell(sys.argv[1], sys.argv[2], sys.argv[3])
+    else:
+        report = tools_report_for_shell(sys.argv[1], sys.argv[2], sys.stdin)
+    if report:
+        print(report)
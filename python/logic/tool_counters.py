@@ -0,0 +1,322 @@
+"""
+Tool Usage Counters
+Compacts the append-only tool log into per-day counters keyed by
+(directory, tool, alias) so storage grows with distinct tools, not commands
+"""
+
+import fcntl
+import os
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import NamedTuple
+
+from python.logic.dir_dictionary import DirectoryDictionary, load_dictionary
+from python.logic.log_index import read_records_by_directory
+
+# Day buckets older than this are folded into a single OLDER_BUCKET
+DAY_BUCKET_RETENTION = 90
+OLDER_BUCKET = "older"
+
+# First line of a compacted file: the raw batch folded into it last, so a
+# compaction interrupted before removing that batch does not fold it twice
+BATCH_HEADER = "#batch|"
+
+
+class ToolUsage(NamedTuple):
+    """Uses of one tool in one directory on one day"""
+
+    directory: str
+    tool: str
+    tool_type: str
+    alias: str
+    day: str
+    uses: int
+
+
+def day_of(timestamp: str) -> str:
+    """Convert a unix timestamp from the tool log to a local YYYY-MM-DD day"""
+    try:
+        moment = datetime.fromtimestamp(int(timestamp))  # noqa: DTZ006
+    except (ValueError, OverflowError, OSError):
+        return OLDER_BUCKET
+    return moment.date().isoformat()
+
+
+def parse_raw_record(line: str) -> ToolUsage | None:
+    """Parse a raw tool log line: dir|tool|type[|alias:name]|timestamp
+
+    Args:
+        line: One line of the raw tool log
+
+    Returns:
+        ToolUsage for a single use, or None for malformed lines
+    """
+    fields = line.rstrip("\n").split("|")
+    if len(fields) < 4 or not fields[1]:
+        return None
+
+    alias = ""
+    if len(fields) >= 5 and fields[3].startswith("alias:"):
+        alias = fields[3][len("alias:") :]
+
+    return ToolUsage(fields[0], fields[1], fields[2], alias, day_of(fields[-1]), 1)
+
+
+def parse_counter_record(line: str) -> ToolUsage | None:
+    """Parse a counters line: dir|tool|type|alias|day|uses
+
+    Args:
+        line: One line of the counters file
+
+    Returns:
+        ToolUsage for the bucket, or None for malformed lines
+    """
+    fields = line.rstrip("\n").split("|")
+    if len(fields) != 6 or not fields[1]:
+        return None
+    try:
+        uses = int(fields[5])
+    except ValueError:
+        return None
+    return ToolUsage(fields[0], fields[1], fields[2], fields[3], fields[4], uses)
+
+
+def batch_identity(path: str) -> str:
+    """Identify a pending raw batch by inode, size and modification time
+
+    Returns:
+        The identity, or an empty string when the file does not exist
+    """
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return ""
+    return f"{stat.st_ino}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def applied_batch(compacted_file: str) -> str:
+    """Identity of the raw batch last folded into a compacted file, if recorded"""
+    try:
+        with Path(compacted_file).open(encoding="utf-8", errors="replace") as f:
+            first = f.readline()
+    except OSError:
+        return ""
+    return first[len(BATCH_HEADER) :].strip() if first.startswith(BATCH_HEADER) else ""
+
+
+def pending_batch(raw_file: str, compacted_file: str) -> str:
+    """The raw file's unfinished compaction batch, unless it was already folded
+
+    Args:
+        raw_file: Raw append-only log
+        compacted_file: File the batch is folded into
+
+    Returns:
+        Path of the batch still to fold, or an empty string
+    """
+    pending = raw_file + ".compacting"
+    identity = batch_identity(pending)
+    if not identity or identity == applied_batch(compacted_file):
+        return ""
+    return pending
+
+
+def _read_records(path: str, parse: Callable[[str], ToolUsage | None]) -> Iterator[ToolUsage]:
+    """Yield parsed records from a file, skipping malformed lines"""
+    try:
+        with Path(path).open(encoding="utf-8", errors="replace") as f:
+            for line in f:
+                record = parse(line)
+                if record is not None:
+                    yield record
+    except OSError:
+        return
+
+
+def _iter_logged_usage(
+    tools_file: str,
+    counts_file: str,
+    directories: list[str],
+    dictionary: DirectoryDictionary | None,
+) -> Iterator[ToolUsage]:
+    """Yield usage with the directory field exactly as logged"""
+    yield from _read_records(counts_file, parse_counter_record)
+    pending = pending_batch(tools_file, counts_file)
+    if pending:
+        yield from _read_records(pending, parse_raw_record)
+
+    if not directories:
+        yield from _read_records(tools_file, parse_raw_record)
+        return
+    for lines in read_records_by_directory(tools_file, directories, dictionary).values():
+        for line in lines:
+            record = parse_raw_record(line)
+            if record is not None:
+                yield record
+
+
+def iter_tool_usage(
+    tools_file: str,
+    counts_file: str,
+    directories: Iterable[str] = (),
+    dictionary: DirectoryDictionary | None = None,
+) -> Iterator[ToolUsage]:
+    """Yield recorded tool usage, compacted counters first
+
+    Args:
+        tools_file: Raw append-only tool log (uses since the last compaction)
+        counts_file: Compacted counters file
+        directories: Only read the raw log's records for these directories,
+            through its offset index (all records when empty)
+        dictionary: Directory dictionary to decode directory IDs with
+
+    Returns:
+        Iterator of ToolUsage records
+    """
+    records = _iter_logged_usage(
+        tools_file, counts_file, list(dict.fromkeys(directories)), dictionary
+    )
+    if dictionary is None:
+        yield from records
+        return
+    for record in records:
+        yield record._replace(directory=dictionary.path_of(record.directory))
+
+
+def summarize_usage(
+    records: Iterable[ToolUsage], directories: Iterable[str] = ()
+) -> dict[tuple[str, str, str], tuple[str, int]]:
+    """Sum usage over all days for each (directory, tool, alias)
+
+    Args:
+        records: Tool usage records
+        directories: Only keep these directories (all when empty)
+
+    Returns:
+        Dict mapping (directory, tool, alias) -> (first seen type, total uses)
+    """
+    wanted = set(directories)
+    totals: dict[tuple[str, str, str], tuple[str, int]] = {}
+
+    for record in records:
+        if wanted and record.directory not in wanted:
+            continue
+        key = (record.directory, record.tool, record.alias)
+        tool_type, uses = totals.get(key, (record.tool_type, 0))
+        totals[key] = (tool_type, uses + record.uses)
+
+    return totals
+
+
+def fold_usage(
+    records: Iterable[ToolUsage], today: date | None = None
+) -> dict[tuple[str, str, str, str], tuple[str, int]]:
+    """Fold usage into per-day buckets, merging days past retention
+
+    Args:
+        records: Tool usage records, counters and raw uses alike
+        today: Reference day for retention (defaults to today)
+
+    Returns:
+        Dict mapping (directory, tool, alias, day) -> (type, uses)
+    """
+    reference = today or date.today()  # noqa: DTZ011
+    cutoff = (reference - timedelta(days=DAY_BUCKET_RETENTION)).isoformat()
+    buckets: dict[tuple[str, str, str, str], tuple[str, int]] = {}
+
+    for record in records:
+        day = record.day if record.day != OLDER_BUCKET and record.day >= cutoff else OLDER_BUCKET
+        key = (record.directory, record.tool, record.alias, day)
+        tool_type, uses = buckets.get(key, (record.tool_type, 0))
+        buckets[key] = (tool_type, uses + record.uses)
+
+    return buckets
+
+
+def write_counters(
+    counts_file: str,
+    buckets: dict[tuple[str, str, str, str], tuple[str, int]],
+    batch: str = "",
+) -> None:
+    """Atomically replace the counters file
+
+    Args:
+        counts_file: Compacted counters file
+        buckets: Folded usage
+        batch: Identity of the raw batch folded in, recorded in the header
+    """
+    tmp_path = f"{counts_file}.tmp.{os.getpid()}"
+    with Path(tmp_path).open("w", encoding="utf-8") as f:
+        if batch:
+            f.write(f"{BATCH_HEADER}{batch}\n")
+        for (directory, tool, alias, day), (tool_type, uses) in sorted(buckets.items()):
+            f.write(f"{directory}|{tool}|{tool_type}|{alias}|{day}|{uses}\n")
+    Path(tmp_path).replace(counts_file)
+
+
+def compact_tool_log(tools_file: str, counts_file: str) -> int:
+    """Fold the raw tool log into the counters file and truncate it
+
+    The raw log is renamed aside first, so uses logged while compaction
+    runs land in a fresh log and are never lost. A leftover file from an
+    interrupted run is folded in on the next compaction, unless the
+    counters header shows it was folded before the run stopped.
+
+    Args:
+        tools_file: Raw append-only tool log
+        counts_file: Compacted counters file
+
+    Returns:
+        Number of raw records folded into the counters
+    """
+    pending = tools_file + ".compacting"
+
+    with Path(counts_file + ".lock").open("w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+
+        if Path(pending).exists() and not pending_batch(tools_file, counts_file):
+            Path(pending).unlink()  # Folded before an interrupted run could remove it
+
+        if Path(tools_file).is_file() and Path(tools_file).stat().st_size > 0:
+            if Path(pending).exists():
+                # Keep the unfinished batch and queue the new one behind it
+                batch = f"{tools_file}.{os.getpid()}"
+                Path(tools_file).replace(batch)
+                with (
+                    Path(pending).open("a", encoding="utf-8") as out,
+                    Path(batch).open(encoding="utf-8", errors="replace") as raw,
+                ):
+                    out.writelines(raw)
+                Path(batch).unlink()
+            else:
+                Path(tools_file).replace(pending)
+
+        if not Path(pending).exists():
+            return 0
+
+        raw_records = list(_read_records(pending, parse_raw_record))
+        buckets = fold_usage([*_read_records(counts_file, parse_counter_record), *raw_records])
+        write_counters(counts_file, buckets, batch_identity(pending))
+        Path(pending).unlink()
+
+    return len(raw_records)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 4 or sys.argv[1] not in ("compact", "records"):
+        print("Usage: python tool_counters.py compact <tools_file> <counts_file>")
+        print("       python tool_counters.py records <tools_file> <counts_file> [dir ...]")
+        sys.exit(1)
+
+    command, tools_path, counts_path = sys.argv[1:4]
+
+    if command == "compact":
+        compact_tool_log(tools_path, counts_path)
+    else:
+        usage = summarize_usage(
+            iter_tool_usage(tools_path, counts_path, sys.argv[4:], load_dictionary()), sys.argv[4:]
+        )
+        for (directory, tool, alias), (tool_type, uses) in usage.items():
+            print(f"{directory}|{tool}|{tool_type}|{alias}|{uses}")
@@ -0,0 +1,192 @@
+"""
+Trace Events
+Records timed spans while `wfreq --trace=FILE` runs, from the shell and from
+the Python helpers it starts, and writes them as a Chrome Trace Event file
+that chrome://tracing and Perfetto open offline
+"""
+
+import json
+import os
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import NamedTuple
+
+RESET = "\033[0m"
+DIM = "\033[90m"
+
+# Raw span file set by `wfreq --trace`; spans are only recorded while it is
+TRACE_ENV = "_FREQ_TRACE"
+TRACE_FILE = os.environ.get(TRACE_ENV, "")
+
+# One lane per side, so Python spans line up under the shell span that ran them
+LANES = {"zsh": 1, "python3": 2}
+TRACE_PID = 1
+
+
+class TraceSpan(NamedTuple):
+    """One timed span
+
+    Attributes:
+        start_us: Unix time the span began, in microseconds
+        duration_us: Wall time of the span
+        source: zsh or python3
+        category: Kind of work (merge, consolidate, sort, render, detect, ...)
+        name: What was timed
+        detail: Directory, file or message the span worked on, may be empty
+    """
+
+    start_us: int
+    duration_us: int
+    source: str
+    category: str
+    name: str
+    detail: str
+
+
+@contextmanager
+def span(category: str, name: str, detail: str = "") -> Iterator[None]:
+    """Time the enclosed block into the raw span file, when tracing
+
+    Args:
+        category: Kind of work
+        name: What is being timed
+        detail: Directory or file the block works on
+    """
+    if not TRACE_FILE:
+        yield
+        return
+
+    start_us = time.time_ns() // 1000
+    started = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        duration_us = (time.perf_counter_ns() - started) // 1000
+        line = f"{start_us}|{duration_us}|python3|{category}|{name}|{detail}\n"
+        try:
+            with Path(TRACE_FILE).open("a", encoding="utf-8") as f:
+                f.write(line)
+        except OSError:
+            pass  # Tracing never breaks the code it times
+
+
+def parse_span(line: str) -> TraceSpan | None:
+    """Parse a start|duration|source|category|name|detail line
+
+    The detail is the last field, so paths containing | survive.
+    """
+    fields = line.rstrip("\n").split("|", 5)
+    if len(fields) != 6 or not fields[3] or not fields[4]:
+        return None
+    try:
+        start_us, duration_us = int(fields[0]), int(fields[1])
+    except ValueError:
+        return None
+    return TraceSpan(start_us, max(duration_us, 0), *fields[2:])
+
+
+def load_spans(path: str) -> list[TraceSpan]:
+    """Read every span of a raw span file, earliest first; empty when missing"""
+    try:
+        with Path(path).open(encoding="utf-8", errors="replace") as f:
+            spans = [parsed for parsed in map(parse_span, f) if parsed is not None]
+    except OSError:
+        return []
+    # Enclosing spans first when two start together, so viewers nest them
+    return sorted(spans, key=lambda s: (s.start_us, -s.duration_us))
+
+
+def chrome_trace(spans: list[TraceSpan]) -> dict[str, object]:
+    """Convert spans to the Chrome Trace Event JSON object format
+
+    Spans become complete ("X") events with times relative to the first
+    span, plus metadata events naming the process and its lanes.
+    """
+    events: list[dict[str, object]] = [
+        {"name": "process_name", "ph": "M", "pid": TRACE_PID, "args": {"name": "wfreq"}},
+    ]
+    for source, tid in LANES.items():
+        events.append(
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": TRACE_PID,
+                "tid": tid,
+                "args": {"name": source},
+            }
+        )
+        events.append(
+            {
+                "name": "thread_sort_index",
+                "ph": "M",
+                "pid": TRACE_PID,
+                "tid": tid,
+                "args": {"sort_index": tid},
+            }
+        )
+
+    origin = spans[0].start_us if spans else 0
+    for traced in spans:
+        event: dict[str, object] = {
+            "name": traced.name,
+            "cat": traced.category,
+            "ph": "X",
+            "ts": traced.start_us - origin,
+            "dur": traced.duration_us,
+            "pid": TRACE_PID,
+            "tid": LANES.get(traced.source, len(LANES) + 1),
+        }
+        if traced.detail:
+            event["args"] = {"detail": traced.detail}
+        events.append(event)
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def write_trace(spans: list[TraceSpan], output_file: str) -> None:
+    """Write spans as a Chrome trace, replacing the file atomically
+
+    Args:
+        spans: Spans recorded by the shell and the Python helpers
+        output_file: JSON file to write (a leading ~ is expanded)
+    """
+    output = Path(output_file).expanduser()
+    tmp = output.with_name(f"{output.name}.tmp.{os.getpid()}")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(chrome_trace(spans), f)
+    tmp.replace(output)
+
+
+def format_summary(spans: list[TraceSpan]) -> str:
+    """Total time per category, for the line `wfreq --trace` prints"""
+    totals: dict[str, int] = {}
+    for traced in spans:
+        totals[traced.category] = totals.get(traced.category, 0) + traced.duration_us
+    ranked = sorted(totals.items(), key=lambda item: (-item[1], item[0]))
+    return " · ".join(f"{category} {micros / 1000:.0f}ms" for category, micros in ranked)
+
+
+def write_trace_for_shell(raw_file: str, output_file: str) -> str:
+    """Write the trace of a raw span file and describe it for `wfreq --trace`"""
+    spans = load_spans(raw_file)
+    if not spans:
+        return "❌ No spans were recorded"
+    try:
+        write_trace(spans, output_file)
+    except OSError as e:
+        return f"❌ Could not write {output_file}: {e.strerror}"
+    return (
+        f"✅ Wrote {len(spans)} spans to {output_file}\n"
+        f"   {DIM}{format_summary(spans)}{RESET}\n"
+        "   Open it in chrome://tracing or https://ui.perfetto.dev"
+    )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python trace_events.py <raw_span_file> <output_json>")
+        sys.exit(1)
+
+    print(write_trace_for_shell(sys.argv[1], sys.argv[2]))
@@ -84,6 +84,13 @@ if [ -f "$HOME/.zshrc" ]; then
         fi
     fi
     
+    # Remove the startup profiler and its section marks
+    if grep -q "pathwise-startup.zsh\|pathwise_startup_mark" "$HOME/.zshrc"; then
+        sed -i.tmp '/pathwise-startup.zsh/d' "$HOME/.zshrc"
+        sed -i.tmp '/pathwise_startup_mark/d' "$HOME/.zshrc"
+        echo -e "${GREEN}✓${NC} Removed startup profiler configuration"
+    fi
+
     # Remove any legacy startup display configuration from older versions
     if grep -q "_show_freq_dirs_once" "$HOME/.zshrc"; then
         # Remove the entire startup display block from older installations
@@ -109,16 +116,43 @@ DATA_FILES=(
     "$HOME/.frequent_dirs.today"
     "$HOME/.frequent_dirs.yesterday"
     "$HOME/.frequent_dirs.last_reset"
+    "$HOME/.frequent_dirs.last_maintenance"
     "$HOME/.frequent_dirs.sessions"
     "$HOME/.frequent_dirs.insights"
     "$HOME/.frequent_dirs.patterns"
     "$HOME/.frequent_dirs.git"
     "$HOME/.frequent_dirs.git.today"
+    "$HOME/.frequent_dirs.git.idx"
+    "$HOME/.frequent_dirs.git.perf"
+    "$HOME/.frequent_dirs.git.perf.hist"
+    "$HOME/.frequent_dirs.git.perf.hist.lock"
     "$HOME/.frequent_dirs.tools"
+    "$HOME/.frequent_dirs.tools.counts"
+    "$HOME/.frequent_dirs.tools.counts.lock"
+    "$HOME/.frequent_dirs.tools.idx"
+    "$HOME/.frequent_dirs.runtimes"
+    "$HOME/.frequent_dirs.runtimes.hist"
+    "$HOME/.frequent_dirs.runtimes.hist.lock"
+    "$HOME/.frequent_dirs.export_cursor"
+    "$HOME/.frequent_dirs.dirs"
+    "$HOME/.frequent_dirs.dirs.lock"
     "$HOME/.frequent_dirs.learning"
     "$HOME/.frequent_dirs.sessions.archive"
+    "$HOME/.frequent_dirs.sessions.archive.tidx"
+    "$HOME/.frequent_dirs.sessions.lock"
+    "$HOME/.frequent_dirs.generation"
+    "$HOME/.frequent_dirs.snapshot"
+    "$HOME/.frequent_dirs.snapshot.listing"
+    "$HOME/.frequent_dirs.profile"
+    "$HOME/.frequent_dirs.hook_profile"
+    "$HOME/.frequent_dirs.startup"
 )
 
+# Monthly session archives (.frequent_dirs.sessions.YYYY-MM[.gz|.tidx])
+for file in "$HOME"/.frequent_dirs.sessions.[0-9][0-9][0-9][0-9]-[0-9][0-9]*; do
+    [ -e "$file" ] && DATA_FILES+=("$file")
+done
+
 FOUND_DATA=false
 for file in "${DATA_FILES[@]}"; do
     if [ -f "$file" ]; then